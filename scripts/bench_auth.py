@@ -0,0 +1,94 @@
+"""요청 인증 비용 비교: 토큰 claims로 만드는 경우 vs DB(replica) 조회
+
+DB_* 환경변수(.env)가 가리키는 DB에 있는 유저로 토큰을 만들어, 요청마다 하는 인증
+(validate_access_token + get_authenticated_user)을 세 가지 경우로 반복 실행하고 지연 시간을 출력합니다.
+
+- claims: uid/name이 담긴 현재 형식의 토큰 (DB 조회 없음)
+- cached: 이전 형식의 토큰, AUTH_USER_CACHE에 있는 경우
+- db: 이전 형식의 토큰, 캐시에 없어 replica에서 조회하는 경우
+
+    python -m scripts.bench_auth --userid <유저 아이디> [--requests 2000] [--concurrency 1]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+
+from snuvote.app.user.cache import AUTH_USER_CACHE
+from snuvote.app.user.service import SECRET, TokenType, UserService
+from snuvote.app.user.store import UserStore
+from snuvote.database.connection import DB_MANAGER
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+# 요청 하나의 인증 (get_authenticated_user 종속성과 같이 요청마다 세션을 만듦, 세션은 쿼리를 실행할 때만 커넥션을 잡음)
+async def authenticate(token: str, clear_cache: bool) -> float:
+    started = time.perf_counter()
+    if clear_cache:
+        AUTH_USER_CACHE.clear()
+
+    async with DB_MANAGER.session_factory() as session, DB_MANAGER.replica_session_factory() as read_session:
+        user_service = UserService(UserStore(session=session, read_session=read_session))
+        payload = user_service.validate_access_token(token)
+        await user_service.get_authenticated_user(payload)
+
+    return time.perf_counter() - started
+
+
+async def run(name: str, token: str, requests: int, concurrency: int, clear_cache: bool) -> None:
+    latencies: list[float] = []
+
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            latencies.append(await authenticate(token, clear_cache))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:>7}: {len(latencies) / elapsed:9.0f} req/s, "
+        f"mean {statistics.mean(latencies) * 1e6:8.1f}us, "
+        f"p50 {percentile(latencies, 0.5) * 1e6:8.1f}us, "
+        f"p99 {percentile(latencies, 0.99) * 1e6:8.1f}us"
+    )
+
+
+async def main(userid: str, requests: int, concurrency: int) -> None:
+    await DB_MANAGER.start()
+    try:
+        async with DB_MANAGER.session_factory() as session:
+            user_service = UserService(UserStore(session=session, read_session=session))
+            user = await user_service.get_user_by_userid(userid)
+            if user is None:
+                raise SystemExit(f"user {userid} not found")
+            claims_token, _ = user_service.issue_tokens(user)
+
+        # uid/name이 없는 이전 형식의 access token
+        legacy_token = jwt.encode(
+            {"sub": userid, "exp": datetime.now(timezone.utc) + timedelta(hours=1), "typ": TokenType.ACCESS.value},
+            SECRET,
+            algorithm="HS256"
+        )
+
+        await run("claims", claims_token, requests, concurrency, clear_cache=False)
+        await run("cached", legacy_token, requests, concurrency, clear_cache=False)
+        await run("db", legacy_token, requests, concurrency, clear_cache=True)
+    finally:
+        await DB_MANAGER.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--userid", required=True)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(main(args.userid, args.requests, args.concurrency))
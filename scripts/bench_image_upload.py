@@ -0,0 +1,109 @@
+"""투표 이미지 저장 시간 비교: 한 장씩 차례로 저장 vs 동시에 저장(save_many)
+
+IMAGE_STORAGE_* / AWS_S3_* 환경변수(.env)가 가리키는 저장소(S3, S3 호환 서버, local)에
+무작위 이미지를 저장하고 걸린 시간을 출력합니다. 저장한 파일은 끝나면 지웁니다.
+매 회 새 이미지를 만들기 때문에 내용 해시가 겹쳐 저장을 건너뛰는 경우는 없습니다.
+
+- serial: 이전 방식처럼 이미지를 한 장씩 차례로 저장 (save를 하나씩 await)
+- concurrent: 현재 방식 (save_many, 동시에 IMAGE_STORAGE_UPLOAD_CONCURRENCY개까지)
+
+S3 없이 local 저장소로 실행할 때는 --request-delay-ms로 저장소 요청(exists/put)마다 네트워크 지연을 흉내낼 수 있습니다.
+
+    python -m scripts.bench_image_upload [--images 8] [--size 1024] [--rounds 3] [--request-delay-ms 0]
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import time
+from typing import BinaryIO, List
+
+from PIL import Image
+
+from snuvote.app.image.storage import IMAGE_STORAGE, SavedImage
+from snuvote.app.image.variants import IMAGE_VARIANTS
+
+
+# 무작위 픽셀로 채운 PNG (압축이 잘 되지 않아 크기가 실제 사진과 비슷함)
+def make_image(size: int) -> bytes:
+    image = Image.frombytes("RGB", (size, size), os.urandom(size * size * 3))
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+
+# 저장소 요청마다 delay초 동안 스레드를 막아 네트워크 왕복을 흉내냄
+def add_request_delay(delay: float) -> None:
+    exists, put = IMAGE_STORAGE.exists, IMAGE_STORAGE.put
+
+    def delayed_exists(key: str) -> bool:
+        time.sleep(delay)
+        return exists(key)
+
+    def delayed_put(fileobj: BinaryIO, key: str, content_type: str | None) -> None:
+        time.sleep(delay)
+        put(fileobj, key, content_type)
+
+    IMAGE_STORAGE.exists = delayed_exists
+    IMAGE_STORAGE.put = delayed_put
+
+
+async def save_serial(files: List[tuple[BinaryIO, str, str | None]]) -> List[SavedImage]:
+    return [await IMAGE_STORAGE.save(fileobj, extension, content_type) for fileobj, extension, content_type in files]
+
+
+async def save_concurrent(files: List[tuple[BinaryIO, str, str | None]]) -> List[SavedImage]:
+    return await IMAGE_STORAGE.save_many(files)
+
+
+async def run(name: str, save, images: int, size: int, rounds: int) -> None:
+    elapsed: list[float] = []
+    total_bytes = 0
+
+    for _ in range(rounds):
+        data = [make_image(size) for _ in range(images)]
+        total_bytes += sum(len(image) for image in data)
+        files = [(io.BytesIO(image), "png", "image/png") for image in data]
+
+        started = time.perf_counter()
+        saved_images = await save(files)
+        elapsed.append(time.perf_counter() - started)
+
+        # 무작위 이미지라 다른 투표와 공유하지 않으므로 지워도 됨
+        await IMAGE_STORAGE.delete_many([key for saved_image in saved_images for key in [saved_image.key, *saved_image.variants.values()]])
+
+    print(
+        f"{name:>10}: {images} images ({total_bytes / rounds / 1024 / 1024:.1f}MB) x{rounds}, "
+        f"mean {statistics.mean(elapsed) * 1000:8.1f}ms, "
+        f"min {min(elapsed) * 1000:8.1f}ms, "
+        f"max {max(elapsed) * 1000:8.1f}ms"
+    )
+
+
+async def main(images: int, size: int, rounds: int, request_delay_ms: float) -> None:
+    if request_delay_ms > 0:
+        add_request_delay(request_delay_ms / 1000)
+
+    try:
+        # 축소 이미지 프로세스 풀을 미리 띄워 첫 회 측정에 포함되지 않도록 함
+        warmup_path = IMAGE_STORAGE.write_temp_file(io.BytesIO(make_image(16)))
+        try:
+            await IMAGE_VARIANTS.generate(warmup_path)
+        finally:
+            os.remove(warmup_path)
+
+        await run("serial", save_serial, images, size, rounds)
+        await run("concurrent", save_concurrent, images, size, rounds)
+    finally:
+        await IMAGE_VARIANTS.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=8)
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--request-delay-ms", type=float, default=0)
+    args = parser.parse_args()
+    asyncio.run(main(args.images, args.size, args.rounds, args.request_delay_ms))
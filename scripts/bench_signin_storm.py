@@ -0,0 +1,108 @@
+"""로그인 폭주 중 다른 API의 지연 시간 측정
+
+앱을 프로세스 안에서 띄우고(ASGI), DB_* 환경변수(.env)가 가리키는 DB를 사용합니다.
+로그인 요청 여러 개를 동시에 보내는 동안 관계없는 API(GET /api/users/me)를 계속 호출해 지연 시간을 출력합니다.
+
+- baseline: 로그인 요청 없이 호출한 경우
+- inline: bcrypt를 이벤트 루프에서 바로 실행하던 이전 방식으로 로그인 폭주
+- pool: 현재 방식(PASSWORD_HASHER 스레드 풀)으로 로그인 폭주
+
+유저가 없으면 회원가입부터 합니다.
+
+    python -m scripts.bench_signin_storm [--userid bench_signin] [--signins 40] [--probes 200]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from snuvote.app.user.hashing import PASSWORD_HASHER
+from snuvote.main import app
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+# 이전 방식: 스레드 풀 없이 호출한 코루틴 안에서 bcrypt를 바로 실행
+async def run_inline(func, *args):
+    return func(*args)
+
+
+async def ensure_user(client: httpx.AsyncClient, userid: str, password: str) -> str:
+    signin = {"userid": userid, "password": password}
+    response = await client.post("/api/users/signin", json=signin)
+    if response.status_code != 200:
+        signup = {"userid": userid, "email": f"{userid}@snu.ac.kr", "password": password, "name": userid, "college": 1}
+        response = await client.post("/api/users/signup", json=signup)
+        response.raise_for_status()
+        response = await client.post("/api/users/signin", json=signin)
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def probe(client: httpx.AsyncClient, headers: dict, latencies: list[float]) -> None:
+    started = time.perf_counter()
+    response = await client.get("/api/users/me", headers=headers)
+    response.raise_for_status()
+    latencies.append(time.perf_counter() - started)
+
+
+# storm이 끝날 때까지(없으면 probes번) 다른 API를 계속 호출
+async def run(name: str, client: httpx.AsyncClient, access_token: str, userid: str, password: str, signins: int, probes: int) -> None:
+    headers = {"Authorization": f"Bearer {access_token}"}
+    latencies: list[float] = []
+    signed_in = 0
+
+    async def signin() -> None:
+        nonlocal signed_in
+        response = await client.post("/api/users/signin", json={"userid": userid, "password": password})
+        response.raise_for_status()
+        signed_in += 1
+
+    started = time.perf_counter()
+    storm = asyncio.gather(*(signin() for _ in range(signins)))
+    while len(latencies) < probes or not storm.done():
+        await probe(client, headers, latencies)
+        await asyncio.sleep(0.005)
+    await storm
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:>8}: {signed_in / elapsed:6.1f} signin/s, /me x{len(latencies):<4} "
+        f"mean {statistics.mean(latencies) * 1000:7.1f}ms, "
+        f"p50 {percentile(latencies, 0.5) * 1000:7.1f}ms, "
+        f"p99 {percentile(latencies, 0.99) * 1000:7.1f}ms, "
+        f"max {max(latencies) * 1000:7.1f}ms"
+    )
+
+
+async def main(userid: str, password: str, signins: int, probes: int) -> None:
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            access_token = await ensure_user(client, userid, password)
+
+            await run("baseline", client, access_token, userid, password, 0, probes)
+
+            PASSWORD_HASHER.run = run_inline
+            try:
+                await run("inline", client, access_token, userid, password, signins, probes)
+            finally:
+                del PASSWORD_HASHER.run
+
+            await run("pool", client, access_token, userid, password, signins, probes)
+            print(f"PASSWORD_HASHER: {PASSWORD_HASHER.metrics()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--userid", default="bench_signin")
+    parser.add_argument("--password", default="Benchmark1!")
+    parser.add_argument("--signins", type=int, default=40)
+    parser.add_argument("--probes", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.userid, args.password, args.signins, args.probes))
@@ -0,0 +1,138 @@
+"""투표 상세 조회 지연 시간: 표 수에 따른 변화
+
+DB_* 환경변수(.env)가 가리키는 DB에 벤치마크용 유저/투표를 만들고, 표를 --ballots 단계별로 늘려가며
+상세 조회(VoteService.get_vote_detail, 캐시를 비운 상태)를 반복 실행해 지연 시간을 출력합니다.
+선택지별 참여자 수는 카운터를 사용하므로 표가 늘어도 지연 시간이 거의 같아야 합니다.
+만든 데이터는 끝나면 모두 지웁니다.
+
+    python -m scripts.bench_vote_detail [--ballots 0 1000 10000] [--requests 200]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import delete, insert, select
+
+from snuvote.app.vote.cache import FINALIZED_VOTE_CACHE, VOTE_DETAIL_CACHE
+from snuvote.app.vote.service import VoteService
+from snuvote.app.vote.store import VoteStore
+from snuvote.database.connection import DB_MANAGER
+from snuvote.database.models import Choice, ChoiceParticipation, HotVote, User, Vote, VoteParticipation
+
+BATCH_SIZE = 1000
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+# 유저 count명을 만들어 각각 무작위 선택지에 한 표씩 (참여자 수 카운터는 recount_participants로 갱신)
+async def add_ballots(vote: Vote, choice_ids: list[int], prefix: str, start: int, count: int) -> None:
+    now = datetime.now(timezone.utc)
+    for offset in range(0, count, BATCH_SIZE):
+        numbers = range(start + offset, start + min(count, offset + BATCH_SIZE))
+        async with DB_MANAGER.session_factory() as session:
+            userids = [f"{prefix}{number}" for number in numbers]
+            await session.execute(insert(User), [
+                {"userid": userid, "email": f"{userid}@bench.snuvote", "hashed_password": "", "name": userid, "college": 1}
+                for userid in userids
+            ])
+            user_ids = (await session.scalars(select(User.id).where(User.userid.in_(userids)))).all()
+
+            await session.execute(insert(VoteParticipation), [
+                {"user_id": user_id, "vote_id": vote.id, "participated_at": now, "vote_create_datetime": vote.create_datetime}
+                for user_id in user_ids
+            ])
+            await session.execute(insert(ChoiceParticipation), [
+                {"user_id": user_id, "choice_id": random.choice(choice_ids)}
+                for user_id in user_ids
+            ])
+            await session.commit()
+
+    async with DB_MANAGER.session_factory() as session:
+        await VoteStore(session, session).recount_participants(vote.id)
+
+
+async def get_vote_detail(vote_id: int) -> float:
+    VOTE_DETAIL_CACHE.clear()
+    FINALIZED_VOTE_CACHE.clear()
+
+    started = time.perf_counter()
+    async with DB_MANAGER.session_factory() as session, DB_MANAGER.replica_session_factory() as read_session:
+        vote_service = VoteService(VoteStore(session=session, read_session=read_session))
+        await vote_service.get_vote_detail(vote_id, read_only=True)
+    return time.perf_counter() - started
+
+
+async def main(ballots: list[int], requests: int) -> None:
+    prefix = f"bd{uuid4().hex[:6]}_" # 벤치마크용 유저 아이디 앞부분 (정리할 때 사용)
+
+    await DB_MANAGER.start()
+    vote_id: int | None = None
+    try:
+        async with DB_MANAGER.session_factory() as session:
+            writer = User(userid=f"{prefix}w", email=f"{prefix}w@bench.snuvote", hashed_password="", name="bench", college=1)
+            session.add(writer)
+            await session.flush()
+
+            now = datetime.now(timezone.utc)
+            vote = Vote(
+                writer_id=writer.id,
+                create_datetime=now,
+                title="bench",
+                content="bench",
+                end_datetime=now + timedelta(days=1),
+                participation_code_required=False,
+                participation_code=None,
+                realtime_result=True,
+                multiple_choice=False,
+                annonymous_choice=False
+            )
+            session.add(vote)
+            await session.flush()
+            vote_id = vote.id
+
+            choices = [Choice(vote_id=vote.id, choice_content=f"choice {i}") for i in range(4)]
+            session.add_all(choices)
+            await session.flush()
+            choice_ids = [choice.id for choice in choices]
+            await session.commit()
+
+        added = 0
+        for target in sorted(ballots):
+            await add_ballots(vote, choice_ids, prefix, added, target - added)
+            added = target
+
+            latencies = [await get_vote_detail(vote_id) for _ in range(requests)]
+            print(
+                f"{target:>8} ballots: "
+                f"mean {statistics.mean(latencies) * 1000:7.2f}ms, "
+                f"p50 {percentile(latencies, 0.5) * 1000:7.2f}ms, "
+                f"p99 {percentile(latencies, 0.99) * 1000:7.2f}ms"
+            )
+    finally:
+        # 벤치마크 데이터 정리
+        async with DB_MANAGER.session_factory() as session:
+            if vote_id is not None:
+                choice_ids = select(Choice.id).where(Choice.vote_id == vote_id)
+                await session.execute(delete(ChoiceParticipation).where(ChoiceParticipation.choice_id.in_(choice_ids)))
+                await session.execute(delete(VoteParticipation).where(VoteParticipation.vote_id == vote_id))
+                await session.execute(delete(HotVote).where(HotVote.vote_id == vote_id))
+                await session.execute(delete(Choice).where(Choice.vote_id == vote_id))
+                await session.execute(delete(Vote).where(Vote.id == vote_id))
+            await session.execute(delete(User).where(User.userid.startswith(prefix)))
+            await session.commit()
+        await DB_MANAGER.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ballots", type=int, nargs="+", default=[0, 1000, 10000])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.ballots, args.requests))
@@ -0,0 +1,60 @@
+"""투표 버퍼의 dead-letter 파일에 옮겨진 표 다시 반영
+
+BALLOT_BUFFER_WAL_DIR/dead-ballots.jsonl의 표를 DB_* 환경변수(.env)가 가리키는 DB에 한 장씩 반영합니다.
+제출 시각보다 나중의 참여가 이미 반영된 유저의 표는 덮어쓰지 않고 건너뜁니다.
+반영된 표는 파일에서 지우고, 이번에도 실패한 표는 남겨둡니다. (실행 중에는 워커가 파일에 추가하지 못하도록 잠금)
+각 워커의 캐시는 ttl이 지나야 반영된 결과를 보여줍니다.
+
+    python -m scripts.replay_dead_ballots
+"""
+import asyncio
+import fcntl
+import json
+import os
+import sys
+
+from snuvote.app.vote.ballot_buffer import Ballot, BallotBuffer
+from snuvote.database.connection import DB_MANAGER
+
+
+async def main() -> int:
+    path = BallotBuffer.dead_letter_path()
+    if not os.path.exists(path):
+        print(f"{path} not found")
+        return 0
+
+    await DB_MANAGER.start()
+    try:
+        with open(path, "r+", encoding="utf-8") as dead_letter_file:
+            fcntl.flock(dead_letter_file, fcntl.LOCK_EX)
+            lines = dead_letter_file.read().splitlines()
+
+            buffer = BallotBuffer()
+            remaining: list[str] = []
+            applied = 0
+            for line in lines:
+                if not line.strip():
+                    continue
+                ballot = Ballot(**json.loads(line)["ballot"])
+                try:
+                    await buffer.apply([ballot])
+                except Exception as e:
+                    print(f"failed: seq={ballot.seq} vote_id={ballot.vote_id} user_id={ballot.user_id} {e!r}")
+                    remaining.append(line)
+                    continue
+                applied += 1
+
+            dead_letter_file.seek(0)
+            dead_letter_file.truncate()
+            dead_letter_file.write("".join(line + "\n" for line in remaining))
+            dead_letter_file.flush()
+            os.fsync(dead_letter_file.fileno())
+    finally:
+        await DB_MANAGER.dispose()
+
+    print(f"applied {applied}, remaining {len(remaining)}")
+    return 1 if remaining else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
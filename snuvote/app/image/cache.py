@@ -0,0 +1,10 @@
+from snuvote.app.image.settings import IMAGE_SERVE_SETTINGS
+from snuvote.cache import LRUCache
+
+
+# 자주 요청되는 작은 이미지 (내용 해시로 이름 붙은 이미지만), key: image_name, value: (내용, media type)
+# 이름이 같으면 내용도 같으므로 ttl 없이 캐싱
+IMAGE_CACHE: LRUCache[str, tuple[bytes, str]] = LRUCache(
+    maxsize=IMAGE_SERVE_SETTINGS.cache_maxsize,
+    max_bytes=IMAGE_SERVE_SETTINGS.cache_max_bytes
+)
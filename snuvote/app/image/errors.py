@@ -0,0 +1,7 @@
+from fastapi import HTTPException
+from starlette.status import HTTP_404_NOT_FOUND
+
+
+class ImageNotFoundError(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(HTTP_404_NOT_FOUND, "Image not found")
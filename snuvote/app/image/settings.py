@@ -0,0 +1,77 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from snuvote.settings import SETTINGS
+
+
+class ImageStorageSettings(BaseSettings):
+    # 이미지 저장소: "s3" 또는 "local" (로컬 개발/테스트는 AWS 없이 local 사용)
+    backend: str = "s3"
+
+    # 동시에 upload_concurrency개까지 스레드에서 저장, 파일은 chunk_size 단위로 읽고 씀
+    upload_concurrency: int = 4
+    chunk_size: int = 1024 * 1024
+
+    # local: 파일을 저장할 디렉토리와 이미지 주소 앞부분 (snuvote.app.image.views가 이 디렉토리에서 제공)
+    local_dir: str = "images"
+    local_url_prefix: str = "/api/images"
+
+    # s3: 접속 정보는 기존대로 AWS_S3_* 환경 변수 사용, 워커마다 client 하나를 공유
+    max_pool_connections: int = 10
+
+    # S3 호환 로컬 서버(minio, moto 등)로 테스트할 때 지정 (지정하면 이미지 주소도 이 endpoint 기준)
+    endpoint_url: str | None = None
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="IMAGE_STORAGE_",
+        env_file=SETTINGS.env_file,
+        extra = 'ignore'
+    )
+
+
+class ImageVariantSettings(BaseSettings):
+    # 업로드 시 만드는 축소 이미지 (긴 변 기준 px, 원본이 더 작으면 원본 크기 유지)
+    # thumbnail: 리스트 썸네일 (80px 미리보기의 2배), medium: 상세 화면 표시용
+    thumbnail_size: int = 160
+    medium_size: int = 1080
+
+    # "webp" 또는 "jpeg"
+    format: str = "webp"
+    quality: int = 80
+
+    # 변환은 CPU를 쓰므로 워커마다 별도 프로세스 풀에서 실행
+    workers: int = 2
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="IMAGE_VARIANT_",
+        env_file=SETTINGS.env_file,
+        extra = 'ignore'
+    )
+
+
+class ImageServeSettings(BaseSettings):
+    # 로컬 이미지 제공 (GET /api/images/{image_name})
+    # 내용 해시로 이름 붙은 이미지는 내용이 바뀌지 않으므로 immutable로 오래 캐싱, 그 외(이전 이름 규칙)는 짧게 캐싱
+    immutable_max_age_seconds: int = 365 * 24 * 3600
+    mutable_max_age_seconds: int = 3600
+
+    # 작은 이미지(cache_file_max_bytes 이하)는 메모리에 캐싱해 디스크를 읽지 않음
+    cache_maxsize: int = 1000
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_file_max_bytes: int = 256 * 1024
+
+    # nginx 뒤에서 실행하는 경우 지정하면 파일 전송을 X-Accel-Redirect로 nginx(sendfile)에 넘김
+    # 예: "/_images/" (nginx에서 internal location으로 local_dir을 연결)
+    accel_redirect_prefix: str | None = None
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="IMAGE_SERVE_",
+        env_file=SETTINGS.env_file,
+        extra = 'ignore'
+    )
+
+
+IMAGE_STORAGE_SETTINGS = ImageStorageSettings()
+IMAGE_VARIANT_SETTINGS = ImageVariantSettings()
+IMAGE_SERVE_SETTINGS = ImageServeSettings()
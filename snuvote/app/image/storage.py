@@ -0,0 +1,247 @@
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+import io
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from typing import BinaryIO, List
+from uuid import uuid4
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from snuvote.app.image.settings import IMAGE_STORAGE_SETTINGS
+from snuvote.app.image.variants import IMAGE_VARIANTS
+
+
+logger = logging.getLogger(__name__)
+
+
+# 저장된 이미지 하나
+# key: 원본 파일이름, variants: {축소 이미지 이름: 파일이름} (만들지 못했으면 비어 있음)
+@dataclass
+class SavedImage:
+    key: str
+    variants: dict[str, str] = field(default_factory=dict)
+
+
+# 투표 이미지 저장소
+# 파일은 내용의 sha256 해시로 저장하므로, 같은 이미지를 여러 투표에 올려도 한 번만 저장/전송됩니다.
+# 같은 파일을 동시에 저장 중인 다른 요청이 있을 수 있으므로, 저장이나 이후 DB 반영에 실패해도 저장한 파일은 지우지 않습니다.
+# (남은 파일은 같은 이미지가 다시 올라오면 그대로 재사용)
+# 파일 I/O와 네트워크 I/O는 이벤트 루프를 막지 않도록 스레드에서 실행합니다. (동시에 upload_concurrency개까지)
+# 하위 클래스는 exists, put, delete, url을 구현합니다.
+class ImageStorage(ABC):
+    def __init__(self) -> None:
+        self.semaphore: asyncio.Semaphore | None = None
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def put(self, fileobj: BinaryIO, key: str, content_type: str | None) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, keys: List[str]) -> None:
+        ...
+
+    # 저장된 이미지 주소
+    @abstractmethod
+    def url(self, key: str) -> str:
+        ...
+
+    # 저장된 파일을 이 프로세스에서 바로 읽을 수 있는 경로 (없으면 None)
+    def local_path(self, key: str) -> str | None:
+        return None
+
+    # 파일을 chunk 단위로 읽어 내용 해시 계산 (파일 위치는 처음으로 되돌림)
+    def content_hash(self, fileobj: BinaryIO) -> str:
+        digest = hashlib.sha256()
+        fileobj.seek(0)
+        while chunk := fileobj.read(IMAGE_STORAGE_SETTINGS.chunk_size):
+            digest.update(chunk)
+        fileobj.seek(0)
+        return digest.hexdigest()
+
+    # 파일 하나와 축소 이미지들 저장 (같은 내용이 이미 있으면 저장하지 않음)
+    async def save(self, fileobj: BinaryIO, extension: str, content_type: str | None = None) -> SavedImage:
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(IMAGE_STORAGE_SETTINGS.upload_concurrency)
+
+        async with self.semaphore:
+            key = f'{await asyncio.to_thread(self.content_hash, fileobj)}.{extension}' # 파일이름 = {내용 해시}.{확장자}
+            saved_image = SavedImage(key=key)
+            if not await asyncio.to_thread(self.exists, key):
+                await asyncio.to_thread(self.put, fileobj, key, content_type)
+
+            await self.save_variants(fileobj, saved_image)
+            return saved_image
+
+    # 축소 이미지 저장: 파일이름 = {원본 내용 해시}_{축소 이미지 이름}.{확장자}
+    # 원본이 같으면 이름도 같으므로 이미 있으면 다시 만들지 않음
+    # 이미지를 읽지 못하는 등 변환에 실패하면 축소 이미지 없이 진행 (응답에서는 원본을 사용)
+    async def save_variants(self, fileobj: BinaryIO, saved_image: SavedImage) -> None:
+        stem = saved_image.key.rsplit(".", 1)[0]
+        variant_keys = {name: f'{stem}_{name}.{IMAGE_VARIANTS.extension}' for name in IMAGE_VARIANTS.sizes}
+
+        missing = [name for name, variant_key in variant_keys.items() if not await asyncio.to_thread(self.exists, variant_key)]
+        if missing:
+            # 원본을 메모리에 올려 프로세스 풀로 넘기지 않고, 저장된 파일(없으면 임시 파일) 경로만 넘김
+            path = self.local_path(saved_image.key)
+            temp_path = None
+            try:
+                if path is None:
+                    path = temp_path = await asyncio.to_thread(self.write_temp_file, fileobj)
+                variants = await IMAGE_VARIANTS.generate(path)
+            except Exception:
+                logger.warning("failed to generate image variants for %s", saved_image.key, exc_info=True)
+                return
+            finally:
+                if temp_path is not None:
+                    await asyncio.to_thread(os.remove, temp_path)
+
+            for name in missing:
+                await asyncio.to_thread(self.put, io.BytesIO(variants[name]), variant_keys[name], IMAGE_VARIANTS.content_type)
+
+        saved_image.variants = variant_keys
+
+    # 파일을 chunk 단위로 임시 파일에 복사하고 경로 반환 (파일 위치는 처음으로 되돌림)
+    def write_temp_file(self, fileobj: BinaryIO) -> str:
+        fileobj.seek(0)
+        with tempfile.NamedTemporaryFile(prefix="snuvote-image-", delete=False) as f:
+            shutil.copyfileobj(fileobj, f, IMAGE_STORAGE_SETTINGS.chunk_size)
+        fileobj.seek(0)
+        return f.name
+
+    # 여러 파일을 동시에 저장하고 순서대로 반환
+    # 하나라도 실패하면 나머지 저장이 끝난 뒤 첫 번째 예외를 그대로 발생
+    async def save_many(self, files: List[tuple[BinaryIO, str, str | None]]) -> List[SavedImage]:
+        results = await asyncio.gather(
+            *(self.save(fileobj, extension, content_type) for fileobj, extension, content_type in files),
+            return_exceptions=True
+        )
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+        return results
+
+    # 파일 삭제 (실패해도 예외를 발생시키지 않음)
+    # 같은 내용의 파일은 여러 투표가 함께 쓰므로 어떤 투표에서도 참조하지 않는 파일만 넘겨야 함
+    async def delete_many(self, keys: List[str]) -> None:
+        if not keys:
+            return
+
+        try:
+            await asyncio.to_thread(self.delete, keys)
+        except Exception:
+            logger.exception("failed to delete uploaded images")
+
+
+# 로컬 디렉토리에 저장 (로컬 개발/테스트용, snuvote.app.image.views에서 제공)
+class LocalImageStorage(ImageStorage):
+    def __init__(self, directory: str, url_prefix: str) -> None:
+        super().__init__()
+        self.directory = directory
+        self.url_prefix = url_prefix.rstrip("/")
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def local_path(self, key: str) -> str | None:
+        return self.path(key)
+
+    # 임시 파일에 chunk 단위로 쓴 뒤 rename해 읽는 쪽에서 쓰다 만 파일이 보이지 않도록 함
+    def put(self, fileobj: BinaryIO, key: str, content_type: str | None) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f'{self.path(key)}.{uuid4().hex}.tmp'
+        try:
+            with open(temp_path, "wb") as f:
+                shutil.copyfileobj(fileobj, f, IMAGE_STORAGE_SETTINGS.chunk_size)
+            os.replace(temp_path, self.path(key))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def delete(self, keys: List[str]) -> None:
+        for key in keys:
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+
+    def url(self, key: str) -> str:
+        return f'{self.url_prefix}/{key}'
+
+
+# S3 버킷의 voteimages/ 아래에 저장
+# boto3 client는 스레드 간에 공유해도 안전하므로 워커마다 하나만 만들어 연결을 재사용합니다.
+# upload_fileobj는 파일을 chunk 단위로 읽어 전송하므로 전체를 메모리에 올리지 않습니다.
+class S3ImageStorage(ImageStorage):
+    def __init__(self) -> None:
+        super().__init__()
+        self.client = None
+
+    @property
+    def bucket(self) -> str:
+        return os.getenv('AWS_S3_BUCKET_NAME')
+
+    def get_client(self):
+        if self.client is None:
+            self.client = boto3.client(
+                's3',
+                aws_access_key_id=os.getenv('AWS_S3_ACCESS_KEY_ID'),
+                aws_secret_access_key=os.getenv('AWS_S3_SECRET_ACCESS_KEY'),
+                endpoint_url=IMAGE_STORAGE_SETTINGS.endpoint_url,
+                config=Config(region_name=os.getenv('AWS_DEFAULT_REGION'), max_pool_connections=IMAGE_STORAGE_SETTINGS.max_pool_connections)
+            )
+        return self.client
+
+    def object_key(self, key: str) -> str:
+        return f'voteimages/{key}' # S3 버킷 내 파일 경로: voteimages/{파일이름}
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.get_client().head_object(Bucket=self.bucket, Key=self.object_key(key))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise e
+        return True
+
+    def put(self, fileobj: BinaryIO, key: str, content_type: str | None) -> None:
+        extra_args = {"ContentType": content_type} if content_type else None
+        self.get_client().upload_fileobj(fileobj, self.bucket, self.object_key(key), ExtraArgs=extra_args)
+
+    def delete(self, keys: List[str]) -> None:
+        self.get_client().delete_objects(
+            Bucket=self.bucket,
+            Delete={"Objects": [{"Key": self.object_key(key)} for key in keys], "Quiet": True}
+        )
+
+    def url(self, key: str) -> str:
+        if IMAGE_STORAGE_SETTINGS.endpoint_url:
+            return f'{IMAGE_STORAGE_SETTINGS.endpoint_url.rstrip("/")}/{self.bucket}/{self.object_key(key)}'
+        return f'https://{self.bucket}.s3.{os.getenv("AWS_DEFAULT_REGION")}.amazonaws.com/{self.object_key(key)}'
+
+
+def create_image_storage() -> ImageStorage:
+    if IMAGE_STORAGE_SETTINGS.backend == "local":
+        return LocalImageStorage(IMAGE_STORAGE_SETTINGS.local_dir, IMAGE_STORAGE_SETTINGS.local_url_prefix)
+    if IMAGE_STORAGE_SETTINGS.backend == "s3":
+        return S3ImageStorage()
+    raise ValueError(f"Unknown image storage backend: {IMAGE_STORAGE_SETTINGS.backend}")
+
+
+# 워커 프로세스 전체에서 공유하는 이미지 저장소
+IMAGE_STORAGE = create_image_storage()
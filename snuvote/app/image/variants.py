@@ -0,0 +1,80 @@
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageOps
+
+from snuvote.app.image.settings import IMAGE_VARIANT_SETTINGS
+
+
+VARIANT_CONTENT_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg"}
+VARIANT_EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+
+
+# 원본 이미지로 축소 이미지들을 만듦 (프로세스 풀에서 실행되므로 모듈 최상위 함수로 둠)
+# path: 원본 파일 경로 (원본을 프로세스 간에 복사하지 않도록 경로만 넘기고 워커가 직접 읽음)
+# sizes: {이름: 긴 변 px}, 반환: {이름: 인코딩된 bytes}
+# GIF는 첫 프레임만 사용하고, EXIF 회전 정보는 반영한 뒤 버림
+def make_variants(path: str, sizes: dict[str, int], format: str, quality: int) -> dict[str, bytes]:
+    with Image.open(path) as original:
+        original.seek(0)
+        image = ImageOps.exif_transpose(original)
+
+        if format == "jpeg":
+            image = image.convert("RGB")
+        elif image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+
+        variants = {}
+        for name, size in sizes.items():
+            resized = image.copy()
+            resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+            output = io.BytesIO()
+            resized.save(output, format=format.upper(), quality=quality)
+            variants[name] = output.getvalue()
+
+        return variants
+
+
+# 축소 이미지 생성기 (워커 프로세스마다 프로세스 풀 하나를 공유)
+class ImageVariantGenerator:
+    def __init__(self) -> None:
+        self.executor: ProcessPoolExecutor | None = None
+
+    @property
+    def sizes(self) -> dict[str, int]:
+        return {"thumbnail": IMAGE_VARIANT_SETTINGS.thumbnail_size, "medium": IMAGE_VARIANT_SETTINGS.medium_size}
+
+    @property
+    def extension(self) -> str:
+        return VARIANT_EXTENSIONS[IMAGE_VARIANT_SETTINGS.format]
+
+    @property
+    def content_type(self) -> str:
+        return VARIANT_CONTENT_TYPES[IMAGE_VARIANT_SETTINGS.format]
+
+    async def generate(self, path: str) -> dict[str, bytes]:
+        if self.executor is None:
+            # 이벤트 루프와 스레드가 돌고 있는 프로세스를 fork하지 않도록 spawn 사용
+            self.executor = ProcessPoolExecutor(
+                max_workers=IMAGE_VARIANT_SETTINGS.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, make_variants, path, self.sizes, IMAGE_VARIANT_SETTINGS.format, IMAGE_VARIANT_SETTINGS.quality
+        )
+
+    # 워커 종료 시 호출
+    async def stop(self) -> None:
+        if self.executor is None:
+            return
+
+        await asyncio.to_thread(self.executor.shutdown)
+        self.executor = None
+
+
+# 워커 프로세스 전체에서 공유하는 생성기 (snuvote.main의 lifespan에서 stop)
+IMAGE_VARIANTS = ImageVariantGenerator()
@@ -1,8 +1,94 @@
-from fastapi import APIRouter
-from fastapi.responses import FileResponse
+import asyncio
+import os
+import re
+import stat
+from mimetypes import guess_type
+from typing import Annotated
+
+from fastapi import APIRouter, Header
+from fastapi.responses import FileResponse, Response
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from snuvote.app.image.cache import IMAGE_CACHE
+from snuvote.app.image.errors import ImageNotFoundError
+from snuvote.app.image.settings import IMAGE_STORAGE_SETTINGS, IMAGE_SERVE_SETTINGS
 
 image_router = APIRouter()
 
+# 내용 해시로 이름 붙은 이미지: {sha256}.{확장자} 또는 축소 이미지 {sha256}_{이름}.{확장자}
+CONTENT_HASHED_NAME = re.compile(r"^[0-9a-f]{64}(_[a-z]+)?\.[a-z0-9]+$")
+
+
+# 로컬 이미지 디렉토리 안의 파일 경로와 stat 반환 (디렉토리 밖을 가리키거나 파일이 아니면 404)
+def resolve_image_path(image_name: str) -> tuple[str, os.stat_result]:
+    directory = os.path.realpath(IMAGE_STORAGE_SETTINGS.local_dir)
+    path = os.path.realpath(os.path.join(directory, image_name))
+    if os.path.dirname(path) != directory:
+        raise ImageNotFoundError()
+
+    try:
+        stat_result = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise ImageNotFoundError()
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise ImageNotFoundError()
+
+    return path, stat_result
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+# If-None-Match에 현재 ETag(또는 *)가 있으면 304
+def is_not_modified(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    etags = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+    return "*" in etags or etag in etags
+
+
+# 로컬 이미지 저장소(IMAGE_STORAGE_BACKEND=local)에 저장된 이미지 제공
+# 내용 해시로 이름 붙은 이미지는 이름을 ETag로 쓰고 immutable로 캐싱, 작은 이미지는 메모리에서 바로 응답
+# 파일이 지워졌을 수 있으므로(투표 생성 실패 시 정리 등) 304/메모리 캐시로 응답하기 전에도 파일이 있는지 확인
+# Range 요청은 FileResponse가 처리
 @image_router.get("/{image_name}")
-def get_image(image_name: str) -> FileResponse:
-    return FileResponse(f'./images/{image_name}')
\ No newline at end of file
+async def get_image(
+    image_name: str,
+    if_none_match: Annotated[str | None, Header()] = None,
+    range_header: Annotated[str | None, Header(alias="range")] = None
+) -> Response:
+    content_hashed = CONTENT_HASHED_NAME.match(image_name) is not None
+
+    path, stat_result = await asyncio.to_thread(resolve_image_path, image_name)
+    media_type = guess_type(image_name)[0] or "application/octet-stream"
+
+    if content_hashed:
+        etag = f'"{image_name.rsplit(".", 1)[0]}"'
+        headers = {"ETag": etag, "Cache-Control": f"public, max-age={IMAGE_SERVE_SETTINGS.immutable_max_age_seconds}, immutable"}
+        if is_not_modified(if_none_match, etag):
+            return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
+        cached = IMAGE_CACHE.get(image_name) if range_header is None else None
+        if cached is not None:
+            content, media_type = cached
+            return Response(content=content, media_type=media_type, headers=headers)
+
+    if not content_hashed:
+        etag = f'"{int(stat_result.st_mtime)}-{stat_result.st_size}"'
+        headers = {"ETag": etag, "Cache-Control": f"public, max-age={IMAGE_SERVE_SETTINGS.mutable_max_age_seconds}"}
+        if is_not_modified(if_none_match, etag):
+            return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # nginx가 sendfile로 직접 전송 (Range도 nginx가 처리)
+    if IMAGE_SERVE_SETTINGS.accel_redirect_prefix:
+        headers["X-Accel-Redirect"] = f'{IMAGE_SERVE_SETTINGS.accel_redirect_prefix.rstrip("/")}/{image_name}'
+        return Response(media_type=media_type, headers=headers)
+
+    if content_hashed and range_header is None and stat_result.st_size <= IMAGE_SERVE_SETTINGS.cache_file_max_bytes:
+        content = await asyncio.to_thread(read_file, path)
+        IMAGE_CACHE.put(image_name, (content, media_type), size=len(content))
+        return Response(content=content, media_type=media_type, headers=headers)
+
+    return FileResponse(path, media_type=media_type, headers=headers, stat_result=stat_result)
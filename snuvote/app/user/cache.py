@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+
+from snuvote.app.user.settings import AUTH_SETTINGS
+from snuvote.cache import LRUCache
+from snuvote.database.models import User
+
+
+# 인증된 유저의 가벼운 스냅샷 (DB 세션과 무관하므로 요청 간에 캐싱 가능)
+# user.id, user.name만 필요한 핸들러는 User 대신 이걸 주입받음
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    id: int
+    userid: str
+    name: str
+
+    @staticmethod
+    def from_user(user: User) -> "AuthenticatedUser":
+        return AuthenticatedUser(id=user.id, userid=user.userid, name=user.name)
+
+
+# key: userid
+AUTH_USER_CACHE: LRUCache[str, AuthenticatedUser] = LRUCache(
+    maxsize=AUTH_SETTINGS.user_cache_maxsize,
+    ttl=AUTH_SETTINGS.user_cache_ttl_seconds
+)
@@ -4,7 +4,8 @@ from starlette.status import (
     HTTP_401_UNAUTHORIZED,
     HTTP_409_CONFLICT,
     HTTP_403_FORBIDDEN,
-    HTTP_404_NOT_FOUND
+    HTTP_404_NOT_FOUND,
+    HTTP_503_SERVICE_UNAVAILABLE
 )
 
 
@@ -72,6 +73,10 @@ class NaverApiError(HTTPException):
     def __init__(self) -> None:
         super().__init__(HTTP_401_UNAUTHORIZED, "Naver API error")
 
+class NaverApiUnavailableError(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(HTTP_503_SERVICE_UNAVAILABLE, "Naver API unavailable")
+
 class InvalidNaverTokenError(HTTPException):
     def __init__(self) -> None:
         super().__init__(HTTP_401_UNAUTHORIZED, "Invalid Naver token")
@@ -88,6 +93,10 @@ class KakaoApiError(HTTPException):
     def __init__(self) -> None:
         super().__init__(HTTP_401_UNAUTHORIZED, "Kakao API error")
 
+class KakaoApiUnavailableError(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(HTTP_503_SERVICE_UNAVAILABLE, "Kakao API unavailable")
+
 class InvalidKakaoTokenError(HTTPException):
     def __init__(self) -> None:
         super().__init__(HTTP_401_UNAUTHORIZED, "Invalid Kakao token")
@@ -0,0 +1,75 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from snuvote.app.user.settings import AUTH_SETTINGS
+
+
+# bcrypt는 호출 한 번에 수십 ms 동안 CPU를 쓰므로 이벤트 루프 대신 전용 스레드 풀에서 실행
+# (bcrypt는 해싱 중 GIL을 놓으므로 스레드로도 병렬 실행됨)
+# 풀 크기만큼만 동시에 실행하고, 나머지는 대기한 시간을 지표로 남깁니다.
+class PasswordHasher:
+    def __init__(self, rounds: int, workers: int) -> None:
+        self.rounds = rounds
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self.semaphore: asyncio.Semaphore | None = None
+
+        # 지표
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    async def hash(self, password: str) -> str:
+        # 비밀번호를 바이트로 변환, 솔트 생성 및 해싱 후 바이트를 다시 문자열로 변환
+        hashed_password = await self.run(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(rounds=self.rounds))
+        return hashed_password.decode('utf-8')
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        # 입력된 비밀번호와 저장된 해시 비교
+        return await self.run(bcrypt.checkpw, plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+    async def run(self, func, *args):
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.workers)
+
+        enqueued_at = time.monotonic()
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        try:
+            queue_wait = time.monotonic() - enqueued_at
+            self.queue_wait_total += queue_wait
+            self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+
+            self.running += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+            finally:
+                self.running -= 1
+                self.completed += 1
+        finally:
+            self.semaphore.release()
+
+    def metrics(self) -> dict:
+        return {
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "queue_wait_avg_ms": self.queue_wait_total / self.completed * 1000 if self.completed else 0.0,
+            "queue_wait_max_ms": self.queue_wait_max * 1000,
+        }
+
+
+# 워커 프로세스 전체에서 공유하는 해셔
+PASSWORD_HASHER = PasswordHasher(
+    rounds=AUTH_SETTINGS.password_hash_rounds,
+    workers=AUTH_SETTINGS.password_hash_workers
+)
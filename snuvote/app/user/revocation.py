@@ -0,0 +1,180 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from snuvote.app.user.settings import AUTH_SETTINGS
+from snuvote.app.user.store import UserStore
+from snuvote.database.connection import DB_MANAGER
+
+
+logger = logging.getLogger(__name__)
+
+
+# 워커 프로세스 내 토큰 무효화 목록
+# 토큰에 담긴 ver가 유저의 현재 token_version보다 작으면 무효 (탈퇴/비밀번호 변경 시 버전이 올라감)
+# 이 워커에서 일어난 변경은 revoke로 바로, 다른 워커에서 일어난 변경은 주기적으로 DB에서 마지막 갱신 이후에 올라간 버전만 읽어 반영합니다.
+# 액세스 토큰 유효 시간보다 전에 버전이 올라간 유저는 이전 버전으로 발급된 액세스 토큰이 모두 만료되었으므로 목록에서 뺍니다.
+# (리프레쉬토큰은 재발급 시 DB의 token_version으로 확인)
+class TokenRevocations:
+    def __init__(self) -> None:
+        self.versions: dict[int, int] = {} # key: user.id, value: token_version (최근에 올라간 유저만)
+        self.changed_at: dict[int, datetime] = {} # key: user.id, value: 버전이 마지막으로 올라간 시각 (UTC)
+        self.synced_at: datetime | None = None # 마지막으로 DB에서 읽기 시작한 시각
+        self.task: asyncio.Task | None = None
+
+    def is_revoked(self, user_id: int, token_version: int) -> bool:
+        return token_version < self.versions.get(user_id, 0)
+
+    def revoke(self, user_id: int, token_version: int) -> None:
+        self.merge(user_id, token_version, datetime.now(timezone.utc))
+
+    # 읽는 사이 이 워커에서 revoke된 버전이 덮어써지지 않도록 큰 값을 유지
+    def merge(self, user_id: int, token_version: int, changed_at: datetime) -> None:
+        if token_version >= self.versions.get(user_id, 0):
+            self.versions[user_id] = token_version
+            self.changed_at[user_id] = max(self.changed_at.get(user_id, changed_at), changed_at)
+
+    async def refresh(self) -> None:
+        now = datetime.now(timezone.utc)
+        window_start = now - timedelta(minutes=AUTH_SETTINGS.access_token_expire_minutes, seconds=AUTH_SETTINGS.revocation_sync_overlap_seconds)
+        since = window_start
+        if self.synced_at is not None:
+            since = max(window_start, self.synced_at - timedelta(seconds=AUTH_SETTINGS.revocation_sync_overlap_seconds))
+
+        async with DB_MANAGER.session_factory() as session:
+            user_store = UserStore(session=session, read_session=session)
+            changes = await user_store.get_token_versions_changed_since(since)
+
+        for user_id, (token_version, changed_at) in changes.items():
+            self.merge(user_id, token_version, changed_at)
+
+        # 이전 버전으로 발급된 액세스 토큰이 모두 만료된 유저는 제거
+        for user_id in [user_id for user_id, changed_at in self.changed_at.items() if changed_at < window_start]:
+            del self.versions[user_id]
+            del self.changed_at[user_id]
+        self.synced_at = now
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(AUTH_SETTINGS.revocation_refresh_seconds)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("failed to refresh token revocations")
+
+    # 워커 시작 시 호출
+    async def start(self) -> None:
+        try:
+            await self.refresh()
+        except Exception:
+            logger.exception("failed to load token revocations")
+        self.task = asyncio.create_task(self.run())
+
+    # 워커 종료 시 호출
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+        self.task = None
+
+
+# 워커 프로세스 내 블록된 리프레쉬토큰 목록
+# 재발급 시 블록 여부는 메모리에서만 확인하고, 다른 워커에서 막 블록된 토큰의 재사용은
+# block_refresh_token의 PK 중복으로 막습니다. 만료된 블록 기록은 주기적으로 나눠서 삭제합니다.
+# 처음에만 만료되지 않은 토큰을 모두 읽고, 이후에는 마지막 갱신 이후에 블록된 토큰만 읽어 더합니다.
+# expires_at, blocked_at은 BlockedRefreshToken과 같이 서버 로컬 시각 기준
+class RefreshTokenBlocklist:
+    def __init__(self) -> None:
+        self.tokens: dict[str, datetime] = {} # key: jti, value: expires_at
+        self.synced_at: datetime | None = None # 마지막으로 DB에서 읽기 시작한 시각
+        self.task: asyncio.Task | None = None
+
+    def is_blocked(self, token_id: str) -> bool:
+        return token_id in self.tokens
+
+    def add(self, token_id: str, expires_at: datetime) -> None:
+        self.tokens[token_id] = expires_at
+
+    async def refresh(self) -> None:
+        now = datetime.now()
+        async with DB_MANAGER.session_factory() as session:
+            user_store = UserStore(session=session, read_session=session)
+            if self.synced_at is None:
+                tokens = await user_store.get_blocked_refresh_tokens(now)
+            else:
+                since = self.synced_at - timedelta(seconds=AUTH_SETTINGS.blocklist_sync_overlap_seconds)
+                tokens = await user_store.get_blocked_refresh_tokens_since(since)
+
+        # 읽는 사이 이 워커에서 블록한 토큰은 그대로 두고 합침
+        self.tokens.update(tokens)
+
+        # 만료된 토큰은 재발급 시 만료로 거절되므로 버림
+        for token_id in [token_id for token_id, expires_at in self.tokens.items() if expires_at <= now]:
+            del self.tokens[token_id]
+        self.synced_at = now
+
+    # 만료된 블록 기록 삭제 (배치마다 따로 commit해 테이블 잠금을 짧게 유지)
+    async def purge(self) -> int:
+        now = datetime.now()
+        purged = 0
+        while True:
+            async with DB_MANAGER.session_factory() as session:
+                user_store = UserStore(session=session, read_session=session)
+                count = await user_store.purge_expired_refresh_tokens(now, AUTH_SETTINGS.blocklist_purge_batch_size)
+                await session.commit()
+
+            purged += count
+            if count < AUTH_SETTINGS.blocklist_purge_batch_size:
+                return purged
+            await asyncio.sleep(AUTH_SETTINGS.blocklist_purge_pause_ms / 1000)
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        last_purge = loop.time()
+
+        while True:
+            await asyncio.sleep(AUTH_SETTINGS.blocklist_refresh_seconds)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("failed to refresh refresh token blocklist")
+
+            if loop.time() - last_purge >= AUTH_SETTINGS.blocklist_purge_interval_seconds:
+                last_purge = loop.time()
+                try:
+                    purged = await self.purge()
+                    logger.info("purged %d expired blocked refresh tokens", purged)
+                except Exception:
+                    logger.exception("failed to purge expired blocked refresh tokens")
+
+    # 워커 시작 시 호출
+    async def start(self) -> None:
+        try:
+            await self.refresh()
+        except Exception:
+            logger.exception("failed to load refresh token blocklist")
+        self.task = asyncio.create_task(self.run())
+
+    # 워커 종료 시 호출
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+        self.task = None
+
+
+# 워커 프로세스 전체에서 공유하는 토큰 무효화 목록 (snuvote.main의 lifespan에서 start/stop)
+TOKEN_REVOCATIONS = TokenRevocations()
+REFRESH_TOKEN_BLOCKLIST = RefreshTokenBlocklist()
@@ -3,7 +3,12 @@ from typing import Annotated
 from fastapi import Depends
 from snuvote.database.models import User
 from snuvote.app.user.store import UserStore
-from snuvote.app.user.errors import InvalidUsernameOrPasswordError, NotAccessTokenError, NotRefreshTokenError, InvalidTokenError, ExpiredTokenError, BlockedRefreshTokenError, InvalidPasswordError, NaverApiError, InvalidNaverTokenError, KakaoApiError, InvalidKakaoTokenError, UserNotFoundError, NaverLinkAlreadyExistsError, KakaoLinkAlreadyExistsError
+from snuvote.app.user.cache import AUTH_USER_CACHE, AuthenticatedUser
+from snuvote.app.user.hashing import PASSWORD_HASHER
+from snuvote.app.user.revocation import REFRESH_TOKEN_BLOCKLIST, TOKEN_REVOCATIONS
+from snuvote.app.user.settings import AUTH_SETTINGS
+from snuvote.app.user.social import SOCIAL_API_CLIENT
+from snuvote.app.user.errors import InvalidUsernameOrPasswordError, NotAccessTokenError, NotRefreshTokenError, InvalidTokenError, ExpiredTokenError, BlockedRefreshTokenError, InvalidPasswordError, NaverApiError, NaverApiUnavailableError, InvalidNaverTokenError, KakaoApiError, KakaoApiUnavailableError, InvalidKakaoTokenError, UserNotFoundError, NaverLinkAlreadyExistsError, KakaoLinkAlreadyExistsError
 
 
 import jwt
@@ -12,9 +17,6 @@ from enum import Enum
 from uuid import uuid4
 from dotenv import load_dotenv
 import os
-import bcrypt
-
-import httpx
 
 load_dotenv(dotenv_path = '.env.prod')
 SECRET = os.getenv("SECRET_FOR_JWT") # .env.prod에서 불러오기
@@ -30,40 +32,55 @@ class UserService:
     
     #회원가입
     async def add_user(self, userid: str, password: str, email: str, name: str, college: int) -> User:
-        hashed_password = self.hash_password(password)
+        hashed_password = await self.hash_password(password)
         return await self.user_store.add_user(userid=userid, hashed_password=hashed_password, email=email, name=name, college=college)
 
     #아이디로 유저 찾기
-    async def get_user_by_userid(self, userid: str) -> User | None:
-        return await self.user_store.get_user_by_userid(userid)
+    async def get_user_by_userid(self, userid: str, read_only: bool = False) -> User | None:
+        return await self.user_store.get_user_by_userid(userid, read_only=read_only)
     
-    #비밀번호 해싱하기
-    def hash_password(self, password:str) -> str:
-        # 비밀번호를 바이트로 변환
-        password_bytes = password.encode('utf-8')
-        # 솔트 생성 및 해싱
-        hashed_password = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
-        #바이트를 다시 문자열로 변환
-        return hashed_password.decode('utf-8')
+    # 인증된 유저 스냅샷 조회
+    # 토큰에 uid, name이 있으면 DB 조회 없이 만들고, 이전 형식의 토큰이면 캐시 -> replica 순으로 조회
+    async def get_authenticated_user(self, payload: dict) -> AuthenticatedUser:
+        userid = payload["sub"]
+        if "uid" in payload and "name" in payload:
+            return AuthenticatedUser(id=payload["uid"], userid=userid, name=payload["name"])
+
+        authenticated_user = AUTH_USER_CACHE.get(userid)
+        if authenticated_user is not None:
+            return authenticated_user
+
+        user = await self.user_store.get_user_by_userid(userid, read_only=True)
+        if not user or user.is_deleted:
+            raise UserNotFoundError()
+
+        authenticated_user = AuthenticatedUser.from_user(user)
+        AUTH_USER_CACHE.put(userid, authenticated_user)
+        return authenticated_user
+
+    #비밀번호 해싱하기 (이벤트 루프를 막지 않도록 스레드 풀에서 실행)
+    async def hash_password(self, password:str) -> str:
+        return await PASSWORD_HASHER.hash(password)
     
-    #비밀번호 검증하기
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        # 저장된 해시를 바이트로 변환
-        hashed_password_bytes = hashed_password.encode('utf-8')
-        # 입력된 비밀번호와 비교
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password_bytes)
+    #비밀번호 검증하기 (이벤트 루프를 막지 않도록 스레드 풀에서 실행)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await PASSWORD_HASHER.verify(plain_password, hashed_password)
     
     #토큰 생성
-    def issue_tokens(self, userid: str) -> tuple[str, str]:
+    def issue_tokens(self, user: User) -> tuple[str, str]:
         access_payload = {
-            "sub": userid, # 추후 성능 개선을 위해 payload에 단과대 등 추가
-            "exp": datetime.now(timezone.utc) + timedelta(hours=1),
+            "sub": user.userid,
+            "uid": user.id, # 인증 시 DB 조회 없이 AuthenticatedUser를 만들기 위한 값
+            "name": user.name,
+            "ver": user.token_version, # 탈퇴/비밀번호 변경 시 무효화 확인용
+            "exp": datetime.now(timezone.utc) + timedelta(minutes=AUTH_SETTINGS.access_token_expire_minutes),
             "typ": TokenType.ACCESS.value, # "typ": "access"
         }
         access_token = jwt.encode(access_payload, SECRET, algorithm="HS256")
 
         refresh_payload = {
-            "sub": userid,
+            "sub": user.userid,
+            "ver": user.token_version,
             "jti": uuid4().hex, # 토큰의 고유 ID 생성 -> BlockedRefreshToken.token_id로 사용
             "exp": datetime.now(timezone.utc) + timedelta(days=7),
             "typ": TokenType.REFRESH.value, # "typ": "refresh"
@@ -74,32 +91,37 @@ class UserService:
     #처음 로그인
     async def signin(self, userid: str, password: str) -> tuple[str, str]:
         user = await self.get_user_by_userid(userid)
-        if user is None or not self.verify_password(password, user.hashed_password) or user.is_deleted:
+        # 비밀번호 검증을 기다리는 동안 DB 커넥션을 잡고 있지 않도록 먼저 반납
+        await self.user_store.release_connection()
+        if user is None or not await self.verify_password(password, user.hashed_password) or user.is_deleted:
             raise InvalidUsernameOrPasswordError()
-        return self.issue_tokens(userid)
+        return self.issue_tokens(user)
     
     #엑세스토큰 검증
-    def validate_access_token(self, token: str) -> str:
+    def validate_access_token(self, token: str) -> dict:
         """
-        access_token을 검증하고, username을 반환합니다.
+        access_token을 검증하고, payload를 반환합니다.
         """
         try:
             payload = jwt.decode(
                 token, SECRET, algorithms=["HS256"], options={"require": ["sub"]}
             )
-            if payload["typ"] != TokenType.ACCESS.value: # payload["typ"]  != "access"
-                raise NotAccessTokenError()
-            return payload["sub"]
         except jwt.ExpiredSignatureError:
             raise ExpiredTokenError()
         except jwt.InvalidTokenError:
             raise InvalidTokenError()
+        if payload["typ"] != TokenType.ACCESS.value: # payload["typ"]  != "access"
+            raise NotAccessTokenError()
+        # 탈퇴/비밀번호 변경으로 무효화된 토큰 (ver가 없는 이전 형식의 토큰은 만료 시까지 허용)
+        if "uid" in payload and TOKEN_REVOCATIONS.is_revoked(payload["uid"], payload.get("ver", 0)):
+            raise InvalidTokenError()
+        return payload
 
 
     #리프레쉬토큰 검증
-    async def validate_refresh_token(self, token: str) -> str:
+    async def validate_refresh_token(self, token: str) -> dict:
         """
-        refresh_token을 검증하고, username을 반환합니다.
+        refresh_token을 검증하고, payload를 반환합니다.
         """
         try:
             payload = jwt.decode(
@@ -114,10 +136,10 @@ class UserService:
             raise InvalidTokenError()
         if payload["typ"] != TokenType.REFRESH.value:
             raise NotRefreshTokenError()
-        if await self.user_store.is_refresh_token_blocked(payload["jti"]):
+        if REFRESH_TOKEN_BLOCKLIST.is_blocked(payload["jti"]): # DB 조회 없이 메모리에서 확인
             raise BlockedRefreshTokenError()
         
-        return payload["sub"]
+        return payload
 
     #만료된 리프레쉬토큰 블랙하기
     async def block_refresh_token(self, refresh_token: str) -> None:
@@ -130,45 +152,65 @@ class UserService:
         token_id = payload["jti"]
         expires_at = datetime.fromtimestamp(payload["exp"])
         await self.user_store.block_refresh_token(token_id, expires_at)
+        REFRESH_TOKEN_BLOCKLIST.add(token_id, expires_at)
 
     #토큰 새로 발급
     async def reissue_tokens(self, refresh_token: str) -> tuple[str, str]:
-        userid = await self.validate_refresh_token(refresh_token)
+        payload = await self.validate_refresh_token(refresh_token)
+
+        # 새 토큰에 담을 최신 정보 조회 (탈퇴했거나 token_version이 올라갔다면 재발급하지 않음)
+        user = await self.get_user_by_userid(payload["sub"])
+        if not user or user.is_deleted:
+            raise UserNotFoundError()
+        if payload.get("ver", 0) < user.token_version:
+            raise InvalidTokenError()
+
         await self.block_refresh_token(refresh_token)
-        return self.issue_tokens(userid)
+        return self.issue_tokens(user)
     
 
     #비밀번호 변경
     async def reset_password(self, user:User, current_password:str, new_password:str) -> None:
 
+        # 해싱을 기다리는 동안 DB 커넥션을 잡고 있지 않도록 먼저 반납
+        await self.user_store.release_connection()
+
         #현재 비밀번호를 틀린 경우
-        if not self.verify_password(current_password, user.hashed_password):
+        if not await self.verify_password(current_password, user.hashed_password):
             raise InvalidPasswordError()
         
         #새 비밀번호 해싱하기
-        hashed_new_password = self.hash_password(new_password)        
-        return await self.user_store.reset_password(userid=user.userid, new_password=hashed_new_password)
+        hashed_new_password = await self.hash_password(new_password)        
+        token_version = await self.user_store.reset_password(userid=user.userid, new_password=hashed_new_password)
+        AUTH_USER_CACHE.pop(user.userid)
+        TOKEN_REVOCATIONS.revoke(user.id, token_version)
     
     # 네이버 access_token 이용해 User의 네이버 고유 식별 id 가져오기
     async def get_naver_id_with_naver_access_token(self, access_token: str) -> str:
 
+        # 같은 토큰으로 재시도하는 경우 캐시된 id 사용
+        cache_key = SOCIAL_API_CLIENT.cache_key("naver", access_token)
+        naver_id = SOCIAL_API_CLIENT.id_cache.get(cache_key)
+        if naver_id is not None:
+            return naver_id
+
         url = "https://openapi.naver.com/v1/nid/me" # 네이버 프로필 조회 API
         headers = {"Authorization": f"Bearer {access_token}"}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            if response.status_code != 200:
-                if response.status_code == 401 and response.json().get("resultcode") == "024": # "024": 네이버 인증 실패 에러 코드 https://developers.naver.com/docs/login/profile/profile.md
-                    raise InvalidNaverTokenError()
-                else:
-                    raise NaverApiError()
-            
-            data = response.json()
-            naver_id = data.get("response", {}).get("id")   # 회원의 네이버 고유 식별 id
+        response = await SOCIAL_API_CLIENT.get("naver", url, headers, NaverApiUnavailableError)
+        if response.status_code != 200:
+            if response.status_code == 401 and response.json().get("resultcode") == "024": # "024": 네이버 인증 실패 에러 코드 https://developers.naver.com/docs/login/profile/profile.md
+                raise InvalidNaverTokenError()
+            else:
+                raise NaverApiError()
+        
+        data = response.json()
+        naver_id = data.get("response", {}).get("id")   # 회원의 네이버 고유 식별 id
             
         if naver_id is None:
             raise NaverApiError()
-            
+
+        SOCIAL_API_CLIENT.id_cache.put(cache_key, naver_id)
         return naver_id
                                                      
 
@@ -181,6 +223,7 @@ class UserService:
 
         naver_id = await self.get_naver_id_with_naver_access_token(naver_access_token) # 네이버 access_token 이용해 User의 네이버 고유 식별 id 가져오기
         await self.user_store.link_with_naver(user.userid, naver_id) # User의 네이버 고유 식별 id 등록
+        AUTH_USER_CACHE.pop(user.userid)
 
     # 네이버 access_token 이용해 로그인
     async def signin_with_naver_access_token(self, naver_access_token: str):
@@ -191,29 +234,35 @@ class UserService:
         if user.is_deleted:
             raise UserNotFoundError()
         
-        return self.issue_tokens(user.userid)
+        return self.issue_tokens(user)
 
     async def get_kakao_id_with_kakao_access_token(self, kakao_access_token) -> int:
+        # 같은 토큰으로 재시도하는 경우 캐시된 id 사용
+        cache_key = SOCIAL_API_CLIENT.cache_key("kakao", kakao_access_token)
+        kakao_id = SOCIAL_API_CLIENT.id_cache.get(cache_key)
+        if kakao_id is not None:
+            return kakao_id
+
         url = "https://kapi.kakao.com/v2/user/me" # 카카오 프로필 조회 API
         headers = {
             "Authorization": f"Bearer {kakao_access_token}",
             "Content-type": "application/x-www-form-urlencoded;charset=utf-8"
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            if response.status_code != 200:
-                if response.status_code == 401 and response.json().get("code") == -401: # "024": 카카오 인증 실패 에러 코드 https://developers.kakao.com/docs/latest/ko/rest-api/reference#response-format
-                    raise InvalidKakaoTokenError()
-                else:
-                    raise KakaoApiError()
-            
-            data = response.json()
-            kakao_id = data.get("id")   # 회원의 카카오 고유 식별 id
+        response = await SOCIAL_API_CLIENT.get("kakao", url, headers, KakaoApiUnavailableError)
+        if response.status_code != 200:
+            if response.status_code == 401 and response.json().get("code") == -401: # "024": 카카오 인증 실패 에러 코드 https://developers.kakao.com/docs/latest/ko/rest-api/reference#response-format
+                raise InvalidKakaoTokenError()
+            else:
+                raise KakaoApiError()
+        
+        data = response.json()
+        kakao_id = data.get("id")   # 회원의 카카오 고유 식별 id
             
         if kakao_id is None:
             raise KakaoApiError()
-            
+
+        SOCIAL_API_CLIENT.id_cache.put(cache_key, kakao_id)
         return kakao_id
 
     # 카카오 계정과 연동
@@ -225,6 +274,7 @@ class UserService:
         
         kakao_id = await self.get_kakao_id_with_kakao_access_token(kakao_access_token) # 카카오 access_token 이용해 User의 카카오 고유 식별 id 가져오기
         await self.user_store.link_with_kakao(user.userid, kakao_id) # User의 카카오 고유 식별 id 등록
+        AUTH_USER_CACHE.pop(user.userid)
 
     # 카카오 access_token 이용해 로그인
     async def signin_with_kakao_access_token(self, kakao_access_token: str):
@@ -234,9 +284,11 @@ class UserService:
         if user.is_deleted:
             raise UserNotFoundError()
         
-        return self.issue_tokens(user.userid)
+        return self.issue_tokens(user)
     
     # 회원 탈퇴
     async def delete_user(self, user:User) -> None:
-        return await self.user_store.delete_user(user)
+        token_version = await self.user_store.delete_user(user)
+        AUTH_USER_CACHE.pop(user.userid)
+        TOKEN_REVOCATIONS.revoke(user.id, token_version)
 
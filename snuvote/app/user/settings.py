@@ -0,0 +1,65 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from snuvote.settings import SETTINGS
+
+
+class AuthSettings(BaseSettings):
+    # 인증된 유저 스냅샷 캐시 (탈퇴/비밀번호 변경/계정 연동 시 이 워커에서는 바로 무효화, 다른 워커는 ttl 뒤에 반영)
+    user_cache_maxsize: int = 10000
+    user_cache_ttl_seconds: float = 30
+
+    # 액세스 토큰 유효 시간 (토큰 무효화 목록은 이 시간 안에 token_version이 올라간 유저만 유지)
+    access_token_expire_minutes: int = 60
+
+    # 토큰 무효화 목록(token_version) 갱신 주기 (다른 워커에서 일어난 탈퇴/비밀번호 변경은 최대 이만큼 늦게 반영)
+    revocation_refresh_seconds: float = 5
+    # 갱신 시 마지막으로 읽은 시각보다 이만큼 앞에서부터 다시 읽음 (읽는 사이 commit된 변경과 서버 간 시각 차이 흡수)
+    revocation_sync_overlap_seconds: float = 30
+
+    # 블록된 리프레쉬토큰 목록 (워커마다 메모리에 두고 refresh_seconds마다 DB에서 그 사이 블록된 토큰만 읽음)
+    blocklist_refresh_seconds: float = 60
+    # 갱신 시 마지막으로 읽은 시각보다 이만큼 앞에서부터 다시 읽음 (읽는 사이 commit된 블록과 서버 간 시각 차이 흡수)
+    blocklist_sync_overlap_seconds: float = 30
+    # 만료된 블록 기록 삭제 주기와 한 트랜잭션에서 지울 개수, 배치 사이 대기 시간
+    blocklist_purge_interval_seconds: float = 3600
+    blocklist_purge_batch_size: int = 1000
+    blocklist_purge_pause_ms: int = 100
+
+    # bcrypt 해싱/검증 (이벤트 루프를 막지 않도록 스레드 풀에서 실행)
+    # rounds: 새로 해싱할 때의 cost factor (기존 해시는 해시에 담긴 cost로 검증)
+    # workers: 동시에 실행할 해싱 수 (넘는 요청은 대기하며 그 시간을 queue_wait로 기록)
+    password_hash_rounds: int = 12
+    password_hash_workers: int = 4
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="AUTH_",
+        env_file=SETTINGS.env_file,
+        extra = 'ignore'
+    )
+
+
+class SocialApiSettings(BaseSettings):
+    # 네이버/카카오 프로필 조회 API 클라이언트 (워커마다 하나를 두고 keep-alive 연결을 재사용)
+    timeout_seconds: float = 3
+    connect_timeout_seconds: float = 1
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+
+    # 연속 failure_threshold번 실패(타임아웃/연결 오류/5xx)하면 reset_seconds 동안 호출하지 않고 바로 실패
+    breaker_failure_threshold: int = 5
+    breaker_reset_seconds: float = 30
+
+    # access_token 해시 -> 네이버/카카오 고유 식별 id 캐시 (클라이언트 재시도 흡수용)
+    id_cache_maxsize: int = 10000
+    id_cache_ttl_seconds: float = 60
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="SOCIAL_API_",
+        env_file=SETTINGS.env_file,
+        extra = 'ignore'
+    )
+
+
+AUTH_SETTINGS = AuthSettings()
+SOCIAL_API_SETTINGS = SocialApiSettings()
@@ -0,0 +1,135 @@
+import asyncio
+import hashlib
+import time
+
+import httpx
+from fastapi import HTTPException
+
+from snuvote.app.user.settings import SOCIAL_API_SETTINGS
+from snuvote.cache import LRUCache
+
+
+# 외부 API 서킷 브레이커
+# 연속으로 failure_threshold번 실패하면 열려서(open) reset_seconds 동안 호출을 막고,
+# 그 뒤 한 번만 시험 호출을 허용해 성공하면 닫고(closed) 실패하면 다시 엽니다.
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_seconds:
+            return "open"
+        return "half-open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    # 시험 호출이 성공/실패 판정 없이 끝난 경우(취소) 다음 요청이 다시 시험할 수 있도록 반납
+    def release_trial(self) -> None:
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+# 네이버/카카오 프로필 조회용 클라이언트 (워커 프로세스 내에서 공유)
+# 호출마다 AsyncClient를 만들면 매번 TLS 핸드셰이크를 하므로 하나를 두고 keep-alive 연결을 재사용합니다.
+# 테스트에서는 start(transport=httpx.MockTransport(...))로 실제 API 대신 로컬 transport를 쓸 수 있습니다.
+class SocialApiClient:
+    def __init__(self) -> None:
+        self.client: httpx.AsyncClient | None = None
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+        # key: provider와 access_token의 해시, value: 네이버/카카오 고유 식별 id
+        self.id_cache: LRUCache[str, str | int] = LRUCache(
+            maxsize=SOCIAL_API_SETTINGS.id_cache_maxsize,
+            ttl=SOCIAL_API_SETTINGS.id_cache_ttl_seconds
+        )
+
+    def get_client(self, transport: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                timeout=httpx.Timeout(SOCIAL_API_SETTINGS.timeout_seconds, connect=SOCIAL_API_SETTINGS.connect_timeout_seconds),
+                limits=httpx.Limits(
+                    max_connections=SOCIAL_API_SETTINGS.max_connections,
+                    max_keepalive_connections=SOCIAL_API_SETTINGS.max_keepalive_connections
+                ),
+                transport=transport,
+            )
+        return self.client
+
+    def get_breaker(self, provider: str) -> CircuitBreaker:
+        if provider not in self.breakers:
+            self.breakers[provider] = CircuitBreaker(
+                failure_threshold=SOCIAL_API_SETTINGS.breaker_failure_threshold,
+                reset_seconds=SOCIAL_API_SETTINGS.breaker_reset_seconds
+            )
+        return self.breakers[provider]
+
+    # access_token 원문은 메모리에 남기지 않도록 해시를 key로 사용
+    def cache_key(self, provider: str, access_token: str) -> str:
+        return hashlib.sha256(f"{provider}:{access_token}".encode('utf-8')).hexdigest()
+
+    # provider가 장애 중이면(브레이커 open, 타임아웃, 연결 오류) unavailable_error를 바로 발생
+    # 5xx 응답은 실패로 기록하되 응답은 그대로 반환
+    async def get(self, provider: str, url: str, headers: dict, unavailable_error: type[HTTPException]) -> httpx.Response:
+        breaker = self.get_breaker(provider)
+        if not breaker.allow():
+            raise unavailable_error()
+
+        # 어떤 예외로 끝나든 half-open 시험 호출 슬롯을 풀어야 브레이커가 계속 막혀 있지 않음
+        # 요청 취소(클라이언트 연결 끊김 등)는 provider 장애가 아니므로 실패로 세지 않고 슬롯만 반납
+        try:
+            response = await self.get_client().get(url, headers=headers)
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise unavailable_error()
+        except asyncio.CancelledError:
+            breaker.release_trial()
+            raise
+        except BaseException:
+            breaker.record_failure()
+            raise
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    # 워커 시작 시 호출
+    def start(self, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        self.get_client(transport)
+
+    # 워커 종료 시 호출
+    async def stop(self) -> None:
+        if self.client is None:
+            return
+
+        await self.client.aclose()
+        self.client = None
+
+
+# 워커 프로세스 전체에서 공유하는 클라이언트 (snuvote.main의 lifespan에서 start/stop)
+SOCIAL_API_CLIENT = SocialApiClient()
@@ -1,19 +1,22 @@
 from functools import cache
 from typing import Annotated
-from datetime import datetime
+from datetime import datetime, timezone
 
 from fastapi import Depends
-from snuvote.app.user.errors import EmailAlreadyExistsError, UserIdAlreadyExistsError, UserNotFoundError, NotLinkedNaverAccountError, NaverLinkAlreadyExistsError, NotLinkedKakaoAccountError, KakaoLinkAlreadyExistsError
+from snuvote.app.user.errors import BlockedRefreshTokenError, EmailAlreadyExistsError, UserIdAlreadyExistsError, UserNotFoundError, NotLinkedNaverAccountError, NaverLinkAlreadyExistsError, NotLinkedKakaoAccountError, KakaoLinkAlreadyExistsError
 from snuvote.database.models import User, BlockedRefreshToken, NaverUser, KakaoUser
 
-from snuvote.database.connection import get_db_session
+from snuvote.database.connection import get_db_session, get_read_db_session
 from sqlalchemy import select, delete
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 
 class UserStore:
-    def __init__(self, session: Annotated[Session, Depends(get_db_session)]) -> None:
+    def __init__(self,
+                 session: Annotated[Session, Depends(get_db_session)],
+                 read_session: Annotated[Session, Depends(get_read_db_session)]) -> None:
         self.session = session
+        self.read_session = read_session # 읽기 전용 조회(replica)에 사용
 
     #회원가입하기
     async def add_user(self, userid: str, hashed_password: str, email: str, name: str, college: int) -> User:
@@ -29,9 +32,16 @@ class UserStore:
 
         return user
 
+    # 조회만 한 트랜잭션을 끝내 커넥션을 풀에 반납 (비밀번호 해싱처럼 오래 걸리는 작업 전에 호출)
+    # expire_on_commit=False이므로 조회한 User는 그대로 사용할 수 있음
+    async def release_connection(self) -> None:
+        await self.session.commit()
+
     #아이디로 유저찾기
-    async def get_user_by_userid(self, userid: str) -> User | None:
-        return await self.session.scalar(select(User).options(joinedload(User.naver_user), joinedload(User.kakao_user)).where(User.userid == userid))
+    # read_only=True이면 replica에서 조회 (반환된 User를 수정하는 경우에는 primary에서 조회해야 함)
+    async def get_user_by_userid(self, userid: str, read_only: bool = False) -> User | None:
+        session = self.read_session if read_only else self.session
+        return await session.scalar(select(User).options(joinedload(User.naver_user), joinedload(User.kakao_user)).where(User.userid == userid))
 
     #유저 고유 번호로 유저 찾기
     async def get_user_by_user_id(self, user_id:int) -> User|None:
@@ -42,25 +52,53 @@ class UserStore:
         return await self.session.scalar(select(User).where(User.email == email))
 
     #만료된 리프레쉬토큰 블랙하기
+    # token_id가 PK이므로 다른 워커에서 같은 토큰을 동시에 블록하면 한쪽만 성공 (재사용 방지는 여기서 보장)
     async def block_refresh_token(self, token_id: str, expires_at: datetime) -> None:
-        blocked_refresh_token = BlockedRefreshToken(token_id=token_id, expires_at=expires_at)
+        blocked_refresh_token = BlockedRefreshToken(token_id=token_id, expires_at=expires_at, blocked_at=datetime.now())
         self.session.add(blocked_refresh_token)
-        await self.session.flush()
+        try:
+            await self.session.flush()
+        except IntegrityError:
+            raise BlockedRefreshTokenError()
+
+    # 아직 만료되지 않은 블록된 리프레쉬토큰 {token_id: expires_at}
+    async def get_blocked_refresh_tokens(self, now: datetime) -> dict[str, datetime]:
+        rows = await self.session.execute(
+            select(BlockedRefreshToken.token_id, BlockedRefreshToken.expires_at).where(BlockedRefreshToken.expires_at > now)
+        )
+        return {token_id: expires_at for token_id, expires_at in rows}
 
-    #리프레쉬토큰 만료 체크하기
-    async def is_refresh_token_blocked(self, token_id: int) -> bool:
-        return (
-            await self.session.scalar(
-                select(BlockedRefreshToken).where(BlockedRefreshToken.token_id == token_id)
-            )
-            is not None
+    # since 이후에 블록된 리프레쉬토큰 {token_id: expires_at} (blocked_at 인덱스만 타도록 만료 여부는 거르지 않음)
+    async def get_blocked_refresh_tokens_since(self, since: datetime) -> dict[str, datetime]:
+        rows = await self.session.execute(
+            select(BlockedRefreshToken.token_id, BlockedRefreshToken.expires_at).where(BlockedRefreshToken.blocked_at > since)
         )
+        return {token_id: expires_at for token_id, expires_at in rows}
+
+    # 만료된 블록 기록을 최대 batch_size개 삭제하고 삭제한 개수 반환
+    async def purge_expired_refresh_tokens(self, now: datetime, batch_size: int) -> int:
+        token_ids = (await self.session.scalars(
+            select(BlockedRefreshToken.token_id).where(BlockedRefreshToken.expires_at <= now).limit(batch_size)
+        )).all()
+        if token_ids:
+            await self.session.execute(delete(BlockedRefreshToken).where(BlockedRefreshToken.token_id.in_(token_ids)))
+        return len(token_ids)
     
-    #비밀번호 변경하기
-    async def reset_password(self, userid:str, new_password:str) -> None:
+    #비밀번호 변경하기 (기존 토큰을 무효화하기 위해 token_version을 올리고 새 버전 반환)
+    async def reset_password(self, userid:str, new_password:str) -> int:
         user = await self.get_user_by_userid(userid)
         user.hashed_password = new_password
+        user.token_version += 1
+        user.token_version_changed_at = datetime.now(timezone.utc)
         await self.session.flush()
+        return user.token_version
+
+    # since 이후에 token_version이 올라간 유저들의 {user.id: (token_version, 올라간 시각)} (토큰 무효화 확인용)
+    async def get_token_versions_changed_since(self, since: datetime) -> dict[int, tuple[int, datetime]]:
+        rows = await self.session.execute(
+            select(User.id, User.token_version, User.token_version_changed_at).where(User.token_version_changed_at > since)
+        )
+        return {user_id: (token_version, changed_at.replace(tzinfo=timezone.utc)) for user_id, token_version, changed_at in rows}
 
     # 네이버 고유 식별 id 등록
     async def link_with_naver(self, userid: str, naver_id: str):
@@ -112,11 +150,16 @@ class UserStore:
         
         return user
     
-    # 탈퇴하기
-    async def delete_user(self, user: User) -> None:
+    # 탈퇴하기 (올라간 token_version 반환)
+    async def delete_user(self, user: User) -> int:
+        # 인증 시 replica에서 읽어온 User일 수 있으므로 primary에서 다시 조회
+        user = await self.get_user_by_user_id(user.id)
+
         # 회원 탈퇴 처리
         user.is_deleted = True
         user.name = "탈퇴한 회원"
+        user.token_version += 1
+        user.token_version_changed_at = datetime.now(timezone.utc)
 
         # 소셜 계정 연동 정보 삭제
         naver_user = await self.session.scalar(select(NaverUser).where(NaverUser.user_id == user.id))
@@ -127,4 +170,5 @@ class UserStore:
         if kakao_user:
             await self.session.delete(kakao_user)
             
-        await self.session.flush()
\ No newline at end of file
+        await self.session.flush()
+        return user.token_version
@@ -7,6 +7,7 @@ from snuvote.app.user.dto.requests import UserSignupRequest, UserSigninRequest,
 from snuvote.app.user.dto.responses import UserSigninResponse, UserInfoResponse
 from snuvote.database.models import User
 from snuvote.app.user.service import UserService
+from snuvote.app.user.cache import AuthenticatedUser
 from snuvote.app.user.errors import InvalidTokenError, UserNotFoundError
 
 import secrets
@@ -22,13 +23,25 @@ async def login_with_access_token(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
 ) -> User:
     token = credentials.credentials # Authorization 헤더에서 Bearer: 를 제외한 token만 추출
-    userid = user_service.validate_access_token(token)
-    user = await user_service.get_user_by_userid(userid)
+    payload = user_service.validate_access_token(token)
+    user = await user_service.get_user_by_userid(payload["sub"], read_only=True) # 매 요청마다 실행되는 인증 조회는 replica에서
     if not user or user.is_deleted:
         raise UserNotFoundError()
+    if payload.get("ver", 0) < user.token_version: # 다른 워커에서 아직 반영되지 않은 무효화도 확인
+        raise InvalidTokenError()
     return user
 
 
+# user.id, user.name만 필요한 핸들러용 인증: 토큰에 담긴 정보로 만들므로 DB를 조회하지 않음
+async def get_authenticated_user(
+    user_service: Annotated[UserService, Depends()],
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
+) -> AuthenticatedUser:
+    token = credentials.credentials # Authorization 헤더에서 Bearer: 를 제외한 token만 추출
+    payload = user_service.validate_access_token(token)
+    return await user_service.get_authenticated_user(payload)
+
+
 
 # signup API
 @user_router.post("/signup", status_code=HTTP_201_CREATED)
@@ -0,0 +1,457 @@
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import List, TextIO
+
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from snuvote.app.vote.cache import bump_vote_version, invalidate_finalized_vote
+from snuvote.app.vote.live import TALLY_HUB
+from snuvote.app.vote.settings import BALLOT_BUFFER_SETTINGS
+from snuvote.app.vote.store import VoteStore
+from snuvote.database.connection import DB_MANAGER
+from snuvote.database.models import Vote
+from snuvote.metrics import METRICS_LOGGER
+
+
+logger = logging.getLogger(__name__)
+
+
+# 로그에 기록되는 표 한 장 (선택한 선택지 전체를 담으므로 같은 표를 여러 번 반영해도 결과가 같음)
+# submitted_at: 제출 시각(UTC epoch 초), 이보다 나중의 참여가 이미 반영되어 있으면 다시 반영하지 않음 (이전 버전 로그에는 없음)
+@dataclass
+class Ballot:
+    seq: int
+    vote_id: int
+    user_id: int
+    choice_ids: List[int]
+    submitted_at: float | None = None
+
+    @property
+    def participated_at(self) -> datetime | None:
+        if self.submitted_at is None:
+            return None
+        return datetime.fromtimestamp(self.submitted_at, timezone.utc)
+
+
+# write-behind 투표 버퍼
+# 검증이 끝난 표를 워커별 write-ahead log에 fsync로 기록한 뒤 바로 응답하고,
+# 백그라운드 flusher가 batch_size개 또는 flush_interval_ms마다 한 트랜잭션으로 묶어 DB에 반영합니다.
+# 반영이 끝난 지점은 같은 로그에 checkpoint로 남기고, 재시작 시 checkpoint 이후의 표를 다시 반영합니다.
+# DB 연결 오류가 아닌 오류로 따로 반영해도 실패하는 표는 dead-letter 파일(wal_dir/dead-ballots.jsonl)로 옮기고 checkpoint를 계속 남깁니다.
+# (scripts/replay_dead_ballots.py로 다시 반영)
+class BallotBuffer:
+    def __init__(self):
+        self.wal_path: str | None = None
+        self.wal_file: TextIO | None = None
+        self.wal_bytes = 0
+        self.dead_letters: List[tuple[Ballot, str]] = [] # dead-letter 파일에 아직 기록하지 못한 (표, 오류)
+
+        self.queue: asyncio.Queue[Ballot | None] | None = None
+        self.last_seq = 0
+        self.unflushed = 0 # 로그에 기록(중)이지만 아직 DB에 반영되지 않은 표 수
+        self.pending_by_vote: Counter[int] = Counter() # 투표별 아직 DB에 반영되지 않은 표 수 (반영하지 못한 표 포함)
+        self.stopping = False
+
+        # 로그 쓰기 요청: (기록할 줄 (None이면 로그 비우기), 기록 후 flusher에 넘길 표, 완료 future)
+        self.wal_ops: List[tuple[str | None, Ballot | None, asyncio.Future]] = []
+        self.wal_event: asyncio.Event | None = None
+        self.space_event: asyncio.Event | None = None
+
+        self.wal_writer_task: asyncio.Task | None = None
+        self.flusher_task: asyncio.Task | None = None
+
+        # 지표
+        self.flushed_count = 0
+        self.failed_count = 0 # 오류로 반영하지 못하고 dead-letter 파일로 옮긴 표 수
+        self.batch_count = 0
+        self.last_flush_latency_ms = 0.0
+        self.max_flush_latency_ms = 0.0
+        self.total_flush_latency_ms = 0.0
+
+    # 버퍼를 거쳐 표를 받을 수 있는지 (꺼져 있거나 종료 중이면 요청에서 바로 DB에 반영)
+    @property
+    def accepting(self) -> bool:
+        return self.flusher_task is not None and not self.stopping
+
+    # 이 워커 버퍼에 아직 DB에 반영되지 않은 이 투표의 표가 있는지 (종료된 투표 결과를 캐싱하기 전에 확인)
+    def has_pending(self, vote_id: int) -> bool:
+        return self.pending_by_vote[vote_id] > 0
+
+    def release_pending(self, vote_id: int) -> None:
+        self.pending_by_vote[vote_id] -= 1
+        if self.pending_by_vote[vote_id] <= 0:
+            del self.pending_by_vote[vote_id]
+
+    @staticmethod
+    def dead_letter_path() -> str:
+        return os.path.join(BALLOT_BUFFER_SETTINGS.wal_dir, "dead-ballots.jsonl")
+
+    def metrics(self) -> dict:
+        return {
+            "queue_depth": self.unflushed,
+            "pending_votes": len(self.pending_by_vote),
+            "flushed_count": self.flushed_count,
+            "failed_count": self.failed_count,
+            "dead_letters_unwritten": len(self.dead_letters),
+            "batch_count": self.batch_count,
+            "last_flush_latency_ms": self.last_flush_latency_ms,
+            "avg_flush_latency_ms": self.total_flush_latency_ms / self.batch_count if self.batch_count else 0.0,
+            "max_flush_latency_ms": self.max_flush_latency_ms,
+            "wal_bytes": self.wal_bytes,
+        }
+
+    # 워커 시작 시 (DB_MANAGER.start() 이후) 호출
+    async def start(self) -> None:
+        if not BALLOT_BUFFER_SETTINGS.enabled or self.flusher_task is not None:
+            return
+
+        os.makedirs(BALLOT_BUFFER_SETTINGS.wal_dir, exist_ok=True)
+        self.wal_path = os.path.join(BALLOT_BUFFER_SETTINGS.wal_dir, f"ballots-{os.getpid()}.wal")
+        self.wal_file = self.open_locked(self.wal_path)
+
+        self.queue = asyncio.Queue()
+        self.wal_event = asyncio.Event()
+        self.space_event = asyncio.Event()
+        self.stopping = False
+
+        # 같은 pid로 이전에 돌던 워커가 남긴 표는 순서대로 다시 반영
+        ballots, self.last_seq = self.read_pending(self.wal_file)
+        for ballot in ballots:
+            self.queue.put_nowait(ballot)
+            self.pending_by_vote[ballot.vote_id] += 1
+        self.unflushed = len(ballots)
+
+        self.wal_writer_task = asyncio.create_task(self.run_wal_writer())
+
+        # 비정상 종료된 다른 워커의 로그는 이 워커 로그로 옮겨서 반영
+        await self.adopt_orphaned_logs()
+
+        self.flusher_task = asyncio.create_task(self.run_flusher())
+        METRICS_LOGGER.register("ballot_buffer", self.metrics)
+
+    # 워커 종료 시 (DB_MANAGER.dispose() 이전) 호출
+    # 남은 표를 최대한 반영하고, 시간 안에 반영하지 못한 표는 로그에 남아 다음 시작 때 반영됨
+    async def stop(self, timeout: float = 10) -> None:
+        if self.flusher_task is None:
+            return
+
+        self.stopping = True
+
+        # 이미 기록 중인 표가 flusher에 넘어간 뒤 종료 신호 전달
+        try:
+            await asyncio.wait_for(self.write_wal(""), timeout)
+        except Exception:
+            logger.exception("ballot WAL barrier failed")
+        self.queue.put_nowait(None)
+
+        try:
+            await asyncio.wait_for(self.flusher_task, timeout)
+        except Exception:
+            logger.exception("ballot flusher did not finish, %d ballots left in %s", self.unflushed, self.wal_path)
+
+        self.wal_writer_task.cancel()
+        try:
+            await self.wal_writer_task
+        except asyncio.CancelledError:
+            pass
+
+        if self.dead_letters:
+            logger.error("%d failed ballots could not be moved to %s, they stay in %s", len(self.dead_letters), self.dead_letter_path(), self.wal_path)
+        METRICS_LOGGER.unregister("ballot_buffer")
+
+        self.wal_file.close()
+        self.wal_file = None
+        self.wal_writer_task = None
+        self.flusher_task = None
+
+    # 표를 로그에 기록 (fsync까지 끝나면 반환)
+    # submitted_at은 다른 워커의 로그를 인수할 때 원래 제출 시각을 유지하기 위해 사용
+    async def submit(self, vote_id: int, user_id: int, choice_ids: List[int], submitted_at: float | None = None) -> None:
+        # 반영 대기 중인 표가 너무 많으면 flusher가 따라잡을 때까지 대기 (시작 중 로그 인수 시에는 flusher가 아직 없으므로 대기하지 않음)
+        while self.flusher_task is not None and self.unflushed >= BALLOT_BUFFER_SETTINGS.max_queue_size:
+            self.space_event.clear()
+            await self.space_event.wait()
+
+        # seq 발급과 로그 쓰기 요청 사이에 await가 없으므로 로그와 flusher에는 seq 순서대로 들어감
+        self.last_seq += 1
+        self.unflushed += 1
+        ballot = Ballot(
+            seq=self.last_seq,
+            vote_id=vote_id,
+            user_id=user_id,
+            choice_ids=list(choice_ids),
+            submitted_at=submitted_at if submitted_at is not None else time.time()
+        )
+        self.pending_by_vote[vote_id] += 1
+
+        try:
+            await self.write_wal(json.dumps(asdict(ballot)) + "\n", ballot)
+        except Exception:
+            self.unflushed -= 1
+            self.release_pending(vote_id)
+            raise
+
+    async def write_wal(self, record: str | None, ballot: Ballot | None = None) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self.wal_ops.append((record, ballot, future))
+        self.wal_event.set()
+        await future
+
+    # 로그 쓰기는 이 태스크 하나가 담당: 그동안 쌓인 요청을 한 번의 write + fsync로 처리 (group commit)
+    async def run_wal_writer(self) -> None:
+        while True:
+            await self.wal_event.wait()
+            self.wal_event.clear()
+
+            ops, self.wal_ops = self.wal_ops, []
+            if not ops:
+                continue
+
+            records: List[str] = []
+            truncate = False
+            for record, _, _ in ops:
+                if record is None:
+                    # 로그 비우기는 모든 표가 반영된 뒤에만 요청되므로 앞에 쌓인 줄은 checkpoint뿐
+                    truncate = True
+                    records = []
+                else:
+                    records.append(record)
+
+            try:
+                await asyncio.to_thread(self.write_records, "".join(records), truncate)
+            except Exception as e:
+                for _, _, future in ops:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for _, ballot, future in ops:
+                if ballot is not None:
+                    self.queue.put_nowait(ballot)
+                if not future.done():
+                    future.set_result(None)
+
+    def write_records(self, data: str, truncate: bool) -> None:
+        if truncate:
+            self.wal_file.seek(0)
+            self.wal_file.truncate()
+        if data:
+            self.wal_file.write(data)
+        self.wal_file.flush()
+        os.fsync(self.wal_file.fileno())
+        self.wal_bytes = self.wal_file.tell()
+
+    async def run_flusher(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = BALLOT_BUFFER_SETTINGS.flush_interval_ms / 1000
+
+        while True:
+            ballot = await self.queue.get()
+            if ballot is None:
+                return
+
+            # batch_size개가 모이거나 flush_interval_ms가 지나면 반영
+            batch = [ballot]
+            stop = False
+            deadline = loop.time() + interval
+            while len(batch) < BALLOT_BUFFER_SETTINGS.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    ballot = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if ballot is None:
+                    stop = True
+                    break
+                batch.append(ballot)
+
+            await self.flush(batch)
+            if stop:
+                return
+
+    async def flush(self, batch: List[Ballot]) -> None:
+        started = time.perf_counter()
+
+        failed: List[tuple[Ballot, str]] = []
+        if await self.apply_with_retry(batch) is not None:
+            # 일부 표 때문에 배치 전체가 실패한 경우 -> 한 장씩 따로 반영
+            # 그래도 실패하는 표는 이미 응답한 표이므로 버리지 않고 dead-letter 파일로 옮김
+            for ballot in batch:
+                error = await self.apply_with_retry([ballot])
+                if error is not None:
+                    failed.append((ballot, repr(error)))
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.batch_count += 1
+        self.flushed_count += len(batch) - len(failed)
+        self.last_flush_latency_ms = latency_ms
+        self.max_flush_latency_ms = max(self.max_flush_latency_ms, latency_ms)
+        self.total_flush_latency_ms += latency_ms
+
+        failed_ballots = [ballot for ballot, _ in failed]
+        done = [ballot for ballot in batch if ballot not in failed_ballots]
+
+        # 이전에 기록하지 못한 것까지 dead-letter 파일에 기록, 기록한 표는 더 이상 반영 대기 중이 아님
+        self.dead_letters.extend(failed)
+        if self.dead_letters:
+            try:
+                await asyncio.to_thread(self.write_dead_letters, self.dead_letters)
+                logger.error("moved %d ballots that failed to apply to %s", len(self.dead_letters), self.dead_letter_path())
+                self.failed_count += len(self.dead_letters)
+                done.extend(ballot for ballot, _ in self.dead_letters)
+                self.dead_letters = []
+            except Exception:
+                logger.exception("failed to write dead-letter ballots, keeping them in %s", self.wal_path)
+
+        self.unflushed -= len(done)
+        self.space_event.set()
+        for ballot in done:
+            self.release_pending(ballot.vote_id)
+
+        for vote_id in {ballot.vote_id for ballot in batch}:
+            TALLY_HUB.publish(vote_id)
+            bump_vote_version(vote_id)
+            invalidate_finalized_vote(vote_id)
+
+        # dead-letter 파일에 아직 기록하지 못한 표가 있으면 checkpoint를 남기지 않음 (checkpoint가 그 표를 넘어가면 재시작 시 반영되지 않음)
+        # 재시작 시 그 표 이후의 표도 다시 반영되지만, 같은 표를 다시 반영해도 결과는 같음
+        if self.dead_letters:
+            return
+
+        # 반영이 끝난 지점 기록 (모두 반영되었고 로그가 커졌으면 로그를 비움)
+        try:
+            if self.unflushed == 0 and self.wal_bytes >= BALLOT_BUFFER_SETTINGS.wal_truncate_bytes:
+                await self.write_wal(None)
+            else:
+                await self.write_wal(json.dumps({"checkpoint": batch[-1].seq}) + "\n")
+        except Exception:
+            # checkpoint를 남기지 못해도 재시작 시 같은 표를 다시 반영할 뿐 결과는 같음
+            logger.exception("failed to write ballot checkpoint")
+
+    # 반영하지 못한 표를 dead-letter 파일 끝에 추가 (여러 워커가 같은 파일에 쓰므로 잠금 후 한 번에 기록)
+    def write_dead_letters(self, dead_letters: List[tuple[Ballot, str]]) -> None:
+        failed_at = time.time()
+        data = "".join(
+            json.dumps({"ballot": asdict(ballot), "error": error, "failed_at": failed_at}) + "\n"
+            for ballot, error in dead_letters
+        )
+        with open(self.dead_letter_path(), "a", encoding="utf-8") as dead_letter_file:
+            fcntl.flock(dead_letter_file, fcntl.LOCK_EX)
+            dead_letter_file.write(data)
+            dead_letter_file.flush()
+            os.fsync(dead_letter_file.fileno())
+
+    # DB 연결 문제는 표를 버리지 않고 계속 재시도, 그 외 오류면 그 오류를 반환 (반영되면 None)
+    async def apply_with_retry(self, batch: List[Ballot]) -> Exception | None:
+        while True:
+            try:
+                await self.apply(batch)
+                return None
+            except (OperationalError, InterfaceError):
+                logger.exception("ballot flush failed, retrying")
+                await asyncio.sleep(BALLOT_BUFFER_SETTINGS.retry_backoff_ms / 1000)
+            except Exception as e:
+                logger.exception("ballot flush failed")
+                return e
+
+    # 배치의 표를 seq 순서대로 한 트랜잭션에 반영
+    async def apply(self, batch: List[Ballot]) -> None:
+        async with DB_MANAGER.session_factory() as session:
+            vote_store = VoteStore(session=session, read_session=session)
+            await vote_store.begin_participation()
+
+            votes: dict[int, Vote | None] = {}
+            for ballot in batch:
+                if ballot.vote_id not in votes:
+                    votes[ballot.vote_id] = await vote_store.get_vote_by_vote_id(ballot.vote_id)
+
+                vote = votes[ballot.vote_id]
+                if vote is None:
+                    continue
+
+                # 재시작/로그 인수로 늦게 반영되는 표는 그 뒤에 반영된 참여를 덮어쓰지 않음
+                if not await vote_store.apply_participation(vote, ballot.user_id, ballot.choice_ids, ballot.participated_at):
+                    logger.info("skipped stale ballot %s", asdict(ballot))
+
+            await session.commit()
+
+    # 다른 워커가 잠그고 있지 않은 로그 파일을 인수
+    async def adopt_orphaned_logs(self) -> None:
+        for name in sorted(os.listdir(BALLOT_BUFFER_SETTINGS.wal_dir)):
+            path = os.path.join(BALLOT_BUFFER_SETTINGS.wal_dir, name)
+            if path == self.wal_path or not (name.startswith("ballots-") and name.endswith(".wal")):
+                continue
+
+            with open(path, "a+", encoding="utf-8") as orphan:
+                try:
+                    fcntl.flock(orphan, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue # 살아 있는 워커의 로그
+
+                # 잠그는 사이 다른 워커가 이미 인수해서 지운 파일
+                if not os.path.exists(path) or os.stat(path).st_ino != os.fstat(orphan.fileno()).st_ino:
+                    continue
+
+                ballots, _ = self.read_pending(orphan)
+                for ballot in ballots:
+                    await self.submit(ballot.vote_id, ballot.user_id, ballot.choice_ids, ballot.submitted_at)
+
+                os.remove(path)
+
+    # 로그 파일을 열고 배타 잠금 (잠그는 사이 다른 워커가 지운 경우 다시 생성)
+    @staticmethod
+    def open_locked(path: str) -> TextIO:
+        while True:
+            wal_file = open(path, "a+", encoding="utf-8")
+            try:
+                fcntl.flock(wal_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                wal_file.close()
+                raise RuntimeError(f"ballot WAL {path} is locked by another process")
+
+            if os.path.exists(path) and os.stat(path).st_ino == os.fstat(wal_file.fileno()).st_ino:
+                return wal_file
+            wal_file.close()
+
+    # 로그에서 checkpoint 이후의 표와 마지막 seq를 읽음
+    @staticmethod
+    def read_pending(wal_file: TextIO) -> tuple[List[Ballot], int]:
+        wal_file.seek(0)
+        content = wal_file.read()
+
+        ballots: List[Ballot] = []
+        checkpoint = 0
+        last_seq = 0
+        for line in content.splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue # 비정상 종료로 잘린 마지막 줄
+
+            if "checkpoint" in record:
+                checkpoint = max(checkpoint, record["checkpoint"])
+                continue
+
+            ballot = Ballot(**record)
+            last_seq = max(last_seq, ballot.seq)
+            ballots.append(ballot)
+
+        # 잘린 줄 뒤에 이어 쓰지 않도록 줄바꿈으로 마무리
+        if content and not content.endswith("\n"):
+            wal_file.write("\n")
+            wal_file.flush()
+
+        return [ballot for ballot in ballots if ballot.seq > checkpoint], last_seq
+
+
+# 워커 프로세스 전체에서 공유하는 BallotBuffer (snuvote.main의 lifespan에서 start/stop)
+BALLOT_BUFFER = BallotBuffer()
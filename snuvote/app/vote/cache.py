@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import List
+
+from snuvote.app.vote.dto.responses import VoteDetailResponse, OnGoingVotesListResponse
+from snuvote.app.vote.settings import VOTE_CACHE_SETTINGS
+from snuvote.cache import LRUCache, VersionedLRUCache
+from snuvote.metrics import METRICS_LOGGER
+
+
+# 종료된 투표의 상세 정보 중 유저와 무관한 부분 (댓글 제외), key: vote_id
+FINALIZED_VOTE_CACHE: LRUCache[int, VoteDetailResponse] = LRUCache(
+    maxsize=VOTE_CACHE_SETTINGS.finalized_maxsize,
+    ttl=VOTE_CACHE_SETTINGS.finalized_ttl_seconds
+)
+
+# 종료된 투표의 선택지 참여자 이름 페이지, key: (vote_id, choice_id, start_cursor_id), value: (이름 리스트, has_next, next_cursor_id)
+# 페이지마다 한 항목이므로 클라이언트가 임의의 cursor로 요청해도 maxsize 이상 늘어나지 않음
+FINALIZED_PARTICIPANTS_CACHE: LRUCache[tuple[int, int, int|None], tuple[List[str], bool, int|None]] = LRUCache(
+    maxsize=VOTE_CACHE_SETTINGS.finalized_participants_maxsize,
+    ttl=VOTE_CACHE_SETTINGS.finalized_ttl_seconds
+)
+
+# 투표 상세 정보 중 유저와 무관한 부분 (댓글 첫 페이지 포함), key: (vote_id, read_only)
+# replica에서 읽어 만든 값은 primary에서 읽어야 하는 요청(쓰기 직후 다시 읽기)에 쓰지 않도록 read_only별로 따로 저장
+# 투표/댓글을 바꾸는 VoteStore 메서드가 commit 후 bump_vote_version으로 버전을 올림
+VOTE_DETAIL_CACHE: VersionedLRUCache[tuple[int, bool], VoteDetailResponse] = VersionedLRUCache(
+    maxsize=VOTE_CACHE_SETTINGS.detail_maxsize,
+    ttl=VOTE_CACHE_SETTINGS.detail_ttl_seconds,
+    max_bytes=VOTE_CACHE_SETTINGS.detail_max_bytes
+)
+
+
+def bump_vote_version(vote_id: int) -> None:
+    VOTE_DETAIL_CACHE.bump((vote_id, False))
+    VOTE_DETAIL_CACHE.bump((vote_id, True))
+
+
+# 종료 후에 집계가 바뀐 경우 (종료 직전에 검증된 참여가 늦게 반영된 경우 등) 캐시에서 제거
+def invalidate_finalized_vote(vote_id: int) -> None:
+    FINALIZED_VOTE_CACHE.pop(vote_id)
+    FINALIZED_PARTICIPANTS_CACHE.pop_where(lambda key: key[0] == vote_id)
+
+
+# 모든 유저에게 같은 리스트 카테고리(진행 중/완료된/HOT) 페이지 (participated는 모두 False)
+# key: (category, start_cursor)
+VOTE_LIST_CACHE: LRUCache[tuple[str, tuple[datetime, int]|None], OnGoingVotesListResponse] = LRUCache(
+    maxsize=VOTE_CACHE_SETTINGS.list_maxsize,
+    ttl=VOTE_CACHE_SETTINGS.list_ttl_seconds
+)
+
+
+# 투표가 생성되거나 종료되면 리스트 페이지 구성이 바뀌므로 전부 버림 (참여자 수 변화 등은 ttl 뒤에 반영)
+def invalidate_vote_lists() -> None:
+    VOTE_LIST_CACHE.clear()
+
+
+# 캐시별 크기/적중률을 주기적으로 info 로그로 남김
+METRICS_LOGGER.register("vote_detail_cache", VOTE_DETAIL_CACHE.metrics)
+METRICS_LOGGER.register("vote_list_cache", VOTE_LIST_CACHE.metrics)
+METRICS_LOGGER.register("finalized_vote_cache", FINALIZED_VOTE_CACHE.metrics)
+METRICS_LOGGER.register("finalized_participants_cache", FINALIZED_PARTICIPANTS_CACHE.metrics)
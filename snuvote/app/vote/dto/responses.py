@@ -3,7 +3,8 @@ from datetime import datetime, timezone, timedelta
 from typing import List, Annotated, TypeVar, Callable
 
 from snuvote.database.models import Vote, User, Choice, ChoiceParticipation, Comment
-from pydantic import BaseModel
+from snuvote.app.user.cache import AuthenticatedUser
+from pydantic import BaseModel, Field
 from pydantic.functional_validators import AfterValidator
 
 KST = timezone(timedelta(hours=9), "KST")
@@ -34,21 +35,9 @@ class VotesListInfoResponse(BaseModel):
     participant_count: int
     image: str| None
 
+    # 리스트 조회 결과 (Vote, 현재 유저의 참여 여부, 첫 번째 이미지 src)를 받아 변환
     @staticmethod
-    def from_vote_user(vote: Vote, user: User, participant_count: int) -> "VotesListInfoResponse":
-
-        # 해당 유저의 참여 여부
-        participated = False
-        for choice in vote.choices:
-            for choice_participation in choice.choice_participations:
-
-                #해당 유저가 참여했는지 여부
-                if choice_participation.user_id == user.id:
-                    participated = True
-                    break
-
-
-
+    def from_vote(vote: Vote, participated: bool, image_src: str|None) -> "VotesListInfoResponse":
         return VotesListInfoResponse(
             id=vote.id,
             title=vote.title,
@@ -56,8 +45,8 @@ class VotesListInfoResponse(BaseModel):
             create_datetime=vote.create_datetime,
             end_datetime=vote.end_datetime,
             participated = participated,
-            participant_count= participant_count,
-            image= vote.images[0].src if vote.images else None
+            participant_count= vote.participant_count,
+            image= image_src
         )
 
 class OnGoingVotesListResponse(BaseModel):
@@ -66,47 +55,40 @@ class OnGoingVotesListResponse(BaseModel):
     next_cursor_time: datetime|None = None
     next_cursor_id: int|None = None
 
+    # 유저가 참여한 투표의 participated만 덮어쓴 복사본
+    def for_user(self, participated_vote_ids: set[int]) -> "OnGoingVotesListResponse":
+        return self.model_copy(update={
+            "votes_list": [vote.model_copy(update={"participated": vote.id in participated_vote_ids}) for vote in self.votes_list]
+        })
+
 class ChoiceDetailResponse(BaseModel):
     choice_id: int
     choice_content: str
     participated: bool
     choice_num_participants: int|None = None
-    choice_participants_name: List[str]|None = None
     
     # Choice를 받아 ChoiceDetailResponse로 변환
+    # 참여자 이름은 GET /votes/{vote_id}/choices/{choice_id}/participants로 따로 조회
     @staticmethod
-    def from_choice(choice: Choice, user: User, annonymous_choice, realtime_result, end_datetime) -> "ChoiceDetailResponse":
-        id = choice.id
-        content = choice.choice_content
-        num_participants = len(choice.choice_participations)
-        participants_name = [choice_participation.user.name for choice_participation in choice.choice_participations]
-
-
-        #로그인한 유저가 선택지를 선택했는지 여부
-        participated = False
-        for choice_participation in choice.choice_participations:
-            if user.id == choice_participation.user_id:
-                participated = True
-                break
-
-        # 익명 투표인 경우 -> choice_participants_name = None
-        if annonymous_choice:
-            participants_name = None
-        
+    def from_choice(choice: Choice, participated: bool, result_visible: bool) -> "ChoiceDetailResponse":
+        num_participants = choice.num_participants
+
         # 실시간 결과 공개 투표가 아니고 진행 중인 경우
-        if not realtime_result and end_datetime.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc):
+        if not result_visible:
             num_participants = None
-            participants_name = None
 
-        
         return ChoiceDetailResponse(
-            choice_id=id,
-            choice_content=content,
+            choice_id=choice.id,
+            choice_content=choice.choice_content,
             participated=participated,
-            choice_num_participants=num_participants,
-            choice_participants_name=participants_name
+            choice_num_participants=num_participants
         )
 
+class ChoiceParticipantsListResponse(BaseModel):
+    participants_name: List[str]
+    has_next: bool
+    next_cursor_id: int|None = None
+
 class CommentDetailResponse(BaseModel):
     comment_id: int
     writer_name: str
@@ -115,12 +97,14 @@ class CommentDetailResponse(BaseModel):
     created_datetime: Annotated[datetime, AfterValidator(convert_utc_to_ktc_naive)] 
     is_edited: bool
     edited_datetime: Annotated[datetime|None, AfterValidator(skip_none(convert_utc_to_ktc_naive))] = None
+    writer_id: int = Field(exclude=True) # 유저별 is_writer 계산용 (응답에는 포함하지 않음)
 
     @staticmethod
-    def from_comment_user(comment: Comment, user: User) -> "CommentDetailResponse":
+    # user가 None이면 is_writer는 False (유저와 무관한 캐시용)
+    def from_comment_user(comment: Comment, user: AuthenticatedUser|None) -> "CommentDetailResponse":
         comment_id = comment.id
         writer_name = comment.writer.name
-        is_writer = (user.id == comment.writer_id)
+        is_writer = (user is not None and user.id == comment.writer_id)
         comment_content = comment.content
         created_datetime = comment.create_datetime
         is_edited = comment.is_edited
@@ -137,10 +121,21 @@ class CommentDetailResponse(BaseModel):
             comment_content=comment_content,
             created_datetime=created_datetime,
             is_edited=is_edited,
-            edited_datetime=edited_datetime
+            edited_datetime=edited_datetime,
+            writer_id=comment.writer_id
         )
+
+    # 유저별 is_writer만 덮어쓴 복사본
+    def for_user(self, user: AuthenticatedUser) -> "CommentDetailResponse":
+        return self.model_copy(update={"is_writer": self.writer_id == user.id})
         
 
+class CommentsListResponse(BaseModel):
+    comments_list: List[CommentDetailResponse]
+    has_next: bool
+    next_cursor_time: datetime|None = None
+    next_cursor_id: int|None = None
+
 class VoteDetailResponse(BaseModel):
     vote_id:int
     writer_name: str
@@ -154,19 +149,57 @@ class VoteDetailResponse(BaseModel):
     create_datetime: Annotated[datetime, AfterValidator(convert_utc_to_ktc_naive)] # UTC 시간대를 KST 시간대로 변환한 뒤 offset-naive로 변환
     end_datetime: Annotated[datetime, AfterValidator(convert_utc_to_ktc_naive)] # UTC 시간대를 KST 시간대로 변환한 뒤 offset-naive로 변환
     choices: List[ChoiceDetailResponse]
-    comments: List[CommentDetailResponse]
-    images: List[str]
+    comments: List[CommentDetailResponse] # 댓글 첫 페이지 (이후는 GET /votes/{vote_id}/comments로 조회)
+    comment_count: int
+    comments_has_next: bool
+    comments_next_cursor_time: datetime|None = None
+    comments_next_cursor_id: int|None = None
+    images: List[str] # 상세 화면 표시용 축소 이미지 (없으면 원본)
+    original_images: List[str] # 원본 이미지
     participant_count: int
+    writer_id: int = Field(exclude=True) # 유저별 is_writer 계산용 (응답에는 포함하지 않음)
 
-    #Vote를 받아 참여자 수를 계산함
+    # 유저와 무관한 부분만 채운 상세 정보 (is_writer, participated는 False, 댓글은 비어 있음)
+    # 유저별 응답은 for_user로 만듦
     @staticmethod
-    def get_participant_count_from_vote(vote: Vote) -> int:
-
-        participant_set = set()
-        for choice in vote.choices:
-            for choice_participation in choice.choice_participations:                
-                #참여자를 집합에 넣기(중복 미포함)
-                participant_set.add(choice_participation.user_id)
-        
-        return len(participant_set)
+    def from_vote(vote: Vote, result_visible: bool) -> "VoteDetailResponse":
+        return VoteDetailResponse(
+            vote_id = vote.id,
+            writer_name = vote.writer.name,
+            is_writer = False,
+            title = vote.title,
+            content = vote.content,
+            participation_code_required = vote.participation_code_required,
+            realtime_result = vote.realtime_result,
+            multiple_choice = vote.multiple_choice,
+            annonymous_choice = vote.annonymous_choice,
+            create_datetime = vote.create_datetime,
+            end_datetime = vote.end_datetime,
+            choices = [ChoiceDetailResponse.from_choice(choice, False, result_visible) for choice in vote.choices],
+            comments = [],
+            comment_count = 0,
+            comments_has_next = False,
+            images = [image.medium_src or image.src for image in vote.images],
+            original_images = [image.src for image in vote.images],
+            participant_count = vote.participant_count,
+            writer_id = vote.writer_id
+        )
 
+    # 댓글 첫 페이지와 댓글 수를 채운 복사본 (댓글의 is_writer는 for_user에서 덮어씀)
+    def with_comments(self, comments: List[Comment], comment_count: int,
+                      comments_has_next: bool, comments_next_cursor: tuple[datetime, int]|None) -> "VoteDetailResponse":
+        return self.model_copy(update={
+            "comments": [CommentDetailResponse.from_comment_user(comment, None) for comment in comments],
+            "comment_count": comment_count,
+            "comments_has_next": comments_has_next,
+            "comments_next_cursor_time": comments_next_cursor[0] if comments_next_cursor else None,
+            "comments_next_cursor_id": comments_next_cursor[1] if comments_next_cursor else None,
+        })
+
+    # 유저별 필드(is_writer, participated, 댓글의 is_writer)를 덮어쓴 복사본 (검증/시간대 변환을 다시 하지 않음)
+    def for_user(self, user: AuthenticatedUser, participated_choice_ids: set[int]) -> "VoteDetailResponse":
+        return self.model_copy(update={
+            "is_writer": self.writer_id == user.id,
+            "choices": [choice.model_copy(update={"participated": choice.choice_id in participated_choice_ids}) for choice in self.choices],
+            "comments": [comment.for_user(user) for comment in self.comments],
+        })
@@ -4,7 +4,8 @@ from starlette.status import (
     HTTP_401_UNAUTHORIZED,
     HTTP_409_CONFLICT,
     HTTP_403_FORBIDDEN,
-    HTTP_404_NOT_FOUND
+    HTTP_404_NOT_FOUND,
+    HTTP_503_SERVICE_UNAVAILABLE
 )
 
 
@@ -78,6 +79,15 @@ class VoteNotYoursError(HTTPException):
         super().__init__(HTTP_403_FORBIDDEN, "Vote not yours")
 
 
+class AnonymousVoteError(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(HTTP_403_FORBIDDEN, "Anonymous vote")
+
+class VoteResultNotVisibleError(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(HTTP_403_FORBIDDEN, "Vote result is not visible")
+
+
 class InvalidVoteListCategoryError(HTTPException):
     def __init__(self) -> None:
         super().__init__(HTTP_400_BAD_REQUEST, "Invalid vote list category")
@@ -85,4 +95,8 @@ class InvalidVoteListCategoryError(HTTPException):
 
 class CursorError(HTTPException):
     def __init__(self) -> None:
-        super().__init__(HTTP_400_BAD_REQUEST, "Invalid cursor field")
\ No newline at end of file
+        super().__init__(HTTP_400_BAD_REQUEST, "Invalid cursor field")
+
+class TooManySubscribersError(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(HTTP_503_SERVICE_UNAVAILABLE, "Too many subscribers")
@@ -0,0 +1,231 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import AsyncGenerator, List
+
+from snuvote.app.vote.errors import TooManySubscribersError
+from snuvote.app.vote.settings import LIVE_TALLY_SETTINGS
+from snuvote.app.vote.store import VoteStore
+from snuvote.database.connection import DB_MANAGER
+
+
+logger = logging.getLogger(__name__)
+
+
+# 투표 하나의 집계: 참여자 수, 선택지별 참여자 수, 종료 여부
+class Tally:
+    def __init__(self, participant_count: int, choices: dict[int, int], ended: bool) -> None:
+        self.participant_count = participant_count
+        self.choices = choices
+        self.ended = ended
+
+    def to_event(self) -> dict:
+        return {
+            "participant_count": self.participant_count,
+            "choices": [{"choice_id": choice_id, "choice_num_participants": num_participants} for choice_id, num_participants in self.choices.items()],
+            "ended": self.ended,
+        }
+
+    # 이전 집계에서 바뀐 값만 담은 delta (바뀐 것이 없으면 None)
+    def diff(self, previous: "Tally") -> dict | None:
+        delta = {}
+        if self.participant_count != previous.participant_count:
+            delta["participant_count"] = self.participant_count
+        choices = {choice_id: num for choice_id, num in self.choices.items() if previous.choices.get(choice_id) != num}
+        if choices:
+            delta["choices"] = choices
+        if self.ended and not previous.ended:
+            delta["ended"] = True
+        return delta or None
+
+
+# SSE 구독자 한 명
+# 아직 보내지 못한 delta는 하나로 합쳐 두므로 느린 클라이언트가 있어도 메모리가 쌓이지 않음 (값은 모두 절대값)
+class TallySubscriber:
+    def __init__(self, vote_id: int) -> None:
+        self.vote_id = vote_id
+        self.pending: dict | None = None
+        self.event = asyncio.Event()
+
+    def push(self, delta: dict) -> None:
+        if self.pending is None:
+            self.pending = {key: dict(value) if isinstance(value, dict) else value for key, value in delta.items()}
+        else:
+            for key, value in delta.items():
+                if key == "choices":
+                    self.pending.setdefault("choices", {}).update(value)
+                else:
+                    self.pending[key] = value
+        self.event.set()
+
+    # 다음 delta를 기다림 (timeout 동안 변경이 없으면 None)
+    async def next(self, timeout: float) -> dict | None:
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+        self.event.clear()
+        delta, self.pending = self.pending, None
+        return delta
+
+
+# 워커 프로세스 내 실시간 집계 fan-out hub
+# participate_vote/close_vote가 publish하면 interval_ms마다 한 번만 구독 중인 투표의 집계를 한 쿼리로 읽어 delta를 보냅니다.
+# 다른 워커에서 들어온 참여는 poll_interval_ms마다 구독 중인 투표 전체를 다시 읽어 반영합니다.
+class TallyHub:
+    def __init__(self) -> None:
+        self.subscribers: dict[int, set[TallySubscriber]] = {}
+        self.tallies: dict[int, Tally] = {}
+        self.dirty: set[int] = set()
+        self.wake: asyncio.Event | None = None
+        self.task: asyncio.Task | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self.subscribers.values())
+
+    def check_capacity(self) -> None:
+        if self.subscriber_count >= LIVE_TALLY_SETTINGS.max_subscribers:
+            raise TooManySubscribersError()
+
+    # 구독 시작: (구독자, 현재 집계) 반환
+    async def subscribe(self, vote_id: int) -> tuple[TallySubscriber, Tally | None]:
+        self.check_capacity()
+
+        if vote_id not in self.tallies:
+            tallies = await self.load_tallies([vote_id])
+            if vote_id in tallies:
+                self.tallies.setdefault(vote_id, tallies[vote_id])
+
+        subscriber = TallySubscriber(vote_id)
+        self.subscribers.setdefault(vote_id, set()).add(subscriber)
+
+        if self.task is None:
+            self.wake = asyncio.Event()
+            self.task = asyncio.create_task(self.run())
+
+        return subscriber, self.tallies.get(vote_id)
+
+    def unsubscribe(self, subscriber: TallySubscriber) -> None:
+        subscribers = self.subscribers.get(subscriber.vote_id)
+        if subscribers is None:
+            return
+
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self.subscribers[subscriber.vote_id]
+            self.tallies.pop(subscriber.vote_id, None)
+            self.dirty.discard(subscriber.vote_id)
+
+    # 집계가 바뀌었음을 알림 (구독자가 없는 투표는 무시)
+    def publish(self, vote_id: int) -> None:
+        if vote_id in self.subscribers and self.wake is not None:
+            self.dirty.add(vote_id)
+            self.wake.set()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        poll_interval = LIVE_TALLY_SETTINGS.poll_interval_ms / 1000
+        last_poll = loop.time()
+
+        while True:
+            try:
+                await asyncio.wait_for(self.wake.wait(), max(poll_interval - (loop.time() - last_poll), 0))
+            except asyncio.TimeoutError:
+                pass
+            self.wake.clear()
+
+            if loop.time() - last_poll >= poll_interval:
+                vote_ids = list(self.subscribers)
+                last_poll = loop.time()
+            else:
+                vote_ids = [vote_id for vote_id in self.dirty if vote_id in self.subscribers]
+            self.dirty.clear()
+
+            if vote_ids:
+                try:
+                    await self.refresh(vote_ids)
+                except Exception:
+                    logger.exception("failed to refresh live tallies")
+
+            # 그 사이 들어온 publish는 다음 반복에서 한 번에 처리 (구독자당 interval_ms에 최대 한 번)
+            await asyncio.sleep(LIVE_TALLY_SETTINGS.interval_ms / 1000)
+
+    async def refresh(self, vote_ids: List[int]) -> None:
+        tallies = await self.load_tallies(vote_ids)
+
+        for vote_id, tally in tallies.items():
+            previous = self.tallies.get(vote_id)
+            if previous is None or vote_id not in self.subscribers:
+                continue
+
+            delta = tally.diff(previous)
+            self.tallies[vote_id] = tally
+            if delta is None:
+                continue
+
+            for subscriber in self.subscribers[vote_id]:
+                subscriber.push(delta)
+
+    async def load_tallies(self, vote_ids: List[int]) -> dict[int, Tally]:
+        now = datetime.now(timezone.utc)
+
+        async with DB_MANAGER.session_factory() as session:
+            vote_store = VoteStore(session=session, read_session=session)
+            results = await vote_store.get_tallies(vote_ids)
+
+        return {
+            vote_id: Tally(participant_count, choices, end_datetime.replace(tzinfo=timezone.utc) <= now)
+            for vote_id, (participant_count, end_datetime, choices) in results.items()
+        }
+
+    # 워커 종료 시 호출
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+        self.task = None
+        self.wake = None
+
+
+# 구독자에게 보낼 SSE 스트림: 처음에 전체 집계(snapshot), 이후 바뀐 값만(tally), 투표가 끝나면 종료
+async def tally_event_stream(hub: TallyHub, vote_id: int) -> AsyncGenerator[str, None]:
+    subscriber, tally = await hub.subscribe(vote_id)
+    try:
+        if tally is None:
+            return
+
+        yield format_event("snapshot", tally.to_event())
+        if tally.ended:
+            return
+
+        while True:
+            delta = await subscriber.next(LIVE_TALLY_SETTINGS.heartbeat_seconds)
+            if delta is None:
+                yield ": keep-alive\n\n"
+                continue
+
+            if "choices" in delta:
+                delta["choices"] = [{"choice_id": choice_id, "choice_num_participants": num} for choice_id, num in delta["choices"].items()]
+            yield format_event("tally", delta)
+
+            if delta.get("ended"):
+                return
+    finally:
+        hub.unsubscribe(subscriber)
+
+
+def format_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+# 워커 프로세스 전체에서 공유하는 TallyHub (snuvote.main의 lifespan에서 stop)
+TALLY_HUB = TallyHub()
@@ -0,0 +1,26 @@
+import asyncio
+import sys
+from typing import List
+
+from snuvote.app.vote.store import VoteStore
+from snuvote.database.connection import DB_MANAGER
+
+
+# 비정규화된 참여자 수(Vote.participant_count, Choice.num_participants)와 HOT 투표 피드를 참여 기록으로부터 다시 계산합니다.
+# 사용법: python -m snuvote.app.vote.recount [vote_id ...]  (vote_id를 생략하면 전체 투표)
+async def recount(vote_ids: List[int]) -> None:
+    await DB_MANAGER.start()
+    try:
+        async with DB_MANAGER.session_factory() as session:
+            vote_store = VoteStore(session=session, read_session=session)
+
+            if not vote_ids:
+                await vote_store.recount_participants()
+            for vote_id in vote_ids:
+                await vote_store.recount_participants(vote_id)
+    finally:
+        await DB_MANAGER.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(recount([int(vote_id) for vote_id in sys.argv[1:]]))
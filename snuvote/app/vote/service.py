@@ -1,18 +1,20 @@
-from typing import Annotated, List
+from typing import Annotated, AsyncGenerator, List
 
 from fastapi import Depends, UploadFile 
 from snuvote.database.models import Vote, User, Choice, ChoiceParticipation, Comment
 from snuvote.app.vote.store import VoteStore
-from snuvote.app.vote.errors import ChoiceNotFoundError, VoteNotYoursError, MultipleChoicesError, ParticipationCodeError, ParticipationCodeNotProvidedError, WrongParticipationCodeError, EndedVoteError, CommentNotYoursError, CommentNotInThisVoteError, InvalidFileExtensionError
+from snuvote.app.user.cache import AuthenticatedUser
+from snuvote.app.image.storage import IMAGE_STORAGE, SavedImage
+from snuvote.app.vote.ballot_buffer import BALLOT_BUFFER
+from snuvote.app.vote.live import TALLY_HUB, tally_event_stream
+from snuvote.app.vote.cache import VOTE_DETAIL_CACHE, VOTE_LIST_CACHE, FINALIZED_VOTE_CACHE, FINALIZED_PARTICIPANTS_CACHE, invalidate_finalized_vote, invalidate_vote_lists
+from snuvote.app.vote.settings import VOTE_CACHE_SETTINGS
+from snuvote.app.vote.errors import InvalidVoteListCategoryError, VoteNotFoundError, AnonymousVoteError, VoteResultNotVisibleError, ChoiceNotFoundError, VoteNotYoursError, MultipleChoicesError, ParticipationCodeError, ParticipationCodeNotProvidedError, WrongParticipationCodeError, EndedVoteError, CommentNotYoursError, CommentNotInThisVoteError, InvalidFileExtensionError
 from snuvote.app.vote.dto.requests import ParticipateVoteRequest, CommentRequest
+from snuvote.app.vote.dto.responses import OnGoingVotesListResponse, VotesListInfoResponse, VoteDetailResponse
 
 from datetime import datetime, timedelta, timezone
 
-import secrets
-import os
-import boto3
-from botocore.config import Config
-
 
 ALLOWED_EXTENSIONS = {"jpg", "jpeg", "png", "gif"}
 
@@ -20,27 +22,13 @@ class VoteService:
     def __init__(self, vote_store: Annotated[VoteStore, Depends()]) -> None:
         self.vote_store = vote_store
     
-    async def upload_vote_images(self, vote: Vote, images: List[UploadFile]) -> None:
-        # voteimage를 저장하고 DB에 정보를 저장하는 함수
-
-        # S3 client 생성
-        s3 = boto3.client('s3', aws_access_key_id=os.getenv('AWS_S3_ACCESS_KEY_ID'), aws_secret_access_key=os.getenv('AWS_S3_SECRET_ACCESS_KEY'), config=Config(region_name=os.getenv('AWS_DEFAULT_REGION')))
-
-        image_order = 0 # VoteImage.order에 저장될 이미지 순서 번호
-
-        for image in images:
-            image_order += 1
-            image_name = f'{secrets.token_urlsafe(16)}.{image.filename.split(".")[-1]}' # 파일이름 = {랜덤문자열}.{확장자}
-            image_path = f'voteimages/{image_name}' # S3 버킷 내 파일 경로: voteimages/{파일이름}
+    async def upload_vote_images(self, images: List[UploadFile]) -> List[SavedImage]:
+        # voteimage와 축소 이미지(썸네일 등)를 이미지 저장소에 동시에 저장하고, 순서대로 저장 결과를 반환하는 함수
+        # 파일이름 = {내용 해시}.{확장자} 이므로 이미 저장된 이미지는 다시 올리지 않음
+        # DB 커넥션을 잡지 않도록 DB 작업 전에 호출
 
-            # S3 버킷 해당 경로에 업로드
-            s3.upload_fileobj(image.file, os.getenv('AWS_S3_BUCKET_NAME'), image_path)
-
-            # S3 버킷에 업로드된 이미지 경로
-            image_src = f'https://{os.getenv("AWS_S3_BUCKET_NAME")}.s3.{os.getenv("AWS_DEFAULT_REGION")}.amazonaws.com/{image_path}'
-
-            # VoteImage 테이블에 이미지 정보 저장
-            await self.vote_store.add_vote_image(vote_id=vote.id, image_order=image_order, image_src=image_src)
+        files = [(image.file, image.filename.split(".")[-1].lower(), image.content_type) for image in images]
+        return await IMAGE_STORAGE.save_many(files)
 
 
     #투표 추가하기
@@ -60,7 +48,19 @@ class VoteService:
         #참여코드가 필요한데 참여코드가 없을 경우 400 에러
         if participation_code_required and not participation_code:
             raise ParticipationCodeError()
-        
+
+        # 이미지 업로드 (업로드하는 동안 DB 트랜잭션이 열려 있지 않도록 투표 추가 전에 수행)
+        # 투표 추가에 실패해도 저장한 이미지는 지우지 않음 (내용 해시로 저장되어 같은 이미지를 올린 다른 요청이 쓰고 있을 수 있음)
+        saved_images = []
+        if images:
+            # 확장자가 안 맞으면 오류
+            for image in images:
+                filename = image.filename
+                extension = filename.split(".")[-1].lower()  # 확장자 추출 및 소문자로 변환
+                if extension not in ALLOWED_EXTENSIONS:
+                    raise InvalidFileExtensionError
+            saved_images = await self.upload_vote_images(images)
+
         # 투표 추가
         vote = await self.vote_store.add_vote(writer_id=writer_id,
                                         title=title,
@@ -72,45 +72,144 @@ class VoteService:
                                         annonymous_choice=annonymous_choice, 
                                         end_datetime=end_datetime,
                                         choices=choices)
-        
-        # 이미지 업로드
-        if images:
-            # 확장자가 안 맞으면 오류
-            for image in images:
-                filename = image.filename
-                extension = filename.split(".")[-1].lower()  # 확장자 추출 및 소문자로 변환
-                if extension not in ALLOWED_EXTENSIONS:
-                    raise InvalidFileExtensionError
-            await self.upload_vote_images(vote, images)
+
+        # VoteImage 테이블에 이미지 정보 한 번에 저장
+        if saved_images:
+            await self.vote_store.add_vote_images(vote_id=vote.id, images=[
+                (
+                    IMAGE_STORAGE.url(saved_image.key),
+                    IMAGE_STORAGE.url(saved_image.variants["thumbnail"]) if "thumbnail" in saved_image.variants else None,
+                    IMAGE_STORAGE.url(saved_image.variants["medium"]) if "medium" in saved_image.variants else None,
+                )
+                for saved_image in saved_images
+            ])
+
+        invalidate_vote_lists()
 
         return await self.vote_store.get_vote_by_vote_id(vote_id=vote.id)
 
 
-    # 진행 중인 투표 리스트 조회
-    async def get_ongoing_list(self, start_cursor: tuple[datetime, int]|None) -> tuple[List[tuple[Vote,int]], bool, tuple[datetime, int]|None]:
-        return await self.vote_store.get_ongoing_list(start_cursor)
-    
-    # 완료된 투표글 리스트 조회
-    async def get_ended_votes_list(self, start_cursor: tuple[datetime, int]|None) -> tuple[List[tuple[Vote,int]], bool, tuple[datetime, int]|None]:
-        return await self.vote_store.get_ended_votes_list(start_cursor)
-    
-    # HOT 투표글 리스트 조회
-    async def get_hot_votes_list(self, start_cursor: tuple[datetime, int]|None) -> tuple[List[tuple[Vote,int]], bool, tuple[datetime, int]|None]:
-        return await self.vote_store.get_hot_votes_list(start_cursor)
+    # 진행 중/완료된/HOT 투표 리스트 조회
+    # 모든 유저에게 같은 페이지는 VOTE_LIST_CACHE에 캐싱하고, 참여 여부만 유저별로 한 번에 조회
+    async def get_public_votes_list(self, category: str, user: AuthenticatedUser, start_cursor: tuple[datetime, int]|None) -> OnGoingVotesListResponse:
+        page = VOTE_LIST_CACHE.get((category, start_cursor))
+        if page is None:
+            if category == "ongoing":
+                results, has_next, next_cursor = await self.vote_store.get_ongoing_list(None, start_cursor)
+            elif category == "ended":
+                results, has_next, next_cursor = await self.vote_store.get_ended_votes_list(None, start_cursor)
+            elif category == "hot":
+                results, has_next, next_cursor = await self.vote_store.get_hot_votes_list(None, start_cursor)
+            else: raise InvalidVoteListCategoryError()
+
+            page = OnGoingVotesListResponse(
+                votes_list = [VotesListInfoResponse.from_vote(vote, participated, image_src) for vote, participated, image_src in results],
+                has_next = has_next,
+                next_cursor_time = next_cursor[0] if next_cursor else None,
+                next_cursor_id = next_cursor[1] if next_cursor else None
+            )
+            VOTE_LIST_CACHE.put((category, start_cursor), page)
+
+        participated_vote_ids = await self.vote_store.get_participated_vote_ids(user.id, [vote.id for vote in page.votes_list])
+        return page.for_user(participated_vote_ids)
     
     # 내가 만든 투표 리스트 조회
-    async def get_my_votes_list(self, user: User, start_cursor: tuple[datetime, int]|None) -> tuple[List[tuple[Vote,int]], bool, tuple[datetime, int]|None]:
+    async def get_my_votes_list(self, user: AuthenticatedUser, start_cursor: tuple[datetime, int]|None) -> tuple[List[tuple[Vote, bool, str|None]], bool, tuple[datetime, int]|None]:
         return await self.vote_store.get_my_votes_list(user.id, start_cursor)
     
     #내가 참여한 투표 리스트 조회
-    async def get_participated_votes_list(self, user: User, start_cursor: tuple[datetime, int]|None) -> tuple[List[tuple[Vote,int]], bool, tuple[datetime, int]|None]:
+    async def get_participated_votes_list(self, user: AuthenticatedUser, start_cursor: tuple[datetime, int]|None) -> tuple[List[tuple[Vote, bool, str|None]], bool, tuple[datetime, int]|None]:
         return await self.vote_store.get_participated_votes_list(user.id, start_cursor)
 
     # 투표글 상세 내용 조회
-    async def get_vote_by_vote_id(self, vote_id: int) -> Vote:
-        return await self.vote_store.get_vote_by_vote_id(vote_id=vote_id)
+    async def get_vote_by_vote_id(self, vote_id: int, read_only: bool = False) -> Vote:
+        return await self.vote_store.get_vote_by_vote_id(vote_id=vote_id, read_only=read_only)
     
-    async def participate_vote(self, vote: Vote, user: User, participate_vote_request: ParticipateVoteRequest) -> None:
+    # 투표글 상세 정보 중 유저와 무관한 부분 조회 (댓글 첫 페이지 포함)
+    # VOTE_DETAIL_CACHE에 없으면 투표 부분은 (종료된 투표는 FINALIZED_VOTE_CACHE에서) 다시 만들고 댓글은 새로 조회
+    async def get_vote_detail(self, vote_id: int, read_only: bool = False) -> VoteDetailResponse:
+        cache_key = (vote_id, read_only)
+        detail = VOTE_DETAIL_CACHE.get(cache_key)
+        if detail is not None:
+            return detail
+
+        # 읽는 도중 쓰기가 있으면 버전이 바뀌어 아래 결과는 캐싱되지 않음
+        version = VOTE_DETAIL_CACHE.version(cache_key)
+
+        detail = FINALIZED_VOTE_CACHE.get(vote_id)
+        if detail is None:
+            vote = await self.vote_store.get_vote_detail_by_vote_id(vote_id=vote_id, read_only=read_only)
+            # 해당 vote_id에 해당하는 투표글이 없을 경우 404 Not Found
+            if not vote:
+                raise VoteNotFoundError()
+
+            detail = VoteDetailResponse.from_vote(vote, self.is_result_visible(vote))
+            if self.is_finalized(vote_id, vote.end_datetime):
+                FINALIZED_VOTE_CACHE.put(vote_id, detail)
+
+        # 댓글은 수와 첫 페이지만
+        comments, comments_has_next, comments_next_cursor = await self.get_comments_list(vote_id, None, read_only=read_only)
+        comment_count = await self.get_comment_count(vote_id, read_only=read_only)
+        detail = detail.with_comments(comments, comment_count, comments_has_next, comments_next_cursor)
+
+        VOTE_DETAIL_CACHE.put_versioned(cache_key, version, detail, size=len(detail.model_dump_json()))
+        return detail
+
+    # 유저가 선택한 선택지 id 조회
+    async def get_participated_choice_ids(self, vote_id: int, user: AuthenticatedUser, read_only: bool = False) -> set[int]:
+        return await self.vote_store.get_participated_choice_ids(vote_id=vote_id, user_id=user.id, read_only=read_only)
+
+    # 선택지 참여자 이름 리스트 조회
+    async def get_choice_participants_list(self, vote_id: int, choice_id: int, start_cursor_id: int|None) -> tuple[List[str], bool, int|None]:
+        # 종료된 투표는 캐시된 상세 정보로 검증하고 캐시된 페이지를 반환
+        detail = FINALIZED_VOTE_CACHE.get(vote_id)
+        if detail is not None:
+            if choice_id not in [choice.choice_id for choice in detail.choices]:
+                raise ChoiceNotFoundError()
+            if detail.annonymous_choice:
+                raise AnonymousVoteError()
+
+            page = FINALIZED_PARTICIPANTS_CACHE.get((vote_id, choice_id, start_cursor_id))
+            if page is not None:
+                return page
+
+        vote = await self.vote_store.get_vote_by_vote_id(vote_id=vote_id, read_only=True)
+        # 해당 vote_id에 해당하는 투표글이 없을 경우 404 Not Found
+        if not vote:
+            raise VoteNotFoundError()
+
+        # 해당 vote에 choice_id에 해당하는 선택지가 존재하지 않는 경우
+        if choice_id not in [choice.id for choice in vote.choices]:
+            raise ChoiceNotFoundError()
+
+        # 익명 투표인 경우
+        if vote.annonymous_choice:
+            raise AnonymousVoteError()
+
+        # 실시간 결과 공개 투표가 아니고 진행 중인 경우
+        if not self.is_result_visible(vote):
+            raise VoteResultNotVisibleError()
+
+        page = await self.vote_store.get_choice_participants_list(choice_id=choice_id, start_cursor_id=start_cursor_id)
+
+        if self.is_finalized(vote_id, vote.end_datetime):
+            FINALIZED_PARTICIPANTS_CACHE.put((vote_id, choice_id, start_cursor_id), page)
+
+        return page
+
+    # 결과가 더 이상 바뀌지 않는 투표인지
+    # 종료 직전에 검증된 참여는 종료 후에 반영될 수 있으므로 (다른 워커의 투표 버퍼, replica 지연) 종료 후 유예 시간을 기다리고,
+    # 이 워커의 투표 버퍼에 아직 반영되지 않은 이 투표의 표가 있으면 기다림 (primary/replica 어디서 읽든 같음)
+    def is_finalized(self, vote_id: int, end_datetime: datetime) -> bool:
+        finalized_datetime = end_datetime.replace(tzinfo=timezone.utc) + timedelta(seconds=VOTE_CACHE_SETTINGS.finalize_grace_seconds)
+        return finalized_datetime <= datetime.now(timezone.utc) and not BALLOT_BUFFER.has_pending(vote_id)
+
+    # 결과 공개 여부: 실시간 결과 공개 투표이거나 종료된 투표
+    def is_result_visible(self, vote: Vote) -> bool:
+        return vote.realtime_result or vote.end_datetime.replace(tzinfo=timezone.utc) <= datetime.now(timezone.utc)
+    
+    # 투표 버퍼를 거친 경우(아직 DB에 반영되지 않음) True 반환
+    async def participate_vote(self, vote: Vote, user: AuthenticatedUser, participate_vote_request: ParticipateVoteRequest) -> bool:
         # 종료 시간 이후인 경우
         if datetime.now(tz=timezone.utc) > vote.end_datetime.replace(tzinfo=timezone.utc): 
             raise EndedVoteError()
@@ -137,10 +236,19 @@ class VoteService:
         user_id = user.id
         choice_id_list = participate_vote_request.participated_choice_ids
 
+        # 투표 버퍼가 켜져 있으면 로그에 기록한 뒤 바로 응답 (DB에는 백그라운드에서 묶어서 반영)
+        if BALLOT_BUFFER.accepting:
+            await BALLOT_BUFFER.submit(vote_id=vote.id, user_id=user_id, choice_ids=choice_id_list)
+            return True
+
+        vote_id = vote.id
         await self.vote_store.participate_vote(vote=vote, user_id=user_id, choice_id_list=choice_id_list)
+        TALLY_HUB.publish(vote_id)
+        invalidate_finalized_vote(vote_id)
+        return False
     
     #투표 조기 종료하기
-    async def close_vote(self, vote:Vote, user: User)-> None:
+    async def close_vote(self, vote:Vote, user: AuthenticatedUser)-> None:
 
         #만약 투표 작성자가 아닐 경우
         if vote.writer_id != user.id:
@@ -149,17 +257,36 @@ class VoteService:
         if vote.end_datetime <= datetime.now(tz=timezone.utc).replace(tzinfo=None):
             raise EndedVoteError()
         
-        await self.vote_store.close_vote(vote_id=vote.id)
+        vote_id = vote.id
+        await self.vote_store.close_vote(vote_id=vote_id)
+        TALLY_HUB.publish(vote_id)
+        invalidate_vote_lists()
+
+    # 실시간 집계 SSE 스트림 (결과가 공개된 투표만, 익명 투표도 선택지별 참여자 수만 보내므로 가능)
+    def stream_tally(self, vote: Vote) -> AsyncGenerator[str, None]:
+        if not self.is_result_visible(vote):
+            raise VoteResultNotVisibleError()
+
+        TALLY_HUB.check_capacity()
+        return tally_event_stream(TALLY_HUB, vote.id)
     
     
-    async def create_comment(self, vote: Vote, user: User, comment_request: CommentRequest) -> None:
-        await self.vote_store.create_comment(vote_id=vote.id, writed_id=user.id, content=comment_request.content)
+    async def create_comment(self, vote: Vote, user: AuthenticatedUser, comment_request: CommentRequest) -> Comment:
+        return await self.vote_store.create_comment(vote_id=vote.id, writed_id=user.id, content=comment_request.content)
     
     async def get_comment_by_comment_id(self, comment_id:int) -> Comment:
         return await self.vote_store.get_comment_by_comment_id(comment_id)
 
+    # 댓글 리스트 조회
+    async def get_comments_list(self, vote_id: int, start_cursor: tuple[datetime, int]|None, read_only: bool = False) -> tuple[List[Comment], bool, tuple[datetime, int]|None]:
+        return await self.vote_store.get_comments_list(vote_id=vote_id, start_cursor=start_cursor, read_only=read_only)
+
+    # 댓글 수 조회
+    async def get_comment_count(self, vote_id: int, read_only: bool = False) -> int:
+        return await self.vote_store.get_comment_count(vote_id=vote_id, read_only=read_only)
+
 
-    async def edit_comment(self, user: User, vote: Vote, comment: Comment, comment_request: CommentRequest) -> None:
+    async def edit_comment(self, user: AuthenticatedUser, vote: Vote, comment: Comment, comment_request: CommentRequest) -> Comment:
 
         # 만약 해당 Comment가 해당 Vote에 속하는 것이 아닐 경우
         if comment.vote_id != vote.id:
@@ -171,12 +298,12 @@ class VoteService:
 
         
         # 해당 comment_content 수정
-        await self.vote_store.edit_comment_content(
+        return await self.vote_store.edit_comment_content(
             comment_id = comment.id,
             comment_content = comment_request.content
         )
 
-    async def delete_comment(self, user: User, vote: Vote, comment: Comment) -> None:
+    async def delete_comment(self, user: AuthenticatedUser, vote: Vote, comment: Comment) -> Comment:
         # 만약 해당 Comment가 해당 Vote에 속하는 것이 아닐 경우
         if comment.vote_id != vote.id:
             raise CommentNotInThisVoteError()
@@ -186,4 +313,4 @@ class VoteService:
             raise CommentNotYoursError()
     
         # 해당 Comment를 삭제
-        await self.vote_store.delete_comment_by_comment_id(comment_id = comment.id)
\ No newline at end of file
+        return await self.vote_store.delete_comment_by_comment_id(comment_id = comment.id)
\ No newline at end of file
@@ -0,0 +1,68 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from snuvote.settings import SETTINGS
+
+
+class BallotBufferSettings(BaseSettings):
+    # 선거 시작 직후처럼 참여 요청이 몰릴 때만 켜는 write-behind 모드 (기본은 요청마다 바로 DB에 반영)
+    enabled: bool = False
+
+    wal_dir: str = "ballot_wal" # 워커별 write-ahead log 파일을 둘 디렉터리
+    batch_size: int = 200 # 한 트랜잭션에 묶어 반영할 최대 표 수
+    flush_interval_ms: int = 50 # batch_size를 채우지 못해도 이 시간이 지나면 반영
+    max_queue_size: int = 10000 # 반영 대기 중인 표가 이보다 많으면 새 표 제출은 flusher가 따라잡을 때까지 대기 (로그와 메모리가 무한히 늘지 않도록)
+    wal_truncate_bytes: int = 16 * 1024 * 1024 # 모든 표가 반영된 상태에서 로그가 이보다 크면 비움
+    retry_backoff_ms: int = 500 # DB 연결 오류 시 재시도 간격
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="BALLOT_BUFFER_",
+        env_file=SETTINGS.env_file,
+        extra = 'ignore'
+    )
+
+
+BALLOT_BUFFER_SETTINGS = BallotBufferSettings()
+
+
+class LiveTallySettings(BaseSettings):
+    interval_ms: int = 1000 # 구독자 한 명에게 집계 변경을 보내는 최소 간격 (그 사이 변경은 하나로 합침)
+    poll_interval_ms: int = 3000 # 다른 워커에서 들어온 참여를 반영하기 위해 구독 중인 투표의 집계를 다시 읽는 간격
+    heartbeat_seconds: int = 15 # 변경이 없을 때 연결 유지를 위해 보내는 주석 간격
+    max_subscribers: int = 1000 # 워커당 최대 구독자 수
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="LIVE_TALLY_",
+        env_file=SETTINGS.env_file,
+        extra = 'ignore'
+    )
+
+
+LIVE_TALLY_SETTINGS = LiveTallySettings()
+
+
+class VoteCacheSettings(BaseSettings):
+    # 종료된 투표의 결과(선택지별 참여자 수, 참여자 이름 페이지 등)는 더 이상 바뀌지 않으므로 워커 메모리에 캐싱
+    finalized_maxsize: int = 5000 # 캐싱할 최대 종료 투표 수
+    finalized_participants_maxsize: int = 20000 # 캐싱할 최대 참여자 이름 페이지 수 (종료 투표의 선택지/cursor별)
+    finalized_ttl_seconds: int = 3600 # 작성자/참여자 탈퇴로 이름이 바뀌는 경우를 위해 결국에는 다시 읽음
+    finalize_grace_seconds: int = 10 # 종료 직전 참여가 (다른 워커의 투표 버퍼, replica 지연을 거쳐) 반영될 때까지 종료 후 이 시간 동안 캐싱을 미룸
+
+    # 투표 상세 정보 중 유저와 무관한 부분(댓글 첫 페이지 포함) 캐시, 이 워커의 쓰기는 버전으로 바로 무효화되고 다른 워커의 쓰기는 ttl 뒤에 반영
+    detail_maxsize: int = 2000
+    detail_ttl_seconds: float = 3
+    detail_max_bytes: int = 64 * 1024 * 1024 # 캐싱된 응답(JSON 기준) 크기 합의 상한
+
+    # 진행 중/완료된/HOT 투표 리스트 페이지 캐시 (참여 여부는 유저별로 따로 조회)
+    list_maxsize: int = 1000
+    list_ttl_seconds: float = 2
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="VOTE_CACHE_",
+        env_file=SETTINGS.env_file,
+        extra = 'ignore'
+    )
+
+
+VOTE_CACHE_SETTINGS = VoteCacheSettings()
@@ -3,20 +3,29 @@ from typing import Annotated, List
 from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends
-from snuvote.database.models import Vote, Choice, ChoiceParticipation, Comment, VoteImage
+from snuvote.database.models import Vote, Choice, ChoiceParticipation, Comment, VoteImage, HotVote, VoteParticipation, User
 import sys
 
-from snuvote.database.connection import get_db_session
-from sqlalchemy import func, select
-from sqlalchemy import select, delete
-from sqlalchemy.orm import Session, aliased, joinedload, Load, subqueryload
+from snuvote.database.connection import get_db_session, get_read_db_session
+from snuvote.database.settings import DB_SETTINGS
+from snuvote.app.vote.cache import VOTE_DETAIL_CACHE, bump_vote_version
+from sqlalchemy import func, literal, select
+from sqlalchemy import select, delete, update, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload, Load
 
 KST = timezone(timedelta(hours=9), "KST")
 
+HOT_VOTE_MIN_PARTICIPANTS = 5 # HOT 투표 기준 참여자 수
+
 class VoteStore:
-    def __init__(self, session: Annotated[Session, Depends(get_db_session)]) -> None:
+    def __init__(self,
+                 session: Annotated[Session, Depends(get_db_session)],
+                 read_session: Annotated[Session, Depends(get_read_db_session)]) -> None:
         self.session = session
+        self.read_session = read_session # 읽기 전용 조회(replica)에 사용
         self.pagination_size = 10
+        self.participants_pagination_size = 50 # 선택지 참여자 이름 리스트 페이지 크기
     
 
     #투표 추가하기
@@ -58,25 +67,50 @@ class VoteStore:
 
         return vote
     
-    async def add_vote_image(self, vote_id: int, image_order: int, image_src: str):
-        new_voteimage = VoteImage(vote_id = vote_id,
-                                  order=image_order,
-                                  src = image_src)
-        
-        self.session.add(new_voteimage)
+    # 이미지 정보 (src, thumbnail_src, medium_src)를 순서대로 한 번에 저장 (VoteImage.order는 1부터)
+    async def add_vote_images(self, vote_id: int, images: List[tuple[str, str|None, str|None]]):
+        self.session.add_all([
+            VoteImage(vote_id=vote_id, order=image_order, src=src, thumbnail_src=thumbnail_src, medium_src=medium_src)
+            for image_order, (src, thumbnail_src, medium_src) in enumerate(images, start=1)
+        ])
         await self.session.flush()
 
+    # 리스트 조회 시 Vote와 함께 가져올 컬럼
+    # 참여 기록 전체를 불러오지 않도록 현재 유저의 참여 여부는 EXISTS로, 썸네일은 첫 번째 이미지의 축소 이미지(없으면 원본) src만 조회
+    # user_id가 None이면 참여 여부는 모두 False (유저와 무관한 페이지 캐시용, get_participated_vote_ids로 따로 조회)
+    def list_info_columns(self, user_id: int|None):
+        if user_id is None:
+            participated = literal(False).label("participated")
+        else:
+            participated = (
+                select(VoteParticipation.id)
+                .where((VoteParticipation.vote_id == Vote.id) & (VoteParticipation.user_id == user_id))
+                .correlate(Vote)
+                .exists()
+                .label("participated")
+            )
+        image_src = (
+            select(func.coalesce(VoteImage.thumbnail_src, VoteImage.src))
+            .where(VoteImage.vote_id == Vote.id)
+            .order_by(VoteImage.order.asc())
+            .limit(1)
+            .correlate(Vote)
+            .scalar_subquery()
+            .label("image_src")
+        )
+        return participated, image_src
+
     # 진행 중인 투표 리스트 조회
-    async def get_ongoing_list(self, start_cursor: tuple[datetime,int] |None) -> tuple[List[tuple[Vote,int]], bool, tuple[datetime, int]|None]:
+    async def get_ongoing_list(self, user_id: int|None, start_cursor: tuple[datetime,int] |None) -> tuple[List[tuple[Vote, bool, str|None]], bool, tuple[datetime, int]|None]:
 
         #커서가 none이면 가장 최신 것부터 self.pagination_size개
         if start_cursor is None:
             start_cursor = (datetime.now(timezone.utc), 0)
 
-        # 생성 시간이 커서보다 최신인 것부터 오름차순(최신순)으로 self.pagination_size개 리턴
-        # 먼저 진행 중인 투표글의 Vote.id만 반환
-        filtered_votes = (
-            select(Vote.id)
+        # 생성 시간이 커서보다 과거인 것부터 내림차순(최신순)으로 self.pagination_size개 리턴
+        # 참여자 수는 Vote.participant_count에 저장되어 있으므로 별도 집계 없이 조회
+        query = (
+            select(Vote, *self.list_info_columns(user_id))
             .where(
                 (Vote.create_datetime < start_cursor[0])   # 생성 시간이 커서보다 과거이거나
                 | (
@@ -84,34 +118,11 @@ class VoteStore:
                 )
             )
             .where(Vote.end_datetime > datetime.now(timezone.utc))
-            .subquery()
-        )
-
-        # 현재 진행 중인 투표글 vote.id(filtered_votes)별 참여자 수를 구하는 서브 쿼리
-        subquery = (
-            select(
-                Choice.vote_id.label("vote_id"),
-                func.count(func.distinct(ChoiceParticipation.user_id)).label("participant_count")
-            )
-            .join(ChoiceParticipation, Choice.id == ChoiceParticipation.choice_id, isouter=True) # 참여가 없는 투표의 경우도 참여자 수는 반환되어야 하므로 left outer join
-            .where(Choice.vote_id.in_(select(filtered_votes.c.id)))  # 필요한 투표만 선택
-            .group_by(Choice.vote_id)
-            .subquery()
-        )
-
-        # 메인 쿼리: 현재 진행 중인 투표글들만 Vote 정보 + 참여자 수 inner join
-        query = (
-            select(Vote, subquery.c.participant_count)
-            .options(
-                subqueryload(Vote.choices).subqueryload(Choice.choice_participations),
-                subqueryload(Vote.images)
-            )
-            .join(subquery, Vote.id == subquery.c.vote_id) # filtered_votes의 vote 정보와 참여자 수만 표시되어야 하므로 inner join
             .order_by(Vote.create_datetime.desc(), Vote.id.asc())
             .limit(self.pagination_size)
         )
 
-        results = await self.session.execute(query)
+        results = await self.read_session.execute(query)
         results = results.all()
 
         #만약 self.pagination_size개를 꽉 채웠다면 추가 내용이 있을 가능성 있음
@@ -124,55 +135,26 @@ class VoteStore:
 
 
     # 완료된 투표글 리스트 조회
-    async def get_ended_votes_list(self, start_cursor: tuple[datetime,int] |None) -> tuple[List[tuple[Vote,int]], bool, tuple[datetime, int]|None]:
+    async def get_ended_votes_list(self, user_id: int|None, start_cursor: tuple[datetime,int] |None) -> tuple[List[tuple[Vote, bool, str|None]], bool, tuple[datetime, int]|None]:
 
-        # 필터 쿼리: 완료된 투표글의 Vote.id만 반환
         # 커서가 none이면 가장 최근에 끝난 투표부터 최근에 끝난 순으로 self.pagination_size개
-        if start_cursor is None:
-            filtered_votes = (
-                select(Vote.id)
-                .where(Vote.end_datetime < datetime.now(timezone.utc))
-                .subquery()
-            )
-        else: # 커서가 None이 아니면 커서보다 과거에 끝난 투표부터 최근에 끝난 순으로 self.pagination_size개
-            filtered_votes = (
-                select(Vote.id)
-                .where(Vote.end_datetime <= datetime.now(timezone.utc))
-                .where(
-                    (Vote.end_datetime < start_cursor[0])  # 종료시간이 커서 시간보다 과거이거나
-                    | (
-                        (Vote.end_datetime == start_cursor[0]) & (Vote.id > start_cursor[1]) # 종료시간이 커서와 같은데 id가 더 큰 경우
-                    )
-                )
-                .subquery()
-            )
-        
-        #서브 쿼리: filtered_votes의 vote_id별 참가자 수를 구하는 서브 쿼리
-        subquery = (
-            select(
-                Choice.vote_id.label("vote_id"),
-                func.count(func.distinct(ChoiceParticipation.user_id)).label("participant_count")
-            )
-            .join(ChoiceParticipation, Choice.id == ChoiceParticipation.choice_id, isouter=True) # 참여가 없는 투표의 경우도 참여자 수는 반환되어야 하므로 left outer join
-            .where(Choice.vote_id.in_(select(filtered_votes.c.id)))  # 필요한 투표만 선택
-            .group_by(Choice.vote_id)
-            .subquery()
-        )
-
-        # 메인 쿼리: 완료된 투표글들만 Vote 정보 + 참여자 수 inner join
         query = (
-            select(Vote, subquery.c.participant_count)
-            .options(
-                subqueryload(Vote.choices).subqueryload(Choice.choice_participations),
-                subqueryload(Vote.images)
-            )
-            .join(subquery, Vote.id == subquery.c.vote_id) # filtered_votes의 vote 정보와 참여자 수만 표시되어야 하므로 inner join
+            select(Vote, *self.list_info_columns(user_id))
+            .where(Vote.end_datetime <= datetime.now(timezone.utc))
             .order_by(Vote.end_datetime.desc(), Vote.id.asc())
             .limit(self.pagination_size)
-
         )
 
-        results = await self.session.execute(query)
+        # 커서가 None이 아니면 커서보다 과거에 끝난 투표부터 최근에 끝난 순으로 self.pagination_size개
+        if start_cursor is not None:
+            query = query.where(
+                (Vote.end_datetime < start_cursor[0])  # 종료시간이 커서 시간보다 과거이거나
+                | (
+                    (Vote.end_datetime == start_cursor[0]) & (Vote.id > start_cursor[1]) # 종료시간이 커서와 같은데 id가 더 큰 경우
+                )
+            )
+
+        results = await self.read_session.execute(query)
         results = results.all()
 
         # 만약 self.pagination_size개를 꽉 채웠다면 추가 내용이 있을 가능성 있음
@@ -184,52 +166,28 @@ class VoteStore:
         return results, has_next, next_cursor
 
 
-    async def get_hot_votes_list(self, start_cursor: tuple[datetime,int] |None) ->  tuple[List[tuple[Vote,int]], bool, tuple[datetime, int]|None]:
+    async def get_hot_votes_list(self, user_id: int|None, start_cursor: tuple[datetime,int] |None) ->  tuple[List[tuple[Vote, bool, str|None]], bool, tuple[datetime, int]|None]:
 
         #커서가 none이면 가장 최신 것부터 self.pagination_size개
         if start_cursor is None:
             start_cursor = (datetime.now(timezone.utc), 0)
-        
 
-        # 먼저 필요한 Vote만 필터링
-        filtered_votes = (
-            select(Vote.id)
+        # 참여자 수 기준을 넘긴 투표만 모아둔 hot_vote 테이블을 (create_datetime, vote_id) 순으로 페이지네이션
+        query = (
+            select(Vote, *self.list_info_columns(user_id))
+            .join(HotVote, HotVote.vote_id == Vote.id)
             .where(
-                (Vote.create_datetime < start_cursor[0])   # 생성 시간이 커서보다 과거이거나
+                (HotVote.create_datetime < start_cursor[0])   # 생성 시간이 커서보다 과거이거나
                 | (
-                    (Vote.create_datetime == start_cursor[0]) & (Vote.id > start_cursor[1]) # 생성 시간이 커서와 같은데 id가 더 큰 경우
+                    (HotVote.create_datetime == start_cursor[0]) & (HotVote.vote_id > start_cursor[1]) # 생성 시간이 커서와 같은데 id가 더 큰 경우
                 )
             )
-            .subquery()
-        )
-
-        #서브 쿼리
-        subquery = (
-            select(
-                Choice.vote_id.label("vote_id"),
-                func.count(func.distinct(ChoiceParticipation.user_id)).label("participant_count")
-            )
-            .join(ChoiceParticipation, Choice.id == ChoiceParticipation.choice_id)
-            .where(Choice.vote_id.in_(select(filtered_votes.c.id)))  # 필요한 투표만 선택
-            .group_by(Choice.vote_id)
-            .subquery()
-        )
-
-        #메인 쿼리
-        query = (
-            select(Vote, subquery.c.participant_count)
-            .options(
-                subqueryload(Vote.choices).subqueryload(Choice.choice_participations),
-                subqueryload(Vote.images)
-            )
-            .join(subquery, Vote.id == subquery.c.vote_id)
-            .where(subquery.c.participant_count >= 5)  # 참여자 수 5명 이상 조건
-            .order_by(Vote.create_datetime.desc(), Vote.id.asc())
+            .order_by(HotVote.create_datetime.desc(), HotVote.vote_id.asc())
             .limit(self.pagination_size)
         )
 
         # results : 투표 리스트
-        results = await self.session.execute(query)
+        results = await self.read_session.execute(query)
         results = results.all()
 
         #만약 self.pagination_size개를 꽉 채웠다면 추가 내용이 있을 가능성 있음
@@ -241,53 +199,40 @@ class VoteStore:
         return results, has_next, next_cursor
 
 
+    # 주어진 투표 중 유저가 참여한 투표 id
+    async def get_participated_vote_ids(self, user_id: int, vote_ids: List[int]) -> set[int]:
+        if not vote_ids:
+            return set()
+
+        participated_vote_ids = await self.read_session.scalars(
+            select(VoteParticipation.vote_id)
+            .where((VoteParticipation.user_id == user_id) & (VoteParticipation.vote_id.in_(vote_ids)))
+        )
+        return set(participated_vote_ids.all())
+
+
     #내가 만든 투표글 리스트
-    async def get_my_votes_list(self, user_id: int, start_cursor: tuple[datetime,int] |None) ->  tuple[List[tuple[Vote,int]], bool, tuple[datetime, int]|None]:
+    async def get_my_votes_list(self, user_id: int, start_cursor: tuple[datetime,int] |None) ->  tuple[List[tuple[Vote, bool, str|None]], bool, tuple[datetime, int]|None]:
 
         #커서가 none이면 가장 최신 것부터 self.pagination_size개
         if start_cursor is None:
             start_cursor = (datetime.now(timezone.utc), 0)
-        
 
-        # 먼저 내가 만든 Vote만 필터링
-        filtered_votes = (
-            select(Vote.id)
+        query = (
+            select(Vote, *self.list_info_columns(user_id))
+            .where(Vote.writer_id == user_id)
             .where(
                 (Vote.create_datetime < start_cursor[0])   # 생성 시간이 커서보다 과거이거나
                 | (
                     (Vote.create_datetime == start_cursor[0]) & (Vote.id > start_cursor[1]) # 생성 시간이 커서와 같은데 id가 더 큰 경우
                 )
             )
-            .where(Vote.writer_id == user_id)
-            .subquery()
-        )
-
-        #서브 쿼리: filtered_votes의 vote_id별 참가자 수를 구하는 서브 쿼리
-        subquery = (
-            select(
-                Choice.vote_id.label("vote_id"),
-                func.count(func.distinct(ChoiceParticipation.user_id)).label("participant_count")
-            )
-            .join(ChoiceParticipation, Choice.id == ChoiceParticipation.choice_id, isouter=True) # 참여가 없는 투표의 경우도 참여자 수는 반환되어야 하므로 left outer join
-            .where(Choice.vote_id.in_(select(filtered_votes.c.id)))  # 필요한 투표만 선택
-            .group_by(Choice.vote_id)
-            .subquery()
-        )
-
-        # 메인 쿼리: 완료된 투표글들만 Vote 정보 + 참여자 수 inner join
-        query = (
-            select(Vote, subquery.c.participant_count)
-            .options(
-                subqueryload(Vote.choices).subqueryload(Choice.choice_participations),
-                subqueryload(Vote.images)
-            )
-            .join(subquery, Vote.id == subquery.c.vote_id) # filtered_votes의 vote 정보와 참여자 수만 표시되어야 하므로 inner join
             .order_by(Vote.create_datetime.desc(), Vote.id.asc())
             .limit(self.pagination_size)
         )
 
         # results : 투표 리스트
-        results = await self.session.execute(query)
+        results = await self.read_session.execute(query)
         results = results.all()
 
         #만약 self.pagination_size개를 꽉 채웠다면 추가 내용이 있을 가능성 있음
@@ -300,54 +245,29 @@ class VoteStore:
     
 
     #내가 참여한 투표글 리스트
-    async def get_participated_votes_list(self, user_id: int, start_cursor: tuple[datetime,int] |None) ->  tuple[List[tuple[Vote,int]], bool, tuple[datetime, int]|None]:
+    async def get_participated_votes_list(self, user_id: int, start_cursor: tuple[datetime,int] |None) ->  tuple[List[tuple[Vote, bool, str|None]], bool, tuple[datetime, int]|None]:
 
         #커서가 none이면 가장 최신 것부터 self.pagination_size개
         if start_cursor is None:
             start_cursor = (datetime.now(timezone.utc), 0)
-        
 
-        # 먼저 내가 참여한 Vote만 필터링
-        filtered_votes = (
-            select(Vote.id)
-            .join(ChoiceParticipation, ChoiceParticipation.choice_id == Choice.id)
-            .join(Choice, Choice.vote_id == Vote.id)
-            .where(ChoiceParticipation.user_id == user_id)
+        # vote_participation의 (user_id, vote_create_datetime, vote_id) 인덱스만 범위 스캔
+        query = (
+            select(Vote, *self.list_info_columns(user_id))
+            .join(VoteParticipation, VoteParticipation.vote_id == Vote.id)
+            .where(VoteParticipation.user_id == user_id)
             .where(
-                (Vote.create_datetime < start_cursor[0])   # 생성 시간이 커서보다 과거이거나
+                (VoteParticipation.vote_create_datetime < start_cursor[0])   # 생성 시간이 커서보다 과거이거나
                 | (
-                    (Vote.create_datetime == start_cursor[0]) & (Vote.id > start_cursor[1]) # 생성 시간이 커서와 같은데 id가 더 큰 경우
+                    (VoteParticipation.vote_create_datetime == start_cursor[0]) & (VoteParticipation.vote_id > start_cursor[1]) # 생성 시간이 커서와 같은데 id가 더 큰 경우
                 )
             )
-            .subquery()
-        )
-
-        #서브 쿼리: filtered_votes의 vote_id별 참가자 수를 구하는 서브 쿼리
-        subquery = (
-            select(
-                Choice.vote_id.label("vote_id"),
-                func.count(func.distinct(ChoiceParticipation.user_id)).label("participant_count")
-            )
-            .join(ChoiceParticipation, Choice.id == ChoiceParticipation.choice_id, isouter=True) # 참여가 없는 투표의 경우도 참여자 수는 반환되어야 하므로 left outer join
-            .where(Choice.vote_id.in_(select(filtered_votes.c.id)))  # 필요한 투표만 선택
-            .group_by(Choice.vote_id)
-            .subquery()
-        )
-
-        # 메인 쿼리: 완료된 투표글들만 Vote 정보 + 참여자 수 inner join
-        query = (
-            select(Vote, subquery.c.participant_count)
-            .options(
-                subqueryload(Vote.choices).subqueryload(Choice.choice_participations),
-                subqueryload(Vote.images)
-            )
-            .join(subquery, Vote.id == subquery.c.vote_id) # filtered_votes의 vote 정보와 참여자 수만 표시되어야 하므로 inner join
-            .order_by(Vote.create_datetime.desc(), Vote.id.asc())
+            .order_by(VoteParticipation.vote_create_datetime.desc(), VoteParticipation.vote_id.asc())
             .limit(self.pagination_size)
         )
 
         # results : 투표 리스트
-        results = await self.session.execute(query)
+        results = await self.read_session.execute(query)
         results = results.all()
 
         #만약 self.pagination_size개를 꽉 채웠다면 추가 내용이 있을 가능성 있음
@@ -359,31 +279,252 @@ class VoteStore:
         return results, has_next, next_cursor
 
 
+    # 투표글 조회 (선택지 포함)
+    # read_only=True이면 replica에서 조회 (쓰기 직후 다시 읽는 경우에는 primary에서 조회해야 함)
+    async def get_vote_by_vote_id(self, vote_id: int, read_only: bool = False) -> Vote:
+        session = self.read_session if read_only else self.session
+        return await session.scalar(select(Vote).options(selectinload(Vote.choices)).where(Vote.id == vote_id))
+
     # 투표글 상세 내용 조회
-    async def get_vote_by_vote_id(self, vote_id: int) -> Vote:
-        return await self.session.scalar(select(Vote).options(joinedload(Vote.writer), joinedload(Vote.choices).joinedload(Choice.choice_participations).joinedload(ChoiceParticipation.user), joinedload(Vote.comments).joinedload(Comment.writer), joinedload(Vote.images)).where(Vote.id == vote_id))
+    # 한 번의 joinedload로 선택지 x 참여 x 이미지 행을 만들지 않도록 컬렉션은 각각 별도 쿼리(selectinload)로 조회
+    # 선택지별 참여자 수는 Choice.num_participants를 사용하므로 참여 기록은 불러오지 않음
+    # 댓글은 get_comments_list로 따로 페이지네이션
+    async def get_vote_detail_by_vote_id(self, vote_id: int, read_only: bool = False) -> Vote:
+        session = self.read_session if read_only else self.session
+        return await session.scalar(
+            select(Vote)
+            .options(
+                joinedload(Vote.writer),
+                selectinload(Vote.choices),
+                selectinload(Vote.images)
+            )
+            .where(Vote.id == vote_id)
+        )
+
+    # 해당 투표에서 유저가 선택한 선택지 id
+    async def get_participated_choice_ids(self, vote_id: int, user_id: int, read_only: bool = False) -> set[int]:
+        session = self.read_session if read_only else self.session
+        choice_ids = await session.scalars(
+            select(ChoiceParticipation.choice_id)
+            .join(Choice, Choice.id == ChoiceParticipation.choice_id)
+            .where((Choice.vote_id == vote_id) & (ChoiceParticipation.user_id == user_id))
+        )
+        return set(choice_ids.all())
+
+    # 투표별 집계 조회: {vote_id: (참여자 수, 종료 시간, {choice_id: 선택지 참여자 수})}
+    async def get_tallies(self, vote_ids: List[int]) -> dict[int, tuple[int, datetime, dict[int, int]]]:
+        results = await self.session.execute(
+            select(Vote.id, Vote.participant_count, Vote.end_datetime, Choice.id, Choice.num_participants)
+            .join(Choice, Choice.vote_id == Vote.id)
+            .where(Vote.id.in_(vote_ids))
+        )
+
+        tallies: dict[int, tuple[int, datetime, dict[int, int]]] = {}
+        for vote_id, participant_count, end_datetime, choice_id, num_participants in results.all():
+            tallies.setdefault(vote_id, (participant_count, end_datetime, {}))[2][choice_id] = num_participants
+        return tallies
+
+    # 선택지 참여자 이름 리스트 조회 (참여 순서대로 self.participants_pagination_size개)
+    async def get_choice_participants_list(self, choice_id: int, start_cursor_id: int|None) -> tuple[List[str], bool, int|None]:
+        query = (
+            select(ChoiceParticipation.id, User.name)
+            .join(User, User.id == ChoiceParticipation.user_id)
+            .where(ChoiceParticipation.choice_id == choice_id)
+            .order_by(ChoiceParticipation.id.asc())
+            .limit(self.participants_pagination_size)
+        )
+
+        # 커서가 None이 아니면 커서 이후의 참여부터
+        if start_cursor_id is not None:
+            query = query.where(ChoiceParticipation.id > start_cursor_id)
+
+        results = await self.read_session.execute(query)
+        results = results.all()
+
+        # 만약 self.participants_pagination_size개를 꽉 채웠다면 추가 내용이 있을 가능성 있음
+        has_next = len(results) == self.participants_pagination_size
+
+        # 다음 커서는 마지막 참여의 id
+        next_cursor_id = results[-1][0] if has_next else None
+
+        return [name for _, name in results], has_next, next_cursor_id
     
 
     #투표 참여하기
     async def participate_vote(self, vote: Vote, user_id: int, choice_id_list: List[int]) -> None:
+        vote_id = vote.id
+        await self.begin_participation()
+        await self.apply_participation(vote, user_id, choice_id_list)
 
-        # 참여하려고 하는 투표에 이미 투표를 한 상태라면 이전 선택지 참여는 제거하기
-        for choice in vote.choices:
-            choice_participation = await self.session.scalar(
-                select(ChoiceParticipation).where((ChoiceParticipation.choice_id == choice.id) & (ChoiceParticipation.user_id == user_id)))
-            
-            if choice_participation is not None:
-                await self.session.delete(choice_participation)
-        
-        await self.session.flush()
+        await self.session.commit()
+        self.session.expire_all()
+        bump_vote_version(vote_id)
+
+    # 투표 참여를 반영할 트랜잭션을 participation_isolation_level로 시작
+    # 이 트랜잭션만 격리 수준을 낮추고, 상세 조회 등 다른 트랜잭션은 기본 격리 수준의 일관된 스냅샷을 유지 (커넥션이 풀로 돌아갈 때 원래대로 복구됨)
+    async def begin_participation(self) -> None:
+        # 격리 수준은 트랜잭션 시작 전에만 바꿀 수 있으므로 투표 조회 등 앞선 읽기 트랜잭션을 먼저 끝냄
+        if self.session.in_transaction():
+            await self.session.commit()
+        await self.session.connection(execution_options={"isolation_level": DB_SETTINGS.participation_isolation_level})
+
+    # 투표 참여를 현재 트랜잭션에 반영 (commit하지 않음 -> 여러 표를 한 트랜잭션으로 묶어 반영할 수 있음)
+    # 이전 선택과의 차이만 한 번의 DELETE와 한 번의 INSERT로 반영 (choice_participation의 unique (user_id, choice_id)가 중복 참여를 막음)
+    # participated_at: 표를 제출한 시각 (투표 버퍼에서 나중에 반영하는 경우), 이미 그 뒤의 참여가 반영되어 있으면 반영하지 않고 False 반환
+    async def apply_participation(self, vote: Vote, user_id: int, choice_id_list: List[int], participated_at: datetime | None = None) -> bool:
+
+        # (user_id, vote_id) 참여 기록을 먼저 확보하고 잠금 -> 같은 유저의 동시 제출은 여기서 순서대로 처리됨
+        is_first_participation = await self.lock_vote_participation(vote, user_id, participated_at)
+        if is_first_participation is None:
+            return False
+
+        # 참여하려고 하는 투표에 이미 투표를 한 상태라면 이전 선택지 조회
+        previous_choice_id_list: List[int] = []
+        if not is_first_participation:
+            previous_choice_id_list = (await self.session.scalars(
+                select(ChoiceParticipation.choice_id)
+                .where(ChoiceParticipation.user_id == user_id)
+                .where(ChoiceParticipation.choice_id.in_([choice.id for choice in vote.choices]))
+            )).all()
+
+        removed_choice_id_list = [choice_id for choice_id in previous_choice_id_list if choice_id not in choice_id_list]
+        added_choice_id_list = [choice_id for choice_id in choice_id_list if choice_id not in previous_choice_id_list]
+
+        # 더 이상 선택하지 않은 선택지 참여 제거
+        if removed_choice_id_list:
+            await self.session.execute(
+                delete(ChoiceParticipation)
+                .where(ChoiceParticipation.user_id == user_id)
+                .where(ChoiceParticipation.choice_id.in_(removed_choice_id_list))
+                .execution_options(synchronize_session=False)
+            )
+
+        # 새로 선택한 선택지 참여 생성
+        if added_choice_id_list:
+            await self.session.execute(
+                insert(ChoiceParticipation),
+                [{"user_id": user_id, "choice_id": choice_id} for choice_id in added_choice_id_list]
+            )
+
+        # 선택지를 하나도 고르지 않은 경우 참여 취소
+        if not choice_id_list:
+            await self.session.execute(
+                delete(VoteParticipation).where((VoteParticipation.user_id == user_id) & (VoteParticipation.vote_id == vote.id))
+            )
+
+        # 같은 트랜잭션 안에서 참여자 수 갱신 (처음 참여한 경우 +1, 기존 참여를 모두 취소한 경우 -1)
+        participant_delta = int(bool(choice_id_list)) - int(not is_first_participation)
+        await self.update_participant_counts(vote.id, participant_delta, removed_choice_id_list, added_choice_id_list)
+        return True
+
+    # 유저의 투표 참여 기록을 생성하거나 (이미 있으면) 잠그고, 처음 참여하는 것인지 반환
+    # unique (user_id, vote_id) 제약이 1인 1표를 보장함
+    # participated_at이 주어졌는데 기존 참여 기록이 그보다 새로우면 (늦게 반영되는 이전 표) 갱신하지 않고 None 반환
+    async def lock_vote_participation(self, vote: Vote, user_id: int, participated_at: datetime | None = None) -> bool | None:
+        now = participated_at or datetime.now(timezone.utc)
+        try:
+            async with self.session.begin_nested():
+                await self.session.execute(
+                    insert(VoteParticipation).values(user_id=user_id, vote_id=vote.id, participated_at=now, vote_create_datetime=vote.create_datetime)
+                )
+            return True
+        except IntegrityError:
+            # 이미 참여한 투표 -> 참여 시각을 갱신하면서 기존 행에 배타 잠금을 잡음
+            query = (
+                update(VoteParticipation)
+                .where((VoteParticipation.user_id == user_id) & (VoteParticipation.vote_id == vote.id))
+                .values(participated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            if participated_at is not None:
+                # participated_at 컬럼은 초 단위로 (반올림되어) 저장되므로 1초 이내는 같은 시각으로 보고 반영
+                query = query.where(VoteParticipation.participated_at <= participated_at + timedelta(seconds=1))
+
+            result = await self.session.execute(query)
+            if result.rowcount == 0:
+                return None
+            return False
+
+    # 참여자 수 카운터 갱신 (동시 요청에도 값이 유실되지 않도록 DB에서 상대값으로 갱신)
+    async def update_participant_counts(self, vote_id: int, participant_delta: int, removed_choice_id_list: List[int], added_choice_id_list: List[int]) -> None:
+        if removed_choice_id_list:
+            await self.session.execute(
+                update(Choice)
+                .where(Choice.id.in_(removed_choice_id_list))
+                .values(num_participants=Choice.num_participants - 1)
+                .execution_options(synchronize_session=False)
+            )
+
+        if added_choice_id_list:
+            await self.session.execute(
+                update(Choice)
+                .where(Choice.id.in_(added_choice_id_list))
+                .values(num_participants=Choice.num_participants + 1)
+                .execution_options(synchronize_session=False)
+            )
+
+        if participant_delta != 0:
+            await self.session.execute(
+                update(Vote)
+                .where(Vote.id == vote_id)
+                .values(participant_count=Vote.participant_count + participant_delta)
+                .execution_options(synchronize_session=False)
+            )
+            await self.update_hot_vote(vote_id)
+
+    # 참여자 수에 따라 HOT 투표 피드에 추가하거나 제거
+    async def update_hot_vote(self, vote_id: int) -> None:
+        participant_count, create_datetime = (
+            await self.session.execute(select(Vote.participant_count, Vote.create_datetime).where(Vote.id == vote_id))
+        ).one()
+        is_hot = await self.session.scalar(select(HotVote.vote_id).where(HotVote.vote_id == vote_id)) is not None
+
+        if participant_count >= HOT_VOTE_MIN_PARTICIPANTS and not is_hot:
+            try:
+                async with self.session.begin_nested():
+                    await self.session.execute(insert(HotVote).values(vote_id=vote_id, create_datetime=create_datetime))
+            except IntegrityError:
+                pass # 동시에 들어온 다른 참여 요청이 이미 추가한 경우
+        elif participant_count < HOT_VOTE_MIN_PARTICIPANTS and is_hot:
+            await self.session.execute(delete(HotVote).where(HotVote.vote_id == vote_id))
+
+    # 참여 기록으로부터 참여자 수와 HOT 투표 피드를 다시 계산 (복구용, vote_id가 None이면 전체)
+    async def recount_participants(self, vote_id: int | None = None) -> None:
+        choice_count = (
+            select(func.count(ChoiceParticipation.id))
+            .where(ChoiceParticipation.choice_id == Choice.id)
+            .scalar_subquery()
+        )
+        vote_count = (
+            select(func.count(VoteParticipation.id))
+            .where(VoteParticipation.vote_id == Vote.id)
+            .scalar_subquery()
+        )
 
-        # 선택한 선택지 생성하기
-        for choice_id in choice_id_list:
-            choice_participation = ChoiceParticipation(user_id=user_id, choice_id=choice_id)
-            self.session.add(choice_participation)
+        choice_update = update(Choice).values(num_participants=choice_count).execution_options(synchronize_session=False)
+        vote_update = update(Vote).values(participant_count=vote_count).execution_options(synchronize_session=False)
+        if vote_id is not None:
+            choice_update = choice_update.where(Choice.vote_id == vote_id)
+            vote_update = vote_update.where(Vote.id == vote_id)
 
+        await self.session.execute(choice_update)
+        await self.session.execute(vote_update)
+
+        # HOT 투표 피드 재구성
+        hot_delete = delete(HotVote)
+        hot_votes = select(Vote.id, Vote.create_datetime).where(Vote.participant_count >= HOT_VOTE_MIN_PARTICIPANTS)
+        if vote_id is not None:
+            hot_delete = hot_delete.where(HotVote.vote_id == vote_id)
+            hot_votes = hot_votes.where(Vote.id == vote_id)
+
+        await self.session.execute(hot_delete)
+        await self.session.execute(insert(HotVote).from_select(["vote_id", "create_datetime"], hot_votes))
         await self.session.commit()
-        self.session.expire_all()
+
+        if vote_id is not None:
+            bump_vote_version(vote_id)
+        else:
+            VOTE_DETAIL_CACHE.clear()
     
     #투표 조기 종료하기
     async def close_vote(self, vote_id: int) -> None:
@@ -391,31 +532,83 @@ class VoteStore:
         vote.end_datetime = datetime.now(timezone.utc)
         await self.session.commit()
         self.session.expire_all()
+        bump_vote_version(vote_id)
     
-    async def create_comment(self, vote_id: int, writed_id: int, content: str) -> Vote:
+    async def create_comment(self, vote_id: int, writed_id: int, content: str) -> Comment:
         comment = Comment(vote_id=vote_id, writer_id=writed_id, content=content,
                           create_datetime=datetime.now(timezone.utc),
                           is_edited=False)
         self.session.add(comment)
+        await self.session.flush()
+        comment_id = comment.id
+
         await self.session.commit()
         self.session.expire_all()
+        bump_vote_version(vote_id)
+        return await self.get_comment_by_comment_id(comment_id)
 
     async def get_comment_by_comment_id(self, comment_id: int) -> Comment:
-        return await self.session.scalar(select(Comment).where(Comment.id == comment_id))
+        return await self.session.scalar(select(Comment).options(joinedload(Comment.writer)).where(Comment.id == comment_id))
+
+    # 댓글 리스트 조회 (삭제되지 않은 댓글만 작성 시간 순으로 self.pagination_size개)
+    async def get_comments_list(self, vote_id: int, start_cursor: tuple[datetime,int]|None, read_only: bool = False) -> tuple[List[Comment], bool, tuple[datetime, int]|None]:
+        session = self.read_session if read_only else self.session
+
+        query = (
+            select(Comment)
+            .options(joinedload(Comment.writer))
+            .where(Comment.vote_id == vote_id)
+            .where(Comment.is_deleted == False)
+            .order_by(Comment.create_datetime.asc(), Comment.id.asc())
+            .limit(self.pagination_size)
+        )
+
+        # 커서가 None이 아니면 커서 이후에 작성된 댓글부터
+        if start_cursor is not None:
+            query = query.where(
+                (Comment.create_datetime > start_cursor[0])  # 작성 시간이 커서보다 이후이거나
+                | (
+                    (Comment.create_datetime == start_cursor[0]) & (Comment.id > start_cursor[1]) # 작성 시간이 커서와 같은데 id가 더 큰 경우
+                )
+            )
+
+        results = await session.scalars(query)
+        results = results.all()
+
+        # 만약 self.pagination_size개를 꽉 채웠다면 추가 내용이 있을 가능성 있음
+        has_next = len(results) == self.pagination_size
+
+        # 다음 커서는 self.pagination_size개 중 가장 나중에 작성된 것
+        next_cursor = (results[-1].create_datetime, results[-1].id) if has_next else None
+
+        return results, has_next, next_cursor
+
+    # 삭제되지 않은 댓글 수
+    async def get_comment_count(self, vote_id: int, read_only: bool = False) -> int:
+        session = self.read_session if read_only else self.session
+        return await session.scalar(
+            select(func.count(Comment.id)).where((Comment.vote_id == vote_id) & (Comment.is_deleted == False))
+        )
     
-    async def edit_comment_content(self, comment_id: int, comment_content: str) -> None:
+    async def edit_comment_content(self, comment_id: int, comment_content: str) -> Comment:
         comment = await self.get_comment_by_comment_id(comment_id)
+        vote_id = comment.vote_id
         comment.content = comment_content
         comment.is_edited = True
         comment.edited_datetime = datetime.now(timezone.utc)
         await self.session.commit()
         self.session.expire_all()
+        bump_vote_version(vote_id)
+        return await self.get_comment_by_comment_id(comment_id)
 
-    async def delete_comment_by_comment_id(self, comment_id: int) -> None:
+    async def delete_comment_by_comment_id(self, comment_id: int) -> Comment:
         comment = await self.get_comment_by_comment_id(comment_id)
+        vote_id = comment.vote_id
 
         # is_deleted = True로 바꾸고, deleted_datetime을 기록
         comment.is_deleted = True
         comment.deleted_datetime = datetime.now(timezone.utc)
         await self.session.commit()
         self.session.expire_all()
+        bump_vote_version(vote_id)
+        return await self.get_comment_by_comment_id(comment_id)
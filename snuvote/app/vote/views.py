@@ -1,19 +1,21 @@
 from typing import Annotated, List
 from fastapi import APIRouter, Depends, File, UploadFile, Form
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
 
 from pydantic.functional_validators import AfterValidator
 from starlette.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_401_UNAUTHORIZED
 
 from snuvote.app.vote.dto.requests import CreateVoteRequest, ParticipateVoteRequest, CommentRequest
-from snuvote.app.vote.dto.responses import OnGoingVotesListResponse, VotesListInfoResponse, VoteDetailResponse, ChoiceDetailResponse, CommentDetailResponse
+from snuvote.app.vote.dto.responses import OnGoingVotesListResponse, VotesListInfoResponse, VoteDetailResponse, ChoiceDetailResponse, CommentDetailResponse, CommentsListResponse, ChoiceParticipantsListResponse
 from snuvote.app.vote.errors import VoteNotFoundError, ChoiceNotFoundError, CommentNotFoundError, InvalidVoteListCategoryError, CursorError
 from datetime import datetime, timedelta, timezone
 
 from snuvote.database.models import User
 from snuvote.app.vote.service import VoteService
 from snuvote.app.vote.errors import InvalidFieldFormatError
-from snuvote.app.user.views import login_with_access_token
+from snuvote.app.user.views import get_authenticated_user
+from snuvote.app.user.cache import AuthenticatedUser
 
 vote_router = APIRouter()
 
@@ -23,7 +25,7 @@ security = HTTPBearer()
 #create vote
 @vote_router.post("/create", status_code=HTTP_201_CREATED)
 async def create_vote(
-    user: Annotated[User, Depends(login_with_access_token)],
+    user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)],
     vote_service: Annotated[VoteService, Depends()],
     images: List[UploadFile]|None = File(None),
     create_vote_json = Form(media_type="multipart/form-data", json_schema_extra=CreateVoteRequest.model_json_schema())
@@ -46,7 +48,7 @@ async def create_vote(
         images = images
     )
 
-    return await get_vote(vote.id, user, vote_service)
+    return await get_vote_detail(vote.id, user, vote_service)
 
 
 
@@ -54,7 +56,7 @@ async def create_vote(
 # 완료된/진행중인/hot 투표글 조회
 @vote_router.get("/list", status_code=HTTP_200_OK)
 async def get_votes_list(
-    user: Annotated[User, Depends(login_with_access_token)],
+    user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)],
     vote_service: Annotated[VoteService, Depends()],
     category: str,
     start_cursor_time: datetime|None = None,
@@ -68,20 +70,18 @@ async def get_votes_list(
         raise CursorError()
 
 
-    if category == "ended":
-        results, has_next, next_cursor = await vote_service.get_ended_votes_list(start_cursor)
-    elif category == "ongoing":
-        results, has_next, next_cursor = await vote_service.get_ongoing_list(start_cursor)
-    elif category == "hot":
-        results, has_next, next_cursor = await vote_service.get_hot_votes_list(start_cursor)
-    elif category == "made":
+    # 모든 유저에게 같은 카테고리는 캐시된 페이지에 참여 여부만 덮어씀
+    if category in ("ended", "ongoing", "hot"):
+        return await vote_service.get_public_votes_list(category, user, start_cursor)
+
+    if category == "made":
         results, has_next, next_cursor = await vote_service.get_my_votes_list(user, start_cursor)
     elif category == "participated":
         results, has_next, next_cursor = await vote_service.get_participated_votes_list(user, start_cursor)
     else: raise InvalidVoteListCategoryError()
 
     return OnGoingVotesListResponse(
-        votes_list = [ VotesListInfoResponse.from_vote_user(vote, user, participant_count) for vote, participant_count in results ],
+        votes_list = [ VotesListInfoResponse.from_vote(vote, participated, image_src) for vote, participated, image_src in results ],
         has_next = has_next,
         next_cursor_time = next_cursor[0] if next_cursor else None,
         next_cursor_id = next_cursor[1] if next_cursor else None
@@ -91,34 +91,64 @@ async def get_votes_list(
 @vote_router.get("/{vote_id}", status_code=HTTP_200_OK)
 async def get_vote(
     vote_id: int,
-    user: Annotated[User, Depends(login_with_access_token)],
+    user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)],
     vote_service: Annotated[VoteService, Depends()]
 ):
-    # 해당 vote_id에 해당하는 투표글 조회
-    vote = await vote_service.get_vote_by_vote_id(vote_id = vote_id)
+    # 단순 조회는 replica에서 읽음
+    return await get_vote_detail(vote_id, user, vote_service, read_only=True)
+
+
+# 투표글 상세 정보 응답 생성
+# 쓰기 직후 다시 읽는 경우(투표 생성/참여/종료, 댓글 작성 등)에는 read_only=False로 primary에서 읽어야 함
+# 투표 버퍼에 기록만 되고 아직 DB에 반영되지 않은 참여는 pending_choice_ids로 유저가 선택한 선택지를 덮어씀
+async def get_vote_detail(vote_id: int, user: AuthenticatedUser, vote_service: VoteService, read_only: bool = False, pending_choice_ids: set[int]|None = None) -> VoteDetailResponse:
+    # 유저와 무관한 부분 (없을 경우 404 Not Found, 캐시에 있으면 DB를 조회하지 않음)
+    detail = await vote_service.get_vote_detail(vote_id = vote_id, read_only = read_only)
+
+    # 유저가 선택한 선택지
+    participated_choice_ids = pending_choice_ids
+    if participated_choice_ids is None:
+        participated_choice_ids = await vote_service.get_participated_choice_ids(vote_id = vote_id, user = user, read_only = read_only)
+
+    return detail.for_user(user, participated_choice_ids)
+
+
+# 선택지 참여자 이름 리스트 조회 (익명이 아니고 결과가 공개된 투표만)
+@vote_router.get("/{vote_id}/choices/{choice_id}/participants", status_code=HTTP_200_OK)
+async def get_choice_participants_list(
+    vote_id: int,
+    choice_id: int,
+    user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)],
+    vote_service: Annotated[VoteService, Depends()],
+    start_cursor_id: int|None = None
+):
+    participants_name, has_next, next_cursor_id = await vote_service.get_choice_participants_list(vote_id, choice_id, start_cursor_id)
+
+    return ChoiceParticipantsListResponse(
+        participants_name = participants_name,
+        has_next = has_next,
+        next_cursor_id = next_cursor_id
+    )
+
+
+# 실시간 집계 스트림 (Server-Sent Events)
+# 결과가 공개된 투표만 가능, 처음에 전체 집계를 보내고 이후 바뀐 값만 보내며 투표가 끝나면 스트림 종료
+@vote_router.get("/{vote_id}/stream", status_code=HTTP_200_OK)
+async def stream_vote_tally(
+    vote_id: int,
+    user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)],
+    vote_service: Annotated[VoteService, Depends()]
+):
+    vote = await vote_service.get_vote_by_vote_id(vote_id = vote_id, read_only = True)
+
     # 해당 vote_id에 해당하는 투표글이 없을 경우 404 Not Found
     if not vote:
         raise VoteNotFoundError()
-    
-    #투표 생성자 아이디와 유저 아이디가 같은 경우
-    is_writer = vote.writer_id == user.id
-
-    return VoteDetailResponse(
-        vote_id = vote.id,
-        writer_name = vote.writer.name,
-        is_writer= is_writer,
-        title = vote.title,
-        content = vote.content,
-        participation_code_required = vote.participation_code_required,
-        realtime_result = vote.realtime_result,
-        multiple_choice = vote.multiple_choice,
-        annonymous_choice = vote.annonymous_choice,
-        create_datetime = vote.create_datetime,
-        end_datetime = vote.end_datetime,
-        choices= [ChoiceDetailResponse.from_choice(choice, user, vote.annonymous_choice, vote.realtime_result, vote.end_datetime) for choice in vote.choices],
-        comments = [CommentDetailResponse.from_comment_user(comment, user) for comment in vote.comments if comment.is_deleted==False],
-        images = [image.src for image in vote.images],
-        participant_count = VoteDetailResponse.get_participant_count_from_vote(vote)
+
+    return StreamingResponse(
+        vote_service.stream_tally(vote),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
@@ -126,7 +156,7 @@ async def get_vote(
 @vote_router.post("/{vote_id}/participate", status_code=HTTP_201_CREATED)
 async def participate_vote(
     vote_id: int,
-    user: Annotated[User, Depends(login_with_access_token)],
+    user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)],
     participate_vote_request: ParticipateVoteRequest,
     vote_service: Annotated[VoteService, Depends()]
 ):
@@ -139,14 +169,15 @@ async def participate_vote(
         raise VoteNotFoundError()
 
     #투표 참여하기
-    await vote_service.participate_vote(vote, user, participate_vote_request)
-    return await get_vote(vote_id, user, vote_service)
+    buffered = await vote_service.participate_vote(vote, user, participate_vote_request)
+    pending_choice_ids = set(participate_vote_request.participated_choice_ids) if buffered else None
+    return await get_vote_detail(vote_id, user, vote_service, pending_choice_ids = pending_choice_ids)
 
 #투표 조기 종료하기
 @vote_router.patch("/{vote_id}/close", status_code=HTTP_200_OK)
 async def close_vote(
     vote_id: int,
-    user: Annotated[User, Depends(login_with_access_token)],
+    user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)],
     vote_service: Annotated[VoteService, Depends()]
 ):
     vote = await vote_service.get_vote_by_vote_id(vote_id = vote_id)
@@ -157,15 +188,46 @@ async def close_vote(
     
     await vote_service.close_vote(vote, user)
 
-    return await get_vote(vote_id, user, vote_service)
+    return await get_vote_detail(vote_id, user, vote_service)
 
 
+# 댓글 리스트 조회
+@vote_router.get("/{vote_id}/comments", status_code=HTTP_200_OK)
+async def get_comments_list(
+    vote_id: int,
+    user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)],
+    vote_service: Annotated[VoteService, Depends()],
+    start_cursor_time: datetime|None = None,
+    start_cursor_id: int|None = None
+):
+    start_cursor: tuple[datetime, int]|None = None
+
+    if start_cursor_time is not None and start_cursor_id is not None:
+        start_cursor = (start_cursor_time, start_cursor_id)
+    elif start_cursor_time is not None or start_cursor_id is not None:
+        raise CursorError()
+
+    vote = await vote_service.get_vote_by_vote_id(vote_id = vote_id, read_only = True)
+
+    # 해당 vote_id에 해당하는 투표글이 없을 경우 404 Not Found
+    if not vote:
+        raise VoteNotFoundError()
+
+    comments, has_next, next_cursor = await vote_service.get_comments_list(vote_id, start_cursor, read_only=True)
+
+    return CommentsListResponse(
+        comments_list = [ CommentDetailResponse.from_comment_user(comment, user) for comment in comments ],
+        has_next = has_next,
+        next_cursor_time = next_cursor[0] if next_cursor else None,
+        next_cursor_id = next_cursor[1] if next_cursor else None
+    )
+
 # 댓글 추가하기
 @vote_router.post("/{vote_id}/comment", status_code=HTTP_201_CREATED)
 async def create_comment(
     vote_id: int,
     vote_service: Annotated[VoteService, Depends()],
-    user: Annotated[User, Depends(login_with_access_token)],
+    user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)],
     comment_request: CommentRequest
 ):
     # 해당 vote_id에 해당하는 투표글 조회
@@ -176,16 +238,16 @@ async def create_comment(
         raise VoteNotFoundError()
     
     # 댓글 추가하기
-    await vote_service.create_comment(vote, user, comment_request)
+    comment = await vote_service.create_comment(vote, user, comment_request)
 
-    return await get_vote(vote_id, user, vote_service)
+    return CommentDetailResponse.from_comment_user(comment, user)
 
 # 댓글 수정하기
 @vote_router.patch("/{vote_id}/comment/{comment_id}", status_code=HTTP_200_OK)
 async def edit_comment(
     vote_id: int,
     comment_id: int,
-    user: Annotated[User, Depends(login_with_access_token)],
+    user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)],
     comment_request: CommentRequest,
     vote_service: Annotated[VoteService, Depends()]
 ):
@@ -201,16 +263,16 @@ async def edit_comment(
         raise CommentNotFoundError()
     
     # 댓글 수정하기
-    await vote_service.edit_comment(user, vote, comment, comment_request)
+    comment = await vote_service.edit_comment(user, vote, comment, comment_request)
     
-    return await get_vote(vote_id, user, vote_service)
+    return CommentDetailResponse.from_comment_user(comment, user)
 
 # 댓글 삭제하기
 @vote_router.delete("/{vote_id}/comment/{comment_id}", status_code=HTTP_200_OK)
 async def delete_comment(
     vote_id: int,
     comment_id: int,
-    user: Annotated[User, Depends(login_with_access_token)],
+    user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)],
     vote_service: Annotated[VoteService, Depends()],
 ):
     vote = await vote_service.get_vote_by_vote_id(vote_id)
@@ -224,6 +286,6 @@ async def delete_comment(
     if not comment:
         raise CommentNotFoundError()
     
-    await vote_service.delete_comment(user, vote, comment)
+    comment = await vote_service.delete_comment(user, vote, comment)
 
-    return await get_vote(vote_id, user, vote_service)
\ No newline at end of file
+    return CommentDetailResponse.from_comment_user(comment, user)
\ No newline at end of file
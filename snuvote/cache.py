@@ -0,0 +1,102 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+# 워커 프로세스 내 LRU 캐시 (ttl을 주면 저장 후 ttl초가 지난 값은 없는 것으로 취급)
+# maxsize(개수)와 max_bytes(put 시 넘겨준 크기의 합)를 넘으면 가장 오래 쓰이지 않은 값부터 버립니다.
+# asyncio 이벤트 루프 한 스레드에서만 쓰므로 잠금 없이 사용합니다.
+class LRUCache(Generic[K, V]):
+    def __init__(self, maxsize: int, ttl: float | None = None, max_bytes: int | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[K, tuple[float, V, int]] = OrderedDict()
+        self.total_bytes = 0
+
+        # 지표
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: K) -> V | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, value, _ = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            self.pop(key)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: K, value: V, size: int = 0) -> None:
+        self.pop(key)
+        self.entries[key] = (time.monotonic(), value, size)
+        self.total_bytes += size
+
+        while len(self.entries) > self.maxsize or (self.max_bytes is not None and self.total_bytes > self.max_bytes and len(self.entries) > 1):
+            _, (_, _, evicted_size) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+            self.evictions += 1
+
+    def pop(self, key: K) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+    # 조건에 맞는 key를 모두 제거 (전체를 훑으므로 드물게 호출하는 무효화용)
+    def pop_where(self, predicate: Callable[[K], bool]) -> None:
+        for key in [key for key in self.entries if predicate(key)]:
+            self.pop(key)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def metrics(self) -> dict:
+        return {
+            "size": len(self.entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0,
+        }
+
+
+# key별 버전을 함께 관리하는 LRU 캐시
+# 쓰기 쪽에서 bump로 버전을 올리면 기존 값은 버려지고, 올리기 전에 시작된 읽기의 결과(이전 버전)는 저장되지 않습니다.
+class VersionedLRUCache(LRUCache[K, V]):
+    def __init__(self, maxsize: int, ttl: float | None = None, max_bytes: int | None = None) -> None:
+        super().__init__(maxsize, ttl, max_bytes)
+        self.versions: OrderedDict[K, int] = OrderedDict()
+        self.max_versions = maxsize * 4
+
+    # 읽기 시작 전에 현재 버전을 받아 두었다가 put에 넘김
+    def version(self, key: K) -> int:
+        return self.versions.get(key, 0)
+
+    def put_versioned(self, key: K, version: int, value: V, size: int = 0) -> None:
+        if version != self.version(key):
+            return
+        self.put(key, value, size)
+
+    def bump(self, key: K) -> None:
+        self.versions[key] = self.version(key) + 1
+        self.versions.move_to_end(key)
+        while len(self.versions) > self.max_versions:
+            self.versions.popitem(last=False)
+
+        self.pop(key)
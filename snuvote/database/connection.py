@@ -1,22 +1,80 @@
-from typing import Any, Generator, AsyncGenerator
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+import asyncio
+from typing import Any, AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 
 from snuvote.database.settings import DB_SETTINGS
 
 
 class DatabaseManager:
     def __init__(self):
-        # TODO pool 이 뭘까요?
-        # pool_recycle 은 뭐고 왜 28000으로 설정해두었을까요?
-        self.engine = create_async_engine(
-            DB_SETTINGS.url,
-            pool_recycle=28000,
+        self.engine: AsyncEngine | None = None
+        self.session_factory: async_sessionmaker[AsyncSession] | None = None
+
+        # 읽기 전용 replica (설정이 없으면 primary 엔진을 그대로 사용)
+        self.replica_engine: AsyncEngine | None = None
+        self.replica_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+    # 워커 프로세스당 한 번만 엔진(커넥션 풀)을 만들고 모든 요청이 공유합니다.
+    # 요청마다 엔진을 새로 만들면 매번 MySQL 연결/핸드셰이크 비용이 들고, 이전 풀은 정리되지 않습니다.
+    async def start(self) -> None:
+        if self.engine is not None:
+            return
+
+        self.engine = self.create_engine(DB_SETTINGS.url)
+        self.session_factory = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+        await self.warm_up(self.engine)
+
+        if DB_SETTINGS.has_replica:
+            self.replica_engine = self.create_engine(DB_SETTINGS.replica_url)
+            await self.warm_up(self.replica_engine)
+        else:
+            self.replica_engine = self.engine
+        self.replica_session_factory = async_sessionmaker(bind=self.replica_engine, expire_on_commit=False)
+
+    def create_engine(self, url: str) -> AsyncEngine:
+        return create_async_engine(
+            url,
+            pool_size=DB_SETTINGS.pool_size,
+            max_overflow=DB_SETTINGS.max_overflow,
+            pool_timeout=DB_SETTINGS.pool_timeout,
+            pool_recycle=DB_SETTINGS.pool_recycle,
             pool_pre_ping=True,
         )
-        self.session_factory = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    # pool_size 만큼 커넥션을 미리 열어두어 첫 요청들이 연결 비용을 치르지 않도록 합니다.
+    async def warm_up(self, engine: AsyncEngine) -> None:
+        async def connect() -> AsyncConnection:
+            return await engine.connect()
+
+        connections = await asyncio.gather(*(connect() for _ in range(DB_SETTINGS.pool_size)), return_exceptions=True)
+
+        # 연결된 커넥션은 모두 풀에 반납 (close하면 실제로 끊기지 않고 풀로 돌아감)
+        for connection in connections:
+            if isinstance(connection, AsyncConnection):
+                await connection.close()
+
+        for connection in connections:
+            if isinstance(connection, BaseException):
+                raise connection
+
+    # 앱 종료 시 풀에 있는 커넥션을 모두 닫습니다.
+    async def dispose(self) -> None:
+        if self.engine is None:
+            return
+
+        if self.replica_engine is not None and self.replica_engine is not self.engine:
+            await self.replica_engine.dispose()
+        await self.engine.dispose()
+
+        self.engine = None
+        self.session_factory = None
+        self.replica_engine = None
+        self.replica_session_factory = None
+
+
+# 워커 프로세스 전체에서 공유하는 DatabaseManager (snuvote.main의 lifespan에서 start/dispose)
+DB_MANAGER = DatabaseManager()
 
 
 # TODO 아래 함수를 이용해서 Session 종속성을 주입받을 수 있습니다.
@@ -24,7 +82,10 @@ class DatabaseManager:
 # 한 번 생각해보세요.
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, Any]:
-    async with DatabaseManager().session_factory() as session:
+    if DB_MANAGER.session_factory is None:
+        raise RuntimeError("DatabaseManager is not started")
+
+    async with DB_MANAGER.session_factory() as session:
         try:
             yield session
             await session.commit()
@@ -33,3 +94,16 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, Any]:
             raise e
         finally:
             await session.close()
+
+
+# 읽기 전용 Session 종속성: replica로 연결되며 commit하지 않습니다.
+# 쓰기 작업이나 쓰기 직후 다시 읽어야 하는 경우(read-your-own-write)에는 get_db_session을 사용해야 합니다.
+async def get_read_db_session() -> AsyncGenerator[AsyncSession, Any]:
+    if DB_MANAGER.replica_session_factory is None:
+        raise RuntimeError("DatabaseManager is not started")
+
+    async with DB_MANAGER.replica_session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import List, Optional
 
-from sqlalchemy import BigInteger, String, ForeignKey, Integer, DateTime, Text, Boolean
+from sqlalchemy import BigInteger, String, ForeignKey, Integer, DateTime, Text, Boolean, Index, UniqueConstraint, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from snuvote.database.common import Base
 
@@ -30,6 +30,11 @@ class User(Base):
 
     is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="0")
 
+    # 탈퇴/비밀번호 변경 시 1 증가 -> 이전 버전으로 발급된 토큰은 모두 무효
+    token_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # token_version이 마지막으로 올라간 시각 (워커들이 최근에 올라간 버전만 읽어가도록 인덱스)
+    token_version_changed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+
 class NaverUser(Base):
     __tablename__ = "naver_user"
 
@@ -68,22 +73,34 @@ class Vote(Base):
     multiple_choice: Mapped[bool] = mapped_column(Boolean, nullable=False)
     annonymous_choice: Mapped[bool] = mapped_column(Boolean, nullable=False)
 
+    # 투표 참여자 수 (중복 없는 user 수, participate_vote에서 함께 갱신)
+    participant_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
     choices: Mapped[Optional[List["Choice"]]] = relationship("Choice", back_populates="vote", uselist=True)
     
     comments: Mapped[Optional[List["Comment"]]] = relationship("Comment", back_populates="vote", uselist=True)
 
     images: Mapped[Optional[List["VoteImage"]]] = relationship("VoteImage", back_populates="vote", uselist=True)
 
+    __table_args__ = (
+        Index("ix_vote_create_datetime_id", text("create_datetime DESC"), "id"), # 진행 중/HOT 투표 리스트 keyset pagination (create_datetime DESC, id ASC)
+        Index("ix_vote_end_datetime_id", text("end_datetime DESC"), "id"), # 완료된 투표 리스트 keyset pagination
+        Index("ix_vote_writer_id_create_datetime_id", "writer_id", text("create_datetime DESC"), "id"), # 내가 만든 투표 리스트 keyset pagination
+    )
+
 class Choice(Base):
     __tablename__ = "choice"
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
 
-    vote_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("vote.id"))
+    vote_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("vote.id"), index=True)
     vote: Mapped["Vote"] = relationship("Vote", back_populates="choices", uselist=False)
 
     choice_content: Mapped[str] = mapped_column(String(100), nullable=False)
 
+    # 선택지 참여자 수 (participate_vote에서 함께 갱신)
+    num_participants: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
     choice_participations: Mapped[Optional[List["ChoiceParticipation"]]] = relationship("ChoiceParticipation", back_populates="choice")
 
 class ChoiceParticipation(Base):
@@ -97,6 +114,11 @@ class ChoiceParticipation(Base):
     choice_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("choice.id"))
     choice: Mapped["Choice"] = relationship("Choice", uselist=False)
 
+    __table_args__ = (
+        Index("ix_choice_participation_choice_id_id", "choice_id", "id"), # 선택지별 참여자 리스트를 id 순으로 페이지네이션, 선택지별 참여자 수 집계
+        UniqueConstraint("user_id", "choice_id", name="uq_choice_participation_user_id_choice_id"), # 선택지당 1인 1참여
+    )
+
 class Comment(Base):
     __tablename__ = "comment"
 
@@ -116,11 +138,17 @@ class Comment(Base):
     is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     deleted_datetime: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    __table_args__ = (
+        Index("ix_comment_vote_id_create_datetime", "vote_id", "create_datetime"), # 투표글별 댓글 조회
+    )
+
 class BlockedRefreshToken(Base):
     __tablename__ = "blocked_refresh_token"
 
     token_id: Mapped[str] = mapped_column(String(255), primary_key=True)
-    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    # 블록된 시각 (워커들이 마지막 갱신 이후에 블록된 토큰만 읽어가도록 인덱스)
+    blocked_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True, server_default=func.now())
 
 class VoteImage(Base):
     __tablename__ = "vote_image"
@@ -132,4 +160,45 @@ class VoteImage(Base):
 
     order: Mapped[int] = mapped_column(Integer, nullable=False)
 
-    src: Mapped[str] = mapped_column(String(255), nullable=False)
\ No newline at end of file
+    src: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    # 업로드 시 만든 축소 이미지 주소 (만들지 못했거나 이전에 올라온 이미지는 None -> src 사용)
+    thumbnail_src: Mapped[Optional[str]] = mapped_column(String(255), nullable=True) # 리스트 썸네일
+    medium_src: Mapped[Optional[str]] = mapped_column(String(255), nullable=True) # 상세 화면 표시용
+
+    __table_args__ = (
+        Index("ix_vote_image_vote_id_order", "vote_id", "order"), # 투표별 이미지를 순서대로 조회 (상세 화면, 리스트 썸네일)
+    )
+
+# HOT 투표 피드 (참여자 수가 기준 이상인 투표만 유지, participate_vote에서 함께 갱신)
+class HotVote(Base):
+    __tablename__ = "hot_vote"
+
+    vote_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("vote.id"), primary_key=True)
+
+    # Vote.create_datetime 복사본 (vote 테이블을 거치지 않고 keyset pagination 하기 위함)
+    create_datetime: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_hot_vote_create_datetime_vote_id", text("create_datetime DESC"), "vote_id"), # (create_datetime DESC, vote_id ASC) 순서로 페이지네이션
+    )
+
+
+# 유저별 투표 참여 기록 (유저당 투표 하나에 한 행, 1인 1표 보장 및 "참여한 투표" 리스트 조회용)
+class VoteParticipation(Base):
+    __tablename__ = "vote_participation"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+    user_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("user.id"), nullable=False)
+    vote_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("vote.id"), nullable=False)
+
+    participated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    # Vote.create_datetime 복사본 (vote 테이블을 거치지 않고 keyset pagination 하기 위함)
+    vote_create_datetime: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "vote_id", name="uq_vote_participation_user_id_vote_id"),
+        Index("ix_vote_participation_user_id_vote_create_datetime_vote_id", "user_id", text("vote_create_datetime DESC"), "vote_id"), # 유저별 (vote_create_datetime DESC, vote_id ASC) 순서로 페이지네이션
+    )
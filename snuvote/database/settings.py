@@ -11,10 +11,34 @@ class DatabaseSettings(BaseSettings):
     password: str = ""
     database: str = ""
 
+    # 커넥션 풀 설정 (워커 프로세스당 하나의 풀을 공유)
+    pool_size: int = 10 # 풀에 유지할 커넥션 수 (앱 시작 시 이만큼 미리 연결)
+    max_overflow: int = 20 # pool_size를 넘어 일시적으로 추가 생성할 수 있는 커넥션 수
+    pool_timeout: float = 10 # 풀에서 커넥션을 얻기 위해 기다리는 최대 시간(초)
+    pool_recycle: int = 28000 # MySQL wait_timeout(기본 28800초)보다 먼저 커넥션을 재생성
+
+    # 투표 참여를 반영하는 트랜잭션의 격리 수준 (READ COMMITTED: 동시 참여 시 gap lock으로 인한 데드락 방지)
+    # 다른 트랜잭션은 DB 기본 격리 수준(MySQL: REPEATABLE READ)을 그대로 사용
+    participation_isolation_level: str = "READ COMMITTED"
+
+    # 읽기 전용 replica 설정 (비워두면 primary를 그대로 사용)
+    replica_host: str = ""
+    replica_port: int = 0
+
     @property
     def url(self) -> str:
         return f"mysql+aiomysql://admin:{self.password}@{self.host}:{self.port}/{self.database}"
 
+    @property
+    def has_replica(self) -> bool:
+        return self.replica_host != ""
+
+    @property
+    def replica_url(self) -> str:
+        if not self.has_replica:
+            return self.url
+        return f"mysql+aiomysql://admin:{self.password}@{self.replica_host}:{self.replica_port or self.port}/{self.database}"
+
     model_config = SettingsConfigDict(
         case_sensitive=False,
         env_prefix="DB_",
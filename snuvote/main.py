@@ -1,14 +1,53 @@
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
 from fastapi.exception_handlers import request_validation_exception_handler
 from fastapi.exceptions import RequestValidationError
 
 from snuvote.api import api_router
+from snuvote.app.image.variants import IMAGE_VARIANTS
+from snuvote.app.vote.ballot_buffer import BALLOT_BUFFER
+from snuvote.app.vote.live import TALLY_HUB
 from snuvote.app.user.errors import MissingRequiredFieldError
+from snuvote.app.user.revocation import REFRESH_TOKEN_BLOCKLIST, TOKEN_REVOCATIONS
+from snuvote.app.user.social import SOCIAL_API_CLIENT
+from snuvote.database.connection import DB_MANAGER
+from snuvote.metrics import METRICS_LOGGER
 
 load_dotenv(dotenv_path = '.env.prod')
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 워커 프로세스 시작 시 커넥션 풀 생성 및 워밍업, 종료 시 정리
+    await DB_MANAGER.start()
+    try:
+        # 탈퇴/비밀번호 변경으로 무효화된 토큰 목록 로드 및 주기적 갱신
+        await TOKEN_REVOCATIONS.start()
+        # 블록된 리프레쉬토큰 목록 로드, 주기적 갱신 및 만료된 기록 삭제
+        await REFRESH_TOKEN_BLOCKLIST.start()
+        # 네이버/카카오 API 클라이언트 (keep-alive 연결 재사용)
+        SOCIAL_API_CLIENT.start()
+        # 투표 버퍼 (설정으로 켠 경우에만 동작, 남은 표를 반영해야 하므로 DB보다 먼저 정리)
+        await BALLOT_BUFFER.start()
+        # 워커 지표를 주기적으로 로그로 남김
+        await METRICS_LOGGER.start()
+        try:
+            yield
+        finally:
+            await METRICS_LOGGER.stop()
+            await TALLY_HUB.stop()
+            await BALLOT_BUFFER.stop()
+            await TOKEN_REVOCATIONS.stop()
+            await REFRESH_TOKEN_BLOCKLIST.stop()
+            await SOCIAL_API_CLIENT.stop()
+            await IMAGE_VARIANTS.stop()
+    finally:
+        await DB_MANAGER.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(api_router, prefix="/api")
 
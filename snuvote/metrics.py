@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import sys
+from typing import Callable
+
+from snuvote.settings import METRICS_SETTINGS
+
+
+# uvicorn은 자기 로거에만 handler를 달기 때문에 지표 로그는 직접 stderr로 출력
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+# 등록된 지표를 log_interval_seconds마다 info 로그로 남김 (워커 프로세스마다 하나, snuvote.main의 lifespan에서 start/stop)
+class MetricsLogger:
+    def __init__(self) -> None:
+        self.sources: dict[str, Callable[[], dict]] = {}
+        self.task: asyncio.Task | None = None
+
+    # name: 로그에 표시할 이름, metrics: 현재 지표를 dict로 반환하는 함수
+    def register(self, name: str, metrics: Callable[[], dict]) -> None:
+        self.sources[name] = metrics
+
+    def unregister(self, name: str) -> None:
+        self.sources.pop(name, None)
+
+    def log(self) -> None:
+        for name, metrics in list(self.sources.items()):
+            try:
+                logger.info("%s %s", name, metrics())
+            except Exception:
+                logger.exception("failed to collect %s metrics", name)
+
+    async def start(self) -> None:
+        if METRICS_SETTINGS.log_interval_seconds <= 0 or self.task is not None:
+            return
+        self.task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(METRICS_SETTINGS.log_interval_seconds)
+            self.log()
+
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+        # 종료 직전 값도 남김
+        self.log()
+
+
+METRICS_LOGGER = MetricsLogger()
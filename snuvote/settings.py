@@ -1,6 +1,6 @@
 import os
 
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # TODO 환경 변수로 설정된 환경을 가져옵니다.
 # 가능한 값은 "local", "test", "prod" 이며, 기본값은 "local" 입니다.
@@ -27,3 +27,18 @@ class Settings(BaseSettings):
 
 # TODO SETTINGS 는 런타임에 변경되지 않으므로 미리 초기화해둡니다.
 SETTINGS = Settings()
+
+
+class MetricsSettings(BaseSettings):
+    # 워커별 지표(투표 버퍼, 캐시 등)를 info 로그로 남기는 간격 (0이면 남기지 않음)
+    log_interval_seconds: int = 60
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="METRICS_",
+        env_file=SETTINGS.env_file,
+        extra = 'ignore'
+    )
+
+
+METRICS_SETTINGS = MetricsSettings()
@@ -0,0 +1,118 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List
+
+import pytest
+from sqlalchemy import BigInteger, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import NullPool
+
+from snuvote.database.common import Base
+from snuvote.app.vote.store import VoteStore
+from snuvote.database.connection import DB_MANAGER
+from snuvote.database.models import Choice, User, Vote
+from snuvote.database.settings import DB_SETTINGS
+
+
+# SQLite는 INTEGER PRIMARY KEY만 자동 증가하므로 테스트 DB에서는 BigInteger 컬럼을 INTEGER로 생성
+@compiles(BigInteger, "sqlite")
+def compile_big_integer_for_sqlite(type_, compiler, **kw) -> str:
+    return "INTEGER"
+
+
+# 테스트마다 새 SQLite 파일 DB를 만들어 DB_MANAGER에 연결
+# 테스트는 asyncio.run으로 매번 새 이벤트 루프에서 돌기 때문에 커넥션을 풀에 남기지 않음 (NullPool)
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    # SQLite는 READ COMMITTED를 지원하지 않음 (SQLite 트랜잭션은 항상 serializable)
+    monkeypatch.setattr(DB_SETTINGS, "participation_isolation_level", "SERIALIZABLE")
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'snuvote.db'}",
+        poolclass=NullPool,
+        connect_args={"timeout": 30}, # 동시 쓰기 테스트에서 다른 트랜잭션의 잠금이 풀릴 때까지 대기
+    )
+
+    # pysqlite는 SAVEPOINT 앞에 BEGIN을 보내지 않아, begin_nested가 바깥 트랜잭션이 되어 RELEASE 시점에 commit됨
+    # 드라이버의 트랜잭션 처리를 끄고 트랜잭션 시작 시 직접 BEGIN (IMMEDIATE: 쓰기 잠금을 먼저 잡아 트랜잭션끼리 순서대로 실행)
+    @event.listens_for(engine.sync_engine, "connect")
+    def disable_driver_transaction(dbapi_connection, connection_record) -> None:
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def begin_immediate(connection) -> None:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    async def create_tables() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+
+    DB_MANAGER.engine = engine
+    DB_MANAGER.replica_engine = engine
+    DB_MANAGER.session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    DB_MANAGER.replica_session_factory = DB_MANAGER.session_factory
+
+    yield DB_MANAGER
+
+    asyncio.run(DB_MANAGER.dispose())
+
+
+# 유저를 만들고 id 반환
+@pytest.fixture
+def make_user(database) -> Callable[[str], Awaitable[int]]:
+    async def make(userid: str) -> int:
+        async with database.session_factory() as session:
+            user = User(userid=userid, email=f"{userid}@snu.ac.kr", hashed_password="", name=userid, college=1)
+            session.add(user)
+            await session.commit()
+            return user.id
+
+    return make
+
+
+# 유저 한 명과 그 유저가 만든 진행 중인 투표(선택지 포함)를 만들고 (user_id, vote_id, choice_ids) 반환
+@pytest.fixture
+def make_vote(database, make_user) -> Callable[..., Awaitable[tuple[int, int, List[int]]]]:
+    async def make(userid: str = "writer", choices: tuple[str, ...] = ("a", "b", "c"), multiple_choice: bool = True) -> tuple[int, int, List[int]]:
+        user_id = await make_user(userid)
+        async with database.session_factory() as session:
+            now = datetime.now(timezone.utc)
+            vote = Vote(
+                writer_id=user_id,
+                create_datetime=now,
+                title="title",
+                content="content",
+                end_datetime=now + timedelta(days=1),
+                participation_code_required=False,
+                participation_code=None,
+                realtime_result=True,
+                multiple_choice=multiple_choice,
+                annonymous_choice=False
+            )
+            session.add(vote)
+            await session.flush()
+
+            choice_list = [Choice(vote_id=vote.id, choice_content=content) for content in choices]
+            session.add_all(choice_list)
+            await session.flush()
+
+            result = (user_id, vote.id, [choice.id for choice in choice_list])
+            await session.commit()
+            return result
+
+    return make
+
+
+# 참여 요청처럼 새 세션에서 투표를 조회한 뒤 참여 (투표 버퍼를 거치지 않음)
+@pytest.fixture
+def participate(database) -> Callable[[int, int, List[int]], Awaitable[None]]:
+    async def participate(vote_id: int, user_id: int, choice_ids: List[int]) -> None:
+        async with database.session_factory() as session:
+            vote_store = VoteStore(session=session, read_session=session)
+            vote = await vote_store.get_vote_by_vote_id(vote_id)
+            await vote_store.participate_vote(vote, user_id, choice_ids)
+
+    return participate
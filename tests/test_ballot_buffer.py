@@ -0,0 +1,143 @@
+import asyncio
+import json
+import time
+
+from sqlalchemy import select
+
+from snuvote.app.vote.ballot_buffer import Ballot, BallotBuffer
+from snuvote.app.vote.settings import BALLOT_BUFFER_SETTINGS
+from snuvote.app.vote.store import VoteStore
+from snuvote.database.connection import DB_MANAGER
+from snuvote.database.models import ChoiceParticipation
+
+
+async def participated_choice_ids(user_id: int) -> set[int]:
+    async with DB_MANAGER.session_factory() as session:
+        return set((await session.scalars(
+            select(ChoiceParticipation.choice_id).where(ChoiceParticipation.user_id == user_id)
+        )).all())
+
+
+# 재시작/로그 인수로 늦게 반영되는 표가 그 뒤에 바로 반영된 참여를 덮어쓰지 않아야 함
+def test_stale_ballot_does_not_override_newer_participation(make_vote, make_user, participate):
+    async def run() -> None:
+        _, vote_id, (a, b, c) = await make_vote()
+        user_id = await make_user("voter")
+        buffer = BallotBuffer()
+
+        await participate(vote_id, user_id, [a])
+
+        stale = Ballot(seq=1, vote_id=vote_id, user_id=user_id, choice_ids=[b], submitted_at=time.time() - 60)
+        await buffer.apply([stale])
+        assert await participated_choice_ids(user_id) == {a}
+
+        newer = Ballot(seq=2, vote_id=vote_id, user_id=user_id, choice_ids=[c], submitted_at=time.time() + 60)
+        await buffer.apply([newer])
+        assert await participated_choice_ids(user_id) == {c}
+
+    asyncio.run(run())
+
+
+def test_wal_keeps_submit_time(tmp_path):
+    with open(tmp_path / "ballots-1.wal", "a+", encoding="utf-8") as wal_file:
+        wal_file.write('{"seq": 1, "vote_id": 1, "user_id": 1, "choice_ids": [1]}\n') # 제출 시각이 없던 이전 버전 로그
+        wal_file.write('{"checkpoint": 1}\n')
+        wal_file.write('{"seq": 2, "vote_id": 1, "user_id": 1, "choice_ids": [2], "submitted_at": 1700000000.5}\n')
+
+        ballots, last_seq = BallotBuffer.read_pending(wal_file)
+
+    assert last_seq == 2
+    assert [(ballot.seq, ballot.submitted_at) for ballot in ballots] == [(2, 1700000000.5)]
+    assert ballots[0].participated_at.timestamp() == 1700000000.5
+
+
+# DB 연결 오류가 아닌 오류로 반영하지 못한 표는 이미 응답한 표이므로 버리지 않고 dead-letter 파일로 옮기고,
+# checkpoint는 그 표를 넘어 계속 남김 (로그가 계속 커지거나 재시작마다 다시 실패하지 않도록)
+def test_failed_ballot_moves_to_dead_letter_file(make_vote, make_user, monkeypatch, tmp_path):
+    monkeypatch.setattr(BALLOT_BUFFER_SETTINGS, "enabled", True)
+    monkeypatch.setattr(BALLOT_BUFFER_SETTINGS, "wal_dir", str(tmp_path / "wal"))
+    monkeypatch.setattr(BALLOT_BUFFER_SETTINGS, "flush_interval_ms", 10)
+
+    async def run() -> None:
+        _, vote_id, (a, b, _) = await make_vote()
+        user_ids = [await make_user(f"voter{i}") for i in range(3)]
+        failing_user_id = user_ids[1]
+
+        apply_participation = VoteStore.apply_participation
+
+        async def fail_for_one_user(self, vote, user_id, choice_id_list, participated_at=None):
+            if user_id == failing_user_id:
+                raise ValueError("cannot apply")
+            return await apply_participation(self, vote, user_id, choice_id_list, participated_at)
+
+        monkeypatch.setattr(VoteStore, "apply_participation", fail_for_one_user)
+
+        buffer = BallotBuffer()
+        await buffer.start()
+        for user_id in user_ids:
+            await buffer.submit(vote_id, user_id, [a])
+        await buffer.submit(vote_id, user_ids[2], [b]) # 실패한 표 뒤에 반영된 표
+
+        # 대기 중인 표 수와 투표별 대기 표가 일치 (실패한 표는 dead-letter로 옮겨져 더 이상 대기 중이 아님)
+        while buffer.unflushed:
+            await asyncio.sleep(0.01)
+        assert not buffer.has_pending(vote_id)
+        await buffer.stop()
+
+        metrics = buffer.metrics()
+        assert metrics["failed_count"] == 1
+        assert metrics["queue_depth"] == 0 and metrics["pending_votes"] == 0
+        assert await participated_choice_ids(user_ids[0]) == {a}
+        assert await participated_choice_ids(failing_user_id) == set()
+        assert await participated_choice_ids(user_ids[2]) == {b}
+
+        # 로그에는 반영할 표가 남지 않고, 실패한 표는 오류와 함께 dead-letter 파일에 있음
+        with open(buffer.wal_path, "a+", encoding="utf-8") as wal_file:
+            pending, _ = BallotBuffer.read_pending(wal_file)
+        assert pending == []
+        with open(BallotBuffer.dead_letter_path(), encoding="utf-8") as dead_letter_file:
+            records = [json.loads(line) for line in dead_letter_file]
+        assert [(record["ballot"]["user_id"], record["ballot"]["choice_ids"]) for record in records] == [(failing_user_id, [a])]
+        assert "cannot apply" in records[0]["error"]
+
+        # dead-letter의 표는 나중에 다시 반영할 수 있음
+        monkeypatch.setattr(VoteStore, "apply_participation", apply_participation)
+        await BallotBuffer().apply([Ballot(**records[0]["ballot"])])
+        assert await participated_choice_ids(failing_user_id) == {a}
+
+    asyncio.run(run())
+
+
+# dead-letter 파일에 기록하지 못한 표는 로그에 남기고 (checkpoint를 넘기지 않음) 다음 반영 때 다시 기록
+def test_unwritten_dead_letter_blocks_checkpoint(make_vote, make_user, monkeypatch, tmp_path):
+    monkeypatch.setattr(BALLOT_BUFFER_SETTINGS, "enabled", True)
+    monkeypatch.setattr(BALLOT_BUFFER_SETTINGS, "wal_dir", str(tmp_path / "wal"))
+    monkeypatch.setattr(BALLOT_BUFFER_SETTINGS, "flush_interval_ms", 10)
+
+    async def run() -> None:
+        _, vote_id, (a, _, _) = await make_vote()
+        user_id = await make_user("voter")
+
+        async def always_fail(self, vote, user_id, choice_id_list, participated_at=None):
+            raise ValueError("cannot apply")
+
+        def disk_full(self, dead_letters):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(VoteStore, "apply_participation", always_fail)
+        monkeypatch.setattr(BallotBuffer, "write_dead_letters", disk_full)
+
+        buffer = BallotBuffer()
+        await buffer.start()
+        await buffer.submit(vote_id, user_id, [a])
+        while not buffer.dead_letters:
+            await asyncio.sleep(0.01)
+
+        assert buffer.unflushed == 1 and buffer.has_pending(vote_id)
+        await buffer.stop()
+
+        with open(buffer.wal_path, "a+", encoding="utf-8") as wal_file:
+            pending, _ = BallotBuffer.read_pending(wal_file)
+        assert [ballot.user_id for ballot in pending] == [user_id]
+
+    asyncio.run(run())
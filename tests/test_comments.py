@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from snuvote.app.user.cache import AuthenticatedUser
+from snuvote.app.vote.errors import VoteNotFoundError
+from snuvote.app.vote.service import VoteService
+from snuvote.app.vote.store import VoteStore
+from snuvote.app.vote.views import get_comments_list
+from snuvote.database.connection import DB_MANAGER
+
+
+async def list_comments(vote_id: int, user: AuthenticatedUser):
+    async with DB_MANAGER.session_factory() as session:
+        vote_service = VoteService(VoteStore(session=session, read_session=session))
+        return await get_comments_list(vote_id, user, vote_service)
+
+
+# 없는 투표의 댓글 리스트는 빈 리스트가 아니라 404
+def test_comments_list_of_missing_vote_raises_not_found(make_vote):
+    async def run() -> None:
+        user_id, vote_id, _ = await make_vote()
+        user = AuthenticatedUser(id=user_id, userid="writer", name="writer")
+
+        assert (await list_comments(vote_id, user)).comments_list == []
+        with pytest.raises(VoteNotFoundError):
+            await list_comments(vote_id + 1, user)
+
+    asyncio.run(run())
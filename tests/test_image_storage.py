@@ -0,0 +1,105 @@
+import asyncio
+import io
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import UploadFile
+from PIL import Image
+from sqlalchemy import select
+from starlette.datastructures import Headers
+
+from snuvote.app.image.storage import ImageStorage, LocalImageStorage
+from snuvote.app.image.variants import IMAGE_VARIANTS
+from snuvote.app.vote import service as vote_service_module
+from snuvote.app.vote.service import VoteService
+from snuvote.app.vote.store import VoteStore
+from snuvote.database.connection import DB_MANAGER
+from snuvote.database.models import VoteImage
+
+
+def make_png() -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (8, 8), "red").save(output, format="PNG")
+    return output.getvalue()
+
+
+def make_upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="poster.png", headers=Headers({"content-type": "image/png"}))
+
+
+# 이미지 저장 후 투표 추가에 실패하는 저장소 (다른 요청이 끝날 때까지 기다렸다가 실패)
+class FailingVoteStore:
+    def __init__(self, wait_for: asyncio.Event) -> None:
+        self.wait_for = wait_for
+
+    async def add_vote(self, **kwargs):
+        await self.wait_for.wait()
+        raise RuntimeError("db error")
+
+
+async def add_vote(vote_service: VoteService, writer_id: int, images: list[UploadFile]):
+    now = datetime.now(timezone.utc)
+    return await vote_service.add_vote(
+        writer_id=writer_id,
+        title="title",
+        content="content",
+        participation_code_required=False,
+        participation_code=None,
+        realtime_result=True,
+        multiple_choice=False,
+        annonymous_choice=False,
+        end_datetime=now + timedelta(days=1),
+        choices=["a", "b"],
+        images=images
+    )
+
+
+# 같은 이미지를 먼저 새로 저장한 요청이 투표 추가에 실패해도, 그 파일을 재사용한 다른 투표의 이미지는 남아 있어야 함
+def test_failed_vote_keeps_shared_content_addressed_image(tmp_path, monkeypatch, make_user):
+    storage = LocalImageStorage(str(tmp_path), "/api/images")
+    monkeypatch.setattr(vote_service_module, "IMAGE_STORAGE", storage)
+    data = make_png()
+
+    async def run() -> None:
+        writer_id = await make_user("writer")
+        succeeded = asyncio.Event()
+
+        # 실패할 요청이 먼저 이미지를 새로 저장하고, 다른 요청이 같은 이미지로 투표를 추가할 때까지 기다린 뒤 실패
+        failing = asyncio.create_task(add_vote(VoteService(FailingVoteStore(succeeded)), writer_id, [make_upload(data)]))
+        while not list(tmp_path.iterdir()):
+            await asyncio.sleep(0.01)
+
+        async with DB_MANAGER.session_factory() as session:
+            vote = await add_vote(VoteService(VoteStore(session=session, read_session=session)), writer_id, [make_upload(data)])
+            await session.commit()
+            vote_image = await session.scalar(select(VoteImage).where(VoteImage.vote_id == vote.id))
+        succeeded.set()
+
+        with pytest.raises(RuntimeError):
+            await failing
+
+        for src in (vote_image.src, vote_image.thumbnail_src, vote_image.medium_src):
+            assert (tmp_path / src.rsplit("/", 1)[1]).is_file()
+
+    try:
+        asyncio.run(run())
+    finally:
+        asyncio.run(IMAGE_VARIANTS.stop())
+
+
+# 저장소 구현이 exists/put/delete/url 중 하나라도 빠뜨리면 만들 때 바로 실패
+def test_image_storage_requires_all_backend_methods():
+    class MissingUrl(ImageStorage):
+        def exists(self, key):
+            return False
+
+        def put(self, fileobj, key, content_type):
+            pass
+
+        def delete(self, keys):
+            pass
+
+    with pytest.raises(TypeError):
+        ImageStorage()
+    with pytest.raises(TypeError, match="url"):
+        MissingUrl()
@@ -0,0 +1,78 @@
+import asyncio
+import io
+import logging
+
+from PIL import Image
+
+from snuvote.app.image.settings import IMAGE_VARIANT_SETTINGS
+from snuvote.app.image.storage import LocalImageStorage
+from snuvote.app.image.variants import IMAGE_VARIANTS, make_variants
+
+
+def make_png(width: int, height: int) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), "red").save(output, format="PNG")
+    return output.getvalue()
+
+
+# 축소 이미지는 긴 변이 각 크기 이하가 되도록 비율을 유지해 줄이고, 원본보다 작은 크기는 키우지 않음
+def test_make_variants_bounds_each_size(tmp_path):
+    path = tmp_path / "wide.png"
+    path.write_bytes(make_png(2400, 1200))
+
+    variants = make_variants(str(path), IMAGE_VARIANTS.sizes, IMAGE_VARIANT_SETTINGS.format, IMAGE_VARIANT_SETTINGS.quality)
+
+    assert set(variants) == {"thumbnail", "medium"}
+    with Image.open(io.BytesIO(variants["thumbnail"])) as thumbnail:
+        assert thumbnail.size == (IMAGE_VARIANT_SETTINGS.thumbnail_size, IMAGE_VARIANT_SETTINGS.thumbnail_size // 2)
+    with Image.open(io.BytesIO(variants["medium"])) as medium:
+        assert medium.size == (IMAGE_VARIANT_SETTINGS.medium_size, IMAGE_VARIANT_SETTINGS.medium_size // 2)
+
+    path.write_bytes(make_png(100, 50))
+    variants = make_variants(str(path), IMAGE_VARIANTS.sizes, IMAGE_VARIANT_SETTINGS.format, IMAGE_VARIANT_SETTINGS.quality)
+    for data in variants.values():
+        with Image.open(io.BytesIO(data)) as image:
+            assert image.size == (100, 50)
+
+
+# 이미지가 아닌 파일은 경고만 남기고 축소 이미지 없이 원본만 저장
+def test_non_image_upload_is_saved_without_variants(tmp_path, caplog):
+    storage = LocalImageStorage(str(tmp_path), "/api/images")
+
+    async def run():
+        try:
+            return await storage.save(io.BytesIO(b"not an image"), "png", "image/png")
+        finally:
+            await IMAGE_VARIANTS.stop()
+
+    with caplog.at_level(logging.WARNING, logger="snuvote.app.image.storage"):
+        saved_image = asyncio.run(run())
+
+    assert saved_image.variants == {}
+    assert [path.name for path in tmp_path.iterdir()] == [saved_image.key]
+    assert any("failed to generate image variants" in record.message for record in caplog.records)
+
+
+# 로컬 경로가 없는 저장소(S3 등)는 원본을 임시 파일로 옮겨 워커에 경로를 넘기고, 끝나면 임시 파일을 지움
+def test_remote_storage_generates_variants_from_temp_file(tmp_path, monkeypatch):
+    class RemoteStorage(LocalImageStorage):
+        def local_path(self, key):
+            return None
+
+    temp_dir = tmp_path / "tmp"
+    temp_dir.mkdir()
+    monkeypatch.setattr("tempfile.tempdir", str(temp_dir))
+    storage = RemoteStorage(str(tmp_path / "images"), "/api/images")
+
+    async def run():
+        try:
+            return await storage.save(io.BytesIO(make_png(400, 200)), "png", "image/png")
+        finally:
+            await IMAGE_VARIANTS.stop()
+
+    saved_image = asyncio.run(run())
+
+    assert set(saved_image.variants) == {"thumbnail", "medium"}
+    for key in saved_image.variants.values():
+        assert (tmp_path / "images" / key).is_file()
+    assert list(temp_dir.iterdir()) == []
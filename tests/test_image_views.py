@@ -0,0 +1,32 @@
+import asyncio
+import hashlib
+
+import pytest
+
+from snuvote.app.image.cache import IMAGE_CACHE
+from snuvote.app.image.errors import ImageNotFoundError
+from snuvote.app.image.settings import IMAGE_STORAGE_SETTINGS
+from snuvote.app.image.views import get_image
+
+
+# 메모리 캐시/ETag로 응답하던 이미지도 파일이 지워지면 404
+def test_deleted_content_hashed_image_is_not_served(tmp_path, monkeypatch):
+    monkeypatch.setattr(IMAGE_STORAGE_SETTINGS, "local_dir", str(tmp_path))
+    content = b"image"
+    image_name = f"{hashlib.sha256(content).hexdigest()}.png"
+    etag = f'"{image_name.rsplit(".", 1)[0]}"'
+    (tmp_path / image_name).write_bytes(content)
+
+    async def run() -> None:
+        IMAGE_CACHE.clear()
+        assert (await get_image(image_name)).body == content
+        assert (await get_image(image_name, if_none_match=etag)).status_code == 304
+        assert IMAGE_CACHE.get(image_name) is not None
+
+        (tmp_path / image_name).unlink()
+        with pytest.raises(ImageNotFoundError):
+            await get_image(image_name)
+        with pytest.raises(ImageNotFoundError):
+            await get_image(image_name, if_none_match=etag)
+
+    asyncio.run(run())
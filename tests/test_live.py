@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from snuvote.app.vote.errors import TooManySubscribersError
+from snuvote.app.vote.live import TallyHub, TallySubscriber
+from snuvote.app.vote.settings import LIVE_TALLY_SETTINGS
+
+
+# 보내지 못한 delta는 하나로 합쳐지고 값은 마지막 값(절대값)
+def test_subscriber_merges_pending_deltas():
+    async def run() -> None:
+        subscriber = TallySubscriber(vote_id=1)
+        subscriber.push({"participant_count": 1, "choices": {10: 1}})
+        subscriber.push({"choices": {11: 1}})
+        subscriber.push({"participant_count": 2, "choices": {10: 2}})
+
+        assert await subscriber.next(timeout=1) == {"participant_count": 2, "choices": {10: 2, 11: 1}}
+        assert await subscriber.next(timeout=0.01) is None
+
+    asyncio.run(run())
+
+
+# interval_ms 안에 여러 번 publish되어도 집계는 한 번만 읽고 구독자에게는 delta 하나만 감
+def test_publishes_are_coalesced(make_vote, make_user, monkeypatch, participate):
+    monkeypatch.setattr(LIVE_TALLY_SETTINGS, "interval_ms", 200)
+    monkeypatch.setattr(LIVE_TALLY_SETTINGS, "poll_interval_ms", 60_000)
+
+    async def run() -> None:
+        _, vote_id, (a, b, _) = await make_vote()
+        user_ids = [await make_user(f"voter{i}") for i in range(3)]
+
+        hub = TallyHub()
+        load_count = 0
+        load_tallies = hub.load_tallies
+
+        async def counting_load_tallies(vote_ids):
+            nonlocal load_count
+            load_count += 1
+            return await load_tallies(vote_ids)
+
+        hub.load_tallies = counting_load_tallies
+
+        subscriber, tally = await hub.subscribe(vote_id)
+        assert tally.participant_count == 0
+        assert load_count == 1
+
+        for user_id, choice_ids in zip(user_ids, [[a], [a, b], [b]]):
+            await participate(vote_id, user_id, choice_ids)
+        for _ in range(5):
+            hub.publish(vote_id)
+
+        delta = await subscriber.next(timeout=2)
+        assert delta == {"participant_count": 3, "choices": {a: 2, b: 2}}
+        assert load_count == 2
+
+        # 다음 publish 전까지는 다시 읽지 않음
+        assert await subscriber.next(timeout=0.5) is None
+        assert load_count == 2
+
+        await hub.stop()
+
+    asyncio.run(run())
+
+
+def test_subscribe_over_limit_is_rejected(make_vote, monkeypatch):
+    monkeypatch.setattr(LIVE_TALLY_SETTINGS, "max_subscribers", 2)
+
+    async def run() -> None:
+        _, vote_id, _ = await make_vote()
+        hub = TallyHub()
+
+        first, _ = await hub.subscribe(vote_id)
+        await hub.subscribe(vote_id)
+        with pytest.raises(TooManySubscribersError):
+            await hub.subscribe(vote_id)
+        assert hub.subscriber_count == 2
+
+        # 구독을 끊으면 다시 받을 수 있음
+        hub.unsubscribe(first)
+        await hub.subscribe(vote_id)
+        assert hub.subscriber_count == 2
+
+        await hub.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from snuvote.app.vote.store import VoteStore
+from snuvote.database.connection import DB_MANAGER
+from snuvote.database.models import Choice, ChoiceParticipation, Vote, VoteParticipation
+from snuvote.database.settings import DB_SETTINGS
+
+
+# 동시 제출 처리량 하한 (초당 제출 수)
+# SQLite는 쓰기 트랜잭션을 하나씩만 실행하고 나머지는 busy timeout으로 재시도하며 기다리므로 MySQL 처리량과는 무관함
+# (1 CPU에서 동시 제출 약 11건/s, 같은 제출을 차례로 하면 약 78건/s)
+MIN_CONCURRENT_SUBMISSIONS_PER_SECOND = 3
+
+
+# 같은 유저가 여러 선택으로 동시에 제출해도 마지막으로 반영된 한 표만 남고, 참여자 수 카운터가 실제 참여 기록과 같아야 함 (처리량 하한 포함)
+def test_concurrent_submissions_keep_one_ballot_per_user(make_vote, make_user, participate):
+    async def run() -> None:
+        _, vote_id, (a, b, c) = await make_vote()
+        user_ids = [await make_user(f"voter{i}") for i in range(10)]
+        choice_sets = [[a], [b], [a, b], [b, c], [a, b, c]]
+
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            participate(vote_id, user_id, choice_ids)
+            for choice_ids in choice_sets
+            for user_id in user_ids
+        ))
+        throughput = len(choice_sets) * len(user_ids) / (time.perf_counter() - started)
+
+        async with DB_MANAGER.session_factory() as session:
+            rows = (await session.execute(
+                select(ChoiceParticipation.user_id, ChoiceParticipation.choice_id)
+            )).all()
+            participations = (await session.scalars(
+                select(VoteParticipation.user_id).where(VoteParticipation.vote_id == vote_id)
+            )).all()
+            participant_count = await session.scalar(select(Vote.participant_count).where(Vote.id == vote_id))
+            num_participants = dict((await session.execute(select(Choice.id, Choice.num_participants))).all())
+
+        for user_id in user_ids:
+            choice_ids = sorted(choice_id for row_user_id, choice_id in rows if row_user_id == user_id)
+            assert choice_ids in [sorted(choice_set) for choice_set in choice_sets]
+
+        assert sorted(participations) == sorted(user_ids)
+        assert participant_count == len(user_ids)
+        for choice_id in (a, b, c):
+            assert num_participants[choice_id] == sum(1 for _, row_choice_id in rows if row_choice_id == choice_id)
+
+        # 잠금 대기가 timeout까지 가거나 데드락으로 재시도하면 처리량이 바닥으로 떨어짐
+        assert throughput >= MIN_CONCURRENT_SUBMISSIONS_PER_SECOND, f"{throughput:.1f} submissions/s"
+
+    asyncio.run(run())
+
+
+# 선택을 모두 취소했다가 다시 참여해도 참여자 수가 한 번만 세어짐
+def test_cancel_and_participate_again(make_vote, make_user, participate):
+    async def run() -> None:
+        _, vote_id, (a, b, _) = await make_vote()
+        user_id = await make_user("voter")
+
+        await participate(vote_id, user_id, [a])
+        await participate(vote_id, user_id, [])
+        await participate(vote_id, user_id, [a, b])
+
+        async with DB_MANAGER.session_factory() as session:
+            assert await session.scalar(select(Vote.participant_count).where(Vote.id == vote_id)) == 1
+            assert await session.scalar(select(func.count()).select_from(VoteParticipation)) == 1
+            assert set((await session.scalars(select(ChoiceParticipation.choice_id))).all()) == {a, b}
+
+    asyncio.run(run())
+
+
+def test_unique_constraint_rejects_duplicate_choice_participation(make_vote, make_user):
+    async def run() -> None:
+        _, _, (a, _, _) = await make_vote()
+        user_id = await make_user("voter")
+
+        async with DB_MANAGER.session_factory() as session:
+            await session.execute(insert(ChoiceParticipation).values(user_id=user_id, choice_id=a))
+            with pytest.raises(IntegrityError):
+                await session.execute(insert(ChoiceParticipation).values(user_id=user_id, choice_id=a))
+
+    asyncio.run(run())
+
+
+# 참여를 반영하는 트랜잭션만 participation_isolation_level로 실행하고, 같은 요청의 투표/상세 조회는 기본 격리 수준을 유지
+def test_only_participation_transaction_changes_isolation_level(make_vote, make_user, monkeypatch):
+    monkeypatch.setattr(DB_SETTINGS, "participation_isolation_level", "READ UNCOMMITTED") # SQLite에서 기본값과 구분되는 격리 수준
+
+    async def run() -> None:
+        _, vote_id, (a, _, _) = await make_vote()
+        user_id = await make_user("voter")
+
+        statements: list[tuple[str, str | None]] = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+            statements.append((statement.split()[0].upper(), conn.get_execution_options().get("isolation_level")))
+
+        event.listen(DB_MANAGER.engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            # 참여 요청처럼 한 세션에서 투표 조회 -> 참여 -> 상세 조회
+            async with DB_MANAGER.session_factory() as session:
+                vote_store = VoteStore(session=session, read_session=session)
+                vote = await vote_store.get_vote_by_vote_id(vote_id)
+                before = len(statements)
+                await vote_store.participate_vote(vote, user_id, [a])
+                after = len(statements)
+                await vote_store.get_vote_detail_by_vote_id(vote_id)
+        finally:
+            event.remove(DB_MANAGER.engine.sync_engine, "before_cursor_execute", capture)
+
+        assert {level for _, level in statements[:before]} == {None}
+        assert {level for _, level in statements[before:after]} == {"READ UNCOMMITTED"}
+        assert "INSERT" in {kind for kind, _ in statements[before:after]}
+        assert {level for _, level in statements[after:]} == {None}
+
+    asyncio.run(run())
@@ -0,0 +1,116 @@
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import event
+
+from snuvote.app.vote.store import HOT_VOTE_MIN_PARTICIPANTS, VoteStore
+from snuvote.database.connection import DB_MANAGER
+
+
+# 인덱스 없이 테이블 전체를 훑는 단계인지 (SQLite: "SCAN <table>", MySQL: type=ALL)
+# 인덱스 순서로 훑는 "SCAN <table> USING (COVERING) INDEX ..."나 서브쿼리 결과를 훑는 "SCAN (subquery-1)" 등은 제외
+def scans_table(row) -> bool:
+    plan = row._mapping
+    if "select_type" in plan: # MySQL
+        return plan["type"] == "ALL"
+    match = re.match(r"SCAN (\S+)", plan["detail"]) # SQLite
+    return match is not None and not match.group(1).startswith("(") and match.group(1) != "CONSTANT" and " USING " not in plan["detail"]
+
+
+# 바깥 쿼리의 정렬을 인덱스가 아니라 별도 정렬 단계에서 처리했는지
+# 썸네일처럼 행마다 실행되는 상관 서브쿼리의 정렬은 투표 하나의 이미지 몇 개만 정렬하므로 제외
+def sorts_outside_index(row) -> bool:
+    plan = row._mapping
+    if "select_type" in plan: # MySQL
+        return plan["select_type"] in ("SIMPLE", "PRIMARY") and "Using filesort" in (plan["Extra"] or "")
+    return plan["parent"] == 0 and plan["detail"].startswith("USE TEMP B-TREE FOR") and "ORDER BY" in plan["detail"] # SQLite
+
+
+# VoteStore의 모든 조회/갱신 쿼리 (전체를 다시 계산하는 복구용 recount_participants 제외)
+def store_queries(store: VoteStore, user_id: int, vote_id: int, choice_ids: list[int], comment_id: int) -> dict[str, Callable[[], Awaitable[Any]]]:
+    cursor = (datetime.now(timezone.utc), 1)
+
+    async def participate(choice_id_list: list[int]) -> None:
+        vote = await store.get_vote_by_vote_id(vote_id)
+        await store.apply_participation(vote, user_id, choice_id_list)
+        await store.session.rollback()
+
+    return {
+        "진행 중인 투표 리스트": lambda: store.get_ongoing_list(user_id, None),
+        "진행 중인 투표 리스트 (커서)": lambda: store.get_ongoing_list(None, cursor),
+        "완료된 투표 리스트": lambda: store.get_ended_votes_list(user_id, None),
+        "완료된 투표 리스트 (커서)": lambda: store.get_ended_votes_list(None, cursor),
+        "HOT 투표 리스트": lambda: store.get_hot_votes_list(user_id, None),
+        "HOT 투표 리스트 (커서)": lambda: store.get_hot_votes_list(None, cursor),
+        "내가 만든 투표 리스트": lambda: store.get_my_votes_list(user_id, None),
+        "내가 만든 투표 리스트 (커서)": lambda: store.get_my_votes_list(user_id, cursor),
+        "내가 참여한 투표 리스트": lambda: store.get_participated_votes_list(user_id, None),
+        "내가 참여한 투표 리스트 (커서)": lambda: store.get_participated_votes_list(user_id, cursor),
+        "리스트 참여 여부": lambda: store.get_participated_vote_ids(user_id, [vote_id]),
+        "투표 조회": lambda: store.get_vote_by_vote_id(vote_id),
+        "투표 상세": lambda: store.get_vote_detail_by_vote_id(vote_id),
+        "선택한 선택지": lambda: store.get_participated_choice_ids(vote_id, user_id),
+        "실시간 집계": lambda: store.get_tallies([vote_id]),
+        "선택지 참여자 리스트": lambda: store.get_choice_participants_list(choice_ids[0], None),
+        "선택지 참여자 리스트 (커서)": lambda: store.get_choice_participants_list(choice_ids[0], 1),
+        "댓글 리스트": lambda: store.get_comments_list(vote_id, None),
+        "댓글 리스트 (커서)": lambda: store.get_comments_list(vote_id, cursor),
+        "댓글 수": lambda: store.get_comment_count(vote_id),
+        "댓글 조회": lambda: store.get_comment_by_comment_id(comment_id),
+        "투표 참여 (선택 변경)": lambda: participate(choice_ids[1:]),
+        "투표 참여 취소": lambda: participate([]),
+    }
+
+
+# 투표/선택지/참여/댓글/이미지가 여럿 있는 DB에서 VoteStore의 쿼리가 모두 인덱스를 타는지 확인 (EXPLAIN)
+def test_vote_store_queries_use_indexes(make_vote, make_user):
+    async def run() -> None:
+        votes = [await make_vote(f"writer{i}") for i in range(5)]
+        user_ids = [await make_user(f"voter{i}") for i in range(HOT_VOTE_MIN_PARTICIPANTS + 1)]
+        _, vote_id, choice_ids = votes[0]
+
+        async with DB_MANAGER.session_factory() as session:
+            store = VoteStore(session, session)
+            for _, other_vote_id, other_choice_ids in votes:
+                vote = await store.get_vote_by_vote_id(other_vote_id)
+                for user_id in user_ids:
+                    await store.apply_participation(vote, user_id, other_choice_ids[:2])
+                await store.add_vote_images(other_vote_id, [("a.png", "a-thumb.png", "a-medium.png"), ("b.png", None, None)])
+                await session.commit()
+                for user_id in user_ids:
+                    comment = await store.create_comment(other_vote_id, user_id, "comment")
+            comment_id = comment.id
+
+        engine = DB_MANAGER.engine
+        explain_prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+        statements: list[tuple[str, Any]] = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+            if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+                statements.append((statement, parameters))
+
+        problems: list[str] = []
+        async with DB_MANAGER.session_factory() as session:
+            store = VoteStore(session, session)
+            for name, query in store_queries(store, user_ids[0], vote_id, choice_ids, comment_id).items():
+                statements.clear()
+                event.listen(engine.sync_engine, "before_cursor_execute", capture)
+                try:
+                    await query()
+                finally:
+                    event.remove(engine.sync_engine, "before_cursor_execute", capture)
+                assert statements, name
+
+                # 쿼리가 끝난 뒤에 캡처한 문장마다 EXPLAIN
+                connection = await session.connection()
+                for statement, parameters in statements:
+                    for row in (await connection.exec_driver_sql(explain_prefix + statement, parameters)).all():
+                        if scans_table(row) or sorts_outside_index(row):
+                            problems.append(f"{name}: {tuple(row)}\n  {statement}")
+                await session.rollback()
+
+        assert not problems, "\n".join(problems)
+
+    asyncio.run(run())
@@ -0,0 +1,96 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from snuvote.app.user.cache import AuthenticatedUser
+from snuvote.app.user.store import UserStore
+from snuvote.app.vote import views
+from snuvote.app.vote.cache import VOTE_DETAIL_CACHE, VOTE_LIST_CACHE
+from snuvote.app.vote.errors import VoteNotFoundError
+from snuvote.app.vote.service import VoteService
+from snuvote.app.vote.store import VoteStore
+from snuvote.database.common import Base
+from snuvote.database.connection import DB_MANAGER
+
+
+# primary와 다른 SQLite 파일을 replica로 연결 (복제하지 않으므로 primary에 쓴 내용이 replica에는 없음 = 복제 지연)
+# 엔진마다 실행된 SQL을 기록
+@pytest.fixture
+def replica(database, tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}", poolclass=NullPool)
+
+    async def create_tables() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+
+    DB_MANAGER.replica_engine = engine
+    DB_MANAGER.replica_session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    statements: dict[str, list[str]] = {"primary": [], "replica": []}
+    for name, target in (("primary", DB_MANAGER.engine), ("replica", engine)):
+        event.listen(target.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args, name=name: statements[name].append(statement))
+
+    VOTE_DETAIL_CACHE.clear()
+    VOTE_LIST_CACHE.clear()
+    yield statements
+    VOTE_DETAIL_CACHE.clear()
+    VOTE_LIST_CACHE.clear()
+
+
+# get_db_session / get_read_db_session처럼 primary, replica 세션을 하나씩 열어 저장소에 주입
+@asynccontextmanager
+async def stores():
+    async with DB_MANAGER.session_factory() as session, DB_MANAGER.replica_session_factory() as read_session:
+        yield UserStore(session=session, read_session=read_session), VoteStore(session=session, read_session=read_session)
+        await session.commit()
+
+
+# read_only=True 조회와 리스트 조회는 replica에서, 나머지 조회는 primary에서 실행
+def test_read_only_queries_hit_replica(make_vote, replica):
+    async def run() -> None:
+        user_id, vote_id, _ = await make_vote()
+        replica["primary"].clear()
+
+        async with stores() as (user_store, vote_store):
+            assert await user_store.get_user_by_userid("writer", read_only=True) is None
+            assert await vote_store.get_vote_by_vote_id(vote_id, read_only=True) is None
+            assert await vote_store.get_comments_list(vote_id, None, read_only=True) == ([], False, None)
+            assert (await vote_store.get_ongoing_list(user_id, None))[0] == []
+            assert replica["replica"] and not replica["primary"]
+
+            replica["replica"].clear()
+            assert (await user_store.get_user_by_userid("writer")).id == user_id
+            assert (await vote_store.get_vote_by_vote_id(vote_id)).id == vote_id
+            assert replica["primary"] and not replica["replica"]
+
+    asyncio.run(run())
+
+
+# 단순 조회(GET /votes/{vote_id})는 replica에서 읽고, 쓰기와 쓰기 직후 다시 읽는 응답은 primary에서 읽음
+def test_write_and_following_read_stay_on_primary(make_vote, replica):
+    async def run() -> None:
+        user_id, vote_id, _ = await make_vote()
+        user = AuthenticatedUser(id=user_id, userid="writer", name="writer")
+
+        async with stores() as (_, vote_store):
+            with pytest.raises(VoteNotFoundError):
+                await views.get_vote(vote_id, user, VoteService(vote_store))
+            assert replica["replica"]
+
+        replica["primary"].clear()
+        replica["replica"].clear()
+        async with stores() as (_, vote_store):
+            detail = await views.close_vote(vote_id, user, VoteService(vote_store))
+
+        assert detail.vote_id == vote_id and detail.is_writer
+        assert any(statement.lstrip().upper().startswith("UPDATE") for statement in replica["primary"])
+        assert not replica["replica"]
+
+    asyncio.run(run())
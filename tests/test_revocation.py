@@ -0,0 +1,127 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, select, update
+
+from snuvote.app.user.revocation import RefreshTokenBlocklist, TokenRevocations
+from snuvote.app.user.settings import AUTH_SETTINGS
+from snuvote.app.user.store import UserStore
+from snuvote.database.connection import DB_MANAGER
+from snuvote.database.models import BlockedRefreshToken, User
+
+
+# 다른 워커에서 비밀번호를 바꾼 것처럼 DB의 token_version만 올림
+async def reset_password(userid: str) -> None:
+    async with DB_MANAGER.session_factory() as session:
+        await UserStore(session=session, read_session=session).reset_password(userid, "")
+        await session.commit()
+
+
+# 액세스 토큰 유효 시간보다 전에 버전이 올라간 것처럼 기록 (이전 버전의 액세스 토큰은 모두 만료됨)
+EXPIRED = timedelta(minutes=AUTH_SETTINGS.access_token_expire_minutes + 5)
+
+
+async def expire_bump(userid: str) -> None:
+    async with DB_MANAGER.session_factory() as session:
+        await session.execute(
+            update(User).where(User.userid == userid).values(token_version_changed_at=datetime.now(timezone.utc) - EXPIRED)
+        )
+        await session.commit()
+
+
+# 다른 워커에서 리프레쉬토큰을 블록한 것처럼 DB에만 기록
+async def block_refresh_token(token_id: str, expires_at: datetime) -> None:
+    async with DB_MANAGER.session_factory() as session:
+        await UserStore(session=session, read_session=session).block_refresh_token(token_id, expires_at)
+        await session.commit()
+
+
+# 갱신 때 실행된 SELECT와 그 실행 계획
+async def refresh_with_plan(revocations: TokenRevocations | RefreshTokenBlocklist) -> list[str]:
+    statements: list[tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append((statement, parameters))
+
+    event.listen(DB_MANAGER.engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        await revocations.refresh()
+    finally:
+        event.remove(DB_MANAGER.engine.sync_engine, "before_cursor_execute", capture)
+
+    async with DB_MANAGER.engine.connect() as connection:
+        return [
+            row.detail
+            for statement, parameters in statements
+            for row in (await connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)).all()
+        ]
+
+
+# 액세스 토큰 유효 시간 안에 버전이 올라간 유저만 인덱스로 읽고, 이후 갱신에서는 새로 올라간 버전을 더해 읽음
+def test_token_revocations_load_recent_bumps_incrementally(make_user):
+    async def run() -> None:
+        for userid in ("recent", "old", "later"):
+            await make_user(userid)
+        await reset_password("recent")
+        await reset_password("old")
+
+        await expire_bump("old")
+        async with DB_MANAGER.session_factory() as session:
+            user_ids = dict((await session.execute(select(User.userid, User.id))).all())
+
+        revocations = TokenRevocations()
+        plan = await refresh_with_plan(revocations)
+        assert any("USING INDEX ix_user_token_version_changed_at" in detail for detail in plan), plan
+        assert not any(detail.startswith("SCAN user") for detail in plan), plan
+
+        assert revocations.is_revoked(user_ids["recent"], 0)
+        assert not revocations.is_revoked(user_ids["recent"], 1)
+        assert user_ids["old"] not in revocations.versions
+
+        # 다음 갱신에서 그 사이 올라간 버전을 반영
+        await reset_password("later")
+        await revocations.refresh()
+        assert revocations.is_revoked(user_ids["later"], 0)
+        assert revocations.is_revoked(user_ids["recent"], 0)
+
+        # 유효 시간이 지나면 목록에서 빠짐
+        await expire_bump("recent")
+        revocations.changed_at[user_ids["recent"]] -= EXPIRED
+        await revocations.refresh()
+        assert user_ids["recent"] not in revocations.versions
+        assert revocations.is_revoked(user_ids["later"], 0)
+
+    asyncio.run(run())
+
+
+# 처음에는 만료되지 않은 블록 기록을 모두 읽고, 이후에는 마지막 갱신 이후에 블록된 토큰만 인덱스로 읽음
+def test_refresh_token_blocklist_loads_new_blocks_incrementally(database):
+    async def run() -> None:
+        now = datetime.now()
+        await block_refresh_token("first", now + timedelta(days=7))
+        await block_refresh_token("expired", now - timedelta(seconds=1))
+
+        blocklist = RefreshTokenBlocklist()
+        await blocklist.refresh()
+        assert blocklist.is_blocked("first")
+        assert not blocklist.is_blocked("expired")
+
+        # 오래전에 블록된 기록은 다시 읽지 않음 (처음 읽은 뒤 메모리에만 남음)
+        async with DB_MANAGER.session_factory() as session:
+            await session.execute(update(BlockedRefreshToken).values(blocked_at=now - timedelta(days=1)))
+            await session.commit()
+        blocklist.tokens.pop("first")
+
+        await block_refresh_token("second", now + timedelta(days=7))
+        plan = await refresh_with_plan(blocklist)
+        assert any("USING INDEX ix_blocked_refresh_token_blocked_at" in detail for detail in plan), plan
+        assert blocklist.is_blocked("second")
+        assert not blocklist.is_blocked("first")
+
+        # 메모리의 만료된 토큰은 갱신 때 버림
+        blocklist.add("soon", datetime.now() - timedelta(seconds=1))
+        await blocklist.refresh()
+        assert not blocklist.is_blocked("soon")
+        assert blocklist.is_blocked("second")
+
+    asyncio.run(run())
@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from snuvote.app.user.errors import NaverApiUnavailableError
+from snuvote.app.user.social import SocialApiClient
+
+URL = "https://openapi.naver.com/v1/nid/me"
+
+
+def make_client(handler) -> SocialApiClient:
+    client = SocialApiClient()
+    client.start(transport=httpx.MockTransport(handler))
+    return client
+
+
+# reset_seconds가 지나 시험 호출 하나를 허용하는 상태로 만들기
+def make_half_open(client: SocialApiClient, provider: str) -> None:
+    breaker = client.get_breaker(provider)
+    breaker.failures = breaker.failure_threshold
+    breaker.opened_at = time.monotonic() - breaker.reset_seconds - 1
+    assert breaker.state == "half-open"
+
+
+def test_transport_errors_open_breaker():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    async def run() -> None:
+        client = make_client(handler)
+        breaker = client.get_breaker("naver")
+        for _ in range(breaker.failure_threshold):
+            with pytest.raises(NaverApiUnavailableError):
+                await client.get("naver", URL, {}, NaverApiUnavailableError)
+        assert breaker.state == "open"
+        await client.stop()
+
+    asyncio.run(run())
+
+
+def test_cancelled_trial_releases_half_open_slot():
+    started = asyncio.Event()
+    block = True
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if block:
+            started.set()
+            await asyncio.Event().wait() # 응답하지 않는 provider
+        return httpx.Response(200, json={"response": {"id": "naver-id"}})
+
+    async def run() -> None:
+        nonlocal block
+        client = make_client(handler)
+        make_half_open(client, "naver")
+        breaker = client.get_breaker("naver")
+
+        trial = asyncio.create_task(client.get("naver", URL, {}, NaverApiUnavailableError))
+        await started.wait()
+        assert breaker.trial_in_flight
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        # 취소는 실패로 세지 않고 슬롯만 반납하므로 다음 요청이 시험 호출을 할 수 있음
+        assert not breaker.trial_in_flight
+        assert breaker.state == "half-open"
+
+        block = False
+        response = await client.get("naver", URL, {}, NaverApiUnavailableError)
+        assert response.status_code == 200
+        assert breaker.state == "closed"
+        await client.stop()
+
+    asyncio.run(run())
+
+
+def test_unexpected_error_in_trial_reopens_breaker():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise RuntimeError("unexpected")
+
+    async def run() -> None:
+        client = make_client(handler)
+        make_half_open(client, "naver")
+        breaker = client.get_breaker("naver")
+
+        with pytest.raises(RuntimeError):
+            await client.get("naver", URL, {}, NaverApiUnavailableError)
+
+        assert not breaker.trial_in_flight
+        assert breaker.state == "open"
+        await client.stop()
+
+    asyncio.run(run())
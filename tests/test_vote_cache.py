@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from snuvote.app.vote.ballot_buffer import BALLOT_BUFFER
+from snuvote.app.vote.cache import FINALIZED_PARTICIPANTS_CACHE, VOTE_DETAIL_CACHE, VOTE_LIST_CACHE, bump_vote_version, invalidate_finalized_vote
+from snuvote.app.vote.service import VoteService
+from snuvote.app.vote.settings import VOTE_CACHE_SETTINGS
+from snuvote.app.vote.store import VoteStore
+from snuvote.database.connection import DB_MANAGER
+from snuvote.database.models import Vote
+from snuvote.metrics import METRICS_LOGGER
+
+
+async def get_vote_detail(vote_id: int, read_only: bool):
+    async with DB_MANAGER.session_factory() as session:
+        vote_service = VoteService(VoteStore(session=session, read_session=session))
+        return await vote_service.get_vote_detail(vote_id, read_only=read_only)
+
+
+# replica에서 읽어 캐싱한 상세 정보는 primary에서 읽어야 하는 요청(쓰기 직후 다시 읽기)에 쓰이면 안 됨
+def test_replica_detail_is_not_served_to_primary_reads(make_vote):
+    async def run() -> None:
+        _, vote_id, _ = await make_vote()
+        VOTE_DETAIL_CACHE.clear()
+
+        replica_detail = await get_vote_detail(vote_id, read_only=True)
+        # replica가 늦어 오래된 값이 캐싱된 상황
+        stale = replica_detail.model_copy(update={"title": "stale"})
+        VOTE_DETAIL_CACHE.put((vote_id, True), stale)
+
+        assert (await get_vote_detail(vote_id, read_only=True)).title == "stale"
+        assert (await get_vote_detail(vote_id, read_only=False)).title == "title"
+
+        # 쓰기가 있으면 두 캐시 모두 버려짐
+        bump_vote_version(vote_id)
+        assert (await get_vote_detail(vote_id, read_only=True)).title == "title"
+
+    asyncio.run(run())
+
+
+# 종료 직후에는 (primary에서 읽었더라도) 유예 시간이 지나고 이 워커 버퍼의 표가 모두 반영되어야 결과를 캐싱
+def test_finalized_waits_for_grace_and_buffered_ballots(monkeypatch):
+    vote_service = VoteService(vote_store=None)
+    grace = VOTE_CACHE_SETTINGS.finalize_grace_seconds
+    now = datetime.now(timezone.utc)
+
+    assert not vote_service.is_finalized(1, now - timedelta(seconds=grace - 1))
+    assert vote_service.is_finalized(1, now - timedelta(seconds=grace + 1))
+
+    monkeypatch.setattr(BALLOT_BUFFER, "pending_by_vote", Counter({1: 1}))
+    assert not vote_service.is_finalized(1, now - timedelta(seconds=grace + 1))
+    assert vote_service.is_finalized(2, now - timedelta(seconds=grace + 1))
+
+
+# 종료된 투표의 참여자 페이지는 (vote_id, choice_id, start_cursor_id)마다 한 항목 -> 임의의 cursor로 요청해도 maxsize를 넘지 않음
+def test_finalized_participants_cache_is_bounded_per_page(make_vote, monkeypatch):
+    async def run() -> None:
+        _, vote_id, (a, _, _) = await make_vote()
+        async with DB_MANAGER.session_factory() as session:
+            ended = datetime.now(timezone.utc) - timedelta(seconds=VOTE_CACHE_SETTINGS.finalize_grace_seconds + 10)
+            await session.execute(update(Vote).where(Vote.id == vote_id).values(end_datetime=ended))
+            await session.commit()
+
+        FINALIZED_PARTICIPANTS_CACHE.clear()
+        monkeypatch.setattr(FINALIZED_PARTICIPANTS_CACHE, "maxsize", 3)
+        async with DB_MANAGER.session_factory() as session:
+            vote_service = VoteService(VoteStore(session=session, read_session=session))
+            for start_cursor_id in [None, *range(1, 20)]:
+                await vote_service.get_choice_participants_list(vote_id, a, start_cursor_id)
+
+        assert len(FINALIZED_PARTICIPANTS_CACHE) == 3
+        invalidate_finalized_vote(vote_id)
+        assert len(FINALIZED_PARTICIPANTS_CACHE) == 0
+
+    asyncio.run(run())
+
+
+# 상세/리스트 캐시의 적중률 등은 METRICS_LOGGER가 주기적으로 info 로그로 남김
+def test_cache_metrics_are_logged(make_vote):
+    records: list[logging.LogRecord] = []
+
+    class Collect(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            records.append(record)
+
+    async def run() -> None:
+        _, vote_id, _ = await make_vote()
+        VOTE_DETAIL_CACHE.clear()
+        await get_vote_detail(vote_id, read_only=True)
+        await get_vote_detail(vote_id, read_only=True)
+
+    asyncio.run(run())
+
+    logger = logging.getLogger("snuvote.metrics")
+    handler = Collect()
+    logger.addHandler(handler)
+    try:
+        METRICS_LOGGER.log()
+    finally:
+        logger.removeHandler(handler)
+
+    logged = {record.args[0]: record.args[1] for record in records if record.levelno == logging.INFO}
+    assert logged["vote_detail_cache"] == VOTE_DETAIL_CACHE.metrics()
+    assert logged["vote_detail_cache"]["hits"] >= 1
+    assert logged["vote_list_cache"] == VOTE_LIST_CACHE.metrics()
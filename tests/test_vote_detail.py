@@ -0,0 +1,47 @@
+import asyncio
+
+from sqlalchemy import event
+
+from snuvote.app.vote.cache import VOTE_DETAIL_CACHE
+from snuvote.app.vote.service import VoteService
+from snuvote.app.vote.store import VoteStore
+from snuvote.database.connection import DB_MANAGER
+
+
+# 상세 조회에서 실행된 SQL 목록
+async def get_vote_detail_statements(vote_id: int):
+    statements: list[str] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    VOTE_DETAIL_CACHE.clear()
+    event.listen(DB_MANAGER.engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with DB_MANAGER.session_factory() as session:
+            vote_service = VoteService(VoteStore(session=session, read_session=session))
+            detail = await vote_service.get_vote_detail(vote_id, read_only=True)
+    finally:
+        event.remove(DB_MANAGER.engine.sync_engine, "before_cursor_execute", capture)
+    return detail, statements
+
+
+# 표가 늘어도 상세 조회는 같은 쿼리들만 실행하고 참여 기록은 읽지 않음 (선택지별 참여자 수는 카운터 사용)
+def test_vote_detail_queries_do_not_grow_with_ballots(make_vote, make_user, participate):
+    async def run() -> None:
+        _, vote_id, (a, b, c) = await make_vote()
+
+        detail, statements_without_ballots = await get_vote_detail_statements(vote_id)
+        assert [choice.choice_num_participants for choice in detail.choices] == [0, 0, 0]
+
+        user_ids = [await make_user(f"voter{i}") for i in range(30)]
+        for i, user_id in enumerate(user_ids):
+            await participate(vote_id, user_id, [a, b] if i % 3 == 0 else [c])
+
+        detail, statements = await get_vote_detail_statements(vote_id)
+        assert [choice.choice_num_participants for choice in detail.choices] == [10, 10, 20]
+
+        assert statements == statements_without_ballots
+        assert not any(table in statement for statement in statements for table in ("choice_participation", "vote_participation"))
+
+    asyncio.run(run())